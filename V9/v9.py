@@ -6,10 +6,19 @@
 # 실행: streamlit run app.py
 # =========================================================
 
-import os, io, datetime, json
-from typing import Optional, List, Dict
+import os, io, sys, datetime, json
+from functools import partial
+from typing import Optional, List, Dict, Tuple
 import streamlit as st
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+from coach_core.exports import TextExport
+from coach_core.router import IntentRouter
+from coach_core.response_cache import ResponseCache
+from coach_core.llm_control import (
+    LLMBusyError, RateLimiter, SingleFlight, api_key_fingerprint, call_with_limits, coalesce,
+)
+
 # ===== 문서 생성 라이브러리 (선택) =====
 try:
     from docx import Document
@@ -24,7 +33,7 @@ except:
 
 # ===== LangChain (선택) =====
 try:
-    from langchain_openai import ChatOpenAI
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
     from langchain.prompts import ChatPromptTemplate
     from langchain.chains import LLMChain
     LANGCHAIN_AVAILABLE = True
@@ -583,43 +592,126 @@ def get_guideline_response():
 
 💡 **Pro Tip**: 한 번에 완성하려 하지 말고 단계별로 접근하세요!"""
 
-# ================= AI 응답 생성 =================
-def get_ai_response(user_input: str, uploaded_file=None) -> str:
-    # 가이드라인 요청 체크
-    guideline_keywords = ["가이드", "도움말", "사용법", "어떻게"]
-    if any(keyword in user_input for keyword in guideline_keywords):
-        return get_guideline_response()
-    
-    # API 키 없을 때 기본 응답
-    if not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
-        templates = {
-            "default": """자기소개서 작성을 도와드리겠습니다! 
+# ================= 오프라인 응답 (의도 라우터) =================
+OFFLINE_TEMPLATES = {
+    "guide": get_guideline_response(),
+    "default": """자기소개서 작성을 도와드리겠습니다! 
 
 구체적으로 알려주시면 더 정확한 도움을 드릴 수 있어요:
 • 어떤 직무에 지원하시나요?
 • 어떤 부분이 어려우신가요?
 • 강조하고 싶은 경험이 있나요?""",
-            
-            "첨삭": """자기소개서 첨삭 포인트:
+    "첨삭": """자기소개서 첨삭 포인트:
 
 ✅ 구체적인 숫자와 성과 포함
 ✅ 직무와 연관된 경험 강조
 ✅ 간결하고 명확한 문장
 ✅ 진정성 있는 지원동기
 
-내용을 보내주시면 자세히 봐드릴게요!"""
-        }
-        
-        if "첨삭" in user_input or "수정" in user_input:
-            return templates["첨삭"]
-        return templates["default"]
+내용을 보내주시면 자세히 봐드릴게요!""",
+}
+
+# 가이드 요청은 API 키가 있어도 항상 오프라인으로 답한다 (우선순위 최상위)
+OFFLINE_ROUTER = IntentRouter(
+    [
+        ("guide", ["가이드", "도움말", "사용법", "어떻게"]),
+        ("첨삭", ["첨삭", "수정"]),
+    ],
+    OFFLINE_TEMPLATES,
+)
+
+# ================= LLM 클라이언트 풀 =================
+LLM_POOL_SIZE = 32  # 서로 다른 (api_key, model, temperature) 조합 최대 보관 수 (LRU)
+
+# 모델별 분당 한도 (요청 수, 토큰 수). 조직의 OpenAI 한도에 맞춰 조정
+MODEL_LIMITS = {"gpt-4o-mini": (500, 200_000)}
+DEFAULT_MODEL_LIMITS = (500, 30_000)
+
+@st.cache_resource(max_entries=LLM_POOL_SIZE, show_spinner=False)
+def get_llm(api_key: str, model: str, temperature: float):
+    """(api_key, model, temperature)별 ChatOpenAI를 프로세스 전역에서 재사용.
+    클라이언트 내부 HTTP 커넥션이 유지되어 메시지마다 TLS 핸드셰이크를 하지 않는다.
+    재시도는 call_with_limits가 속도 제한과 함께 처리하므로 클라이언트 자체 재시도는 끈다."""
+    return ChatOpenAI(api_key=api_key, model=model, temperature=temperature, max_retries=0)
+
+# ================= 응답 캐시 =================
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "./response_cache.db")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))      # 초
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"                   # 임베딩 유사도 캐시 (선택)
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_SCAN = int(os.getenv("SEMANTIC_CACHE_SCAN", "500"))  # 유사도 비교 후보 수 (최근 사용순)
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    return ResponseCache(
+        RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES,
+        SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SCAN,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedder(api_key: str):
+    return OpenAIEmbeddings(api_key=api_key, model="text-embedding-3-small")
+
+
+def _cache_scope(llm) -> str:
+    return ResponseCache.scope(
+        llm.model_name, st.session_state.model_settings["tone"], st.session_state.model_settings["max_length"], llm.temperature
+    )
+
+
+def _cache_embed_fn():
+    """유사도 캐시가 켜져 있으면 임베딩 함수, 아니면 None"""
+    if not SEMANTIC_CACHE_ENABLED or not LANGCHAIN_AVAILABLE or not st.session_state.api_key:
+        return None
+    return get_embedder(st.session_state.api_key).embed_query
+
+# ================= 요청 제어 (속도 제한 / 중복 요청 합치기 / 재시도) =================
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(MODEL_LIMITS, DEFAULT_MODEL_LIMITS)
+
+
+@st.cache_resource(show_spinner=False)
+def get_single_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+def _run_llm(llm, prompt, user_input: str, stream: bool):
+    """LLM 한 번 호출 (stream이 아니면 전체 답을 한 번에 yield)"""
+    if stream:
+        for chunk in (prompt | llm).stream({"input": user_input}):
+            if chunk.content:
+                yield chunk.content
+    else:
+        response = LLMChain(llm=llm, prompt=prompt).invoke({"input": user_input})
+        yield response.get("text", str(response))
+
+
+def _coalesced_llm(llm, prompt, user_input: str, tokens: int, stream: bool = False, key: Optional[str] = None):
+    """속도 제한을 지키며 LLM을 호출하고, key가 같은 요청이 진행 중이면 그 결과를 나눠 받는다.
+    한도가 차 있으면 화면을 멈춰 두고 기다리지 않고 바로 LLMBusyError로 알린다."""
+    account = api_key_fingerprint(st.session_state.api_key)
+    limiter, flights = get_rate_limiter(), get_single_flight()
+    produce = partial(call_with_limits, partial(_run_llm, llm, prompt, user_input, stream),
+                      limiter, llm.model_name, tokens, account)
+    yield from coalesce(flights, f"{account}:{key}" if key else None, produce)
+
+
+# ================= AI 응답 생성 =================
+def get_ai_response(user_input: str, uploaded_file=None) -> str:
+    intent, reply = OFFLINE_ROUTER.route(user_input)
+    if intent == "guide" or not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
+        return reply
     
     # LangChain AI 응답 생성
     try:
-        llm = ChatOpenAI(
+        llm = get_llm(
             api_key=st.session_state.api_key,
             model="gpt-4o-mini",
-            temperature=st.session_state.model_settings["temperature"]
+            temperature=st.session_state.model_settings["temperature"],
         )
         
         system_prompt = f"""당신은 전문 자기소개서 작성 코치입니다.
@@ -642,65 +734,120 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
             ("human", "{input}")
         ])
         
-        chain = LLMChain(llm=llm, prompt=prompt)
-        response = chain.invoke({"input": user_input})
+        # 첨부 파일이 있으면 내용이 매번 달라 캐시하지 않음
+        cache = get_response_cache() if uploaded_file is None else None
+        key = None
+        if cache:
+            scope, embed = _cache_scope(llm), _cache_embed_fn()
+            cached, vector = cache.get(user_input, scope, embed)
+            if cached is not None:
+                return cached
+            # 빠른 답변 버튼처럼 같은 요청이 동시에 몰리면 한 번만 호출한다
+            key = ResponseCache.key(user_input, scope)
         
-        return response.get("text", str(response))
+        # TPM 차감용 추정치: 한글은 글자 수 ≈ 토큰 수라 입력 + 최대 답변 길이로 넉넉히 잡는다
+        tokens = len(user_input) + int(st.session_state.model_settings["max_length"])
+        text = "".join(_coalesced_llm(llm, prompt, user_input, tokens, key=key))
+        if cache:
+            cache.put(user_input, scope, text, vector)
         
+        return text
+        
+    except LLMBusyError as e:
+        return str(e)
     except Exception as e:
         return f"오류가 발생했습니다. 다시 시도해주세요."
 
 # ================= 대화 저장 =================
+EXPORT_SPOOL_DIR = os.getenv("EXPORT_SPOOL_DIR") or None  # 내보내기 작업 파일 위치 (기본: 시스템 임시 폴더)
+
+
+def _role_label(msg: Dict) -> str:
+    return "👤 사용자" if msg["role"] == "user" else "🤖 AI"
+
+
 def save_conversation():
-    content = ""
-    for msg in st.session_state.messages:
-        role = "👤 사용자" if msg["role"] == "user" else "🤖 AI"
-        content += f"[{msg.get('time', '')}] {role}\n{msg['content']}\n\n"
-    
+    messages = st.session_state.messages
+    builder = st.session_state.get("export_builder")
+    if builder is None:
+        builder = st.session_state.export_builder = TextExport(_role_label, EXPORT_SPOOL_DIR)
+    builder.append(messages)
+    data = builder.getvalue()
+
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"자소서대화_{timestamp}.txt"
     
     st.session_state.saved_files.append({
         "name": filename,
         "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-        "size": len(content),
-        "data": content
+        "size": len(data),
+        "data": data
     })
     
     return filename
 
 # ================= UI 렌더링 함수 =================
-def render_chat_message(msg):
-    """채팅 메시지 렌더링"""
-    if msg["role"] == "user":
-        st.markdown(f'''
+CHAT_WINDOW = 20          # 항상 그리는 최근 메시지 수
+CHAT_ARCHIVE_PAGE = 20    # 이전 대화 한 페이지당 메시지 수
+
+@st.cache_data(show_spinner=False, max_entries=2000)
+def _chat_message_html(role: str, content: str, time_str: str) -> str:
+    """메시지 1개의 HTML (같은 메시지는 재계산하지 않음)"""
+    if role == "user":
+        return f'''
             <div class="chat user">
                 <div style="text-align: right; width: 100%;">
-                    <div class="bubble">{msg["content"]}</div>
-                    <div class="msg-time">{msg.get("time", "")}</div>
+                    <div class="bubble">{content}</div>
+                    <div class="msg-time">{time_str}</div>
                 </div>
                 <div class="avatar user-avatar">나</div>
             </div>
-        ''', unsafe_allow_html=True)
-    else:
-        content_html = msg["content"].replace('\n', '<br>')
-        st.markdown(f'''
+        '''
+    content_html = content.replace('\n', '<br>')
+    return f'''
             <div class="chat ai">
                 <div class="avatar ai-avatar">AI</div>
                 <div>
                     <div class="bubble">{content_html}</div>
-                    <div class="msg-time">{msg.get("time", "")}</div>
+                    <div class="msg-time">{time_str}</div>
                 </div>
             </div>
-        ''', unsafe_allow_html=True)
+        '''
+
+def render_chat_message(msg):
+    """채팅 메시지 렌더링"""
+    st.markdown(_chat_message_html(msg["role"], msg["content"], msg.get("time", "")), unsafe_allow_html=True)
+
+def render_chat_messages(messages):
+    """여러 메시지를 한 번의 markdown 호출로 렌더링"""
+    html = "".join(_chat_message_html(m["role"], m["content"], m.get("time", "")) for m in messages)
+    st.markdown(html, unsafe_allow_html=True)
+
+def render_chat_archive(older):
+    """CHAT_WINDOW 이전 메시지는 펼쳤을 때만, 한 페이지씩 렌더링"""
+    if not st.toggle(f"🗂️ 이전 대화 {len(older)}개 보기", key="chat_archive_open"):
+        return
+    pages = (len(older) + CHAT_ARCHIVE_PAGE - 1) // CHAT_ARCHIVE_PAGE
+    page = min(max(1, st.session_state.get("chat_archive_page", pages)), pages)
+    col1, col2, col3 = st.columns([1, 3, 1])
+    if col1.button("◀", key="chat_archive_prev", disabled=page <= 1):
+        page -= 1
+    if col3.button("▶", key="chat_archive_next", disabled=page >= pages):
+        page += 1
+    st.session_state.chat_archive_page = page
+    col2.caption(f"{page} / {pages} 페이지")
+    start = (page - 1) * CHAT_ARCHIVE_PAGE
+    render_chat_messages(older[start:start + CHAT_ARCHIVE_PAGE])
 
 def render_chat_tab():
     """대화 탭 렌더링"""
     # 채팅 컨테이너
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     
-    for msg in st.session_state.messages:
-        render_chat_message(msg)
+    messages = st.session_state.messages
+    if len(messages) > CHAT_WINDOW:
+        render_chat_archive(messages[:-CHAT_WINDOW])
+    render_chat_messages(messages[-CHAT_WINDOW:])
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -0,0 +1,6 @@
+"""여러 버전의 Streamlit 앱(v6/v7/v10/v11, V9, test)이 함께 쓰는 공용 모듈.
+
+앱 파일은 저장소 루트를 sys.path에 넣고 `from coach_core.xxx import ...`로 가져온다.
+Streamlit 없이 import할 수 있어야 하므로 여기서는 st.cache_* 를 쓰지 않고,
+캐시/싱글턴은 각 앱이 st.cache_resource로 감싸서 만든다.
+"""
@@ -0,0 +1,56 @@
+"""세션별 백그라운드 자동 저장 (대화 내보내기 → 보관소의 자동 저장 파일)."""
+import datetime
+import threading
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from coach_core.blob_store import BlobStore
+from coach_core.exports import ExportBuilder
+
+AUTOSAVE_DELAY = 10.0                 # 첫 변경 후 이 시간(초) 동안 모인 변경을 한 번에 저장
+AUTOSAVE_NAME = "자소서대화_자동저장"
+
+
+class AutoSaver:
+    """세션별 자동 저장.
+    AI 응답이 붙을 때마다 schedule()로 대화 스냅샷(목록과 길이)을 넘기면,
+    delay 동안 모인 변경을 작업 스레드에서 한 번에 내보내 보관소의 자동 저장 파일을 덮어쓴다.
+    빌더를 계속 들고 있으므로 매번 새로 붙은 대화만 이어 쓴다.
+    빌더 생성 함수(PDF 스타일 포함)와 실행기는 앱이 스크립트 스레드에서 만들어 schedule()에 넘긴다."""
+
+    def __init__(self, store: BlobStore, owner: str, delay: float = AUTOSAVE_DELAY, name: str = AUTOSAVE_NAME):
+        self.store = store
+        self.owner = owner
+        self.delay = delay
+        self.name = name
+        self.lock = threading.Lock()       # 스냅샷/타이머 보호
+        self.save_lock = threading.Lock()  # 같은 세션의 내보내기는 한 번에 하나만
+        self.snapshot = None
+        self.timer = None
+        self.builder: Optional[ExportBuilder] = None
+        self.last_saved: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def schedule(self, messages: List[Dict], factory: Callable[[], ExportBuilder], pool: Executor) -> None:
+        """factory: 빌더 클래스를 감싼 functools.partial (.func가 클래스), pool: 내보내기를 돌릴 실행기"""
+        with self.lock:
+            self.snapshot = (messages, len(messages), factory)
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, lambda: pool.submit(self._save))
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _save(self) -> None:
+        with self.lock:
+            self.timer = None
+            messages, count, factory = self.snapshot
+        with self.save_lock:
+            try:
+                builder = self.builder
+                if type(builder) is not factory.func:
+                    builder = self.builder = factory()
+                builder.append(messages, count)
+                self.store.put(self.owner, f"{self.name}.{builder.ext}", builder.getvalue(), builder.mime, replace=True)
+                self.last_saved, self.error = datetime.datetime.now().strftime("%H:%M:%S"), None
+            except Exception as e:
+                self.error = str(e)
@@ -0,0 +1,173 @@
+"""자소서 배치 평가 (헤드리스 CLI).
+
+사용:
+    python -m coach_core.batch ./resumes                  (디렉터리: 하위 폴더 포함 .txt/.docx)
+    python -m coach_core.batch cohort.zip --out result.parquet --workers 8
+    python test/test.py --batch ./resumes                 (앱 스크립트에서도 같은 CLI로 넘어온다)
+
+앱과 같은 스코어러(coach_core.scoring)를 쓰지만 streamlit/UI 코드는 import 하지 않는다.
+spawn 방식(Windows, macOS 기본) 워커도 이 모듈만 다시 import 하고, 스킬 매처는 워커 초기화 때 한 번 만든다.
+"""
+import argparse
+import csv
+import multiprocessing as mp
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from coach_core.scoring import (
+    READ_ERROR_PREFIX, SCORE_COLUMNS, SkillIndex, build_skill_index, compute_resume_scores,
+    latest_month, month_skills, read_resume_bytes,
+)
+
+BATCH_EXTS = (".txt", ".docx")
+COLUMNS = ["file"] + SCORE_COLUMNS + ["error"]
+
+BatchItem = Tuple[str, str, Optional[str]]
+
+
+def default_skills_path() -> str:
+    # 앱과 같은 데이터 경로 규칙: /mnt/data 가 있으면 우선, 아니면 DATA_DIR
+    data_dir = "/mnt/data" if os.path.isdir("/mnt/data") else os.getenv("DATA_DIR", "./data")
+    return os.path.join(data_dir, "skills_analysis.csv")
+
+
+def load_skill_names(path: str) -> Optional[List[object]]:
+    """최신 월 스킬 목록 (앱의 compute_resume_scores와 같은 기준). 파일/pandas가 없으면 None."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    df = pd.read_csv(path, usecols=lambda c: c in ("skill", "month"))
+    if "skill" not in df.columns or len(df) == 0:
+        return None
+    return month_skills(df, latest_month(df))
+
+
+def iter_batch_inputs(src: str) -> Iterator[BatchItem]:
+    """(표시 이름, 파일 경로, zip 멤버 이름 또는 None) 목록"""
+    if os.path.isdir(src):
+        for root, _dirs, files in os.walk(src):
+            for f in sorted(files):
+                if f.lower().endswith(BATCH_EXTS):
+                    path = os.path.join(root, f)
+                    yield os.path.relpath(path, src), path, None
+    elif zipfile.is_zipfile(src):
+        with zipfile.ZipFile(src) as zf:
+            for member in zf.namelist():
+                if member.lower().endswith(BATCH_EXTS) and not member.endswith("/"):
+                    yield member, src, member
+
+
+# 워커 프로세스 상태: 스킬 매처와 한 번만 연 zip (중앙 디렉터리는 워커당 1회만 파싱)
+_skill_index: Optional[SkillIndex] = None
+_zips: Dict[str, zipfile.ZipFile] = {}
+
+
+def _init_worker(skill_names: Optional[Sequence[object]]) -> None:
+    global _skill_index
+    _skill_index = build_skill_index(skill_names) if skill_names is not None else None
+
+
+def _zip(path: str) -> zipfile.ZipFile:
+    zf = _zips.get(path)
+    if zf is None:
+        zf = _zips[path] = zipfile.ZipFile(path)
+    return zf
+
+
+def score_item(item: BatchItem) -> Dict[str, object]:
+    name, path, member = item
+    row: Dict[str, object] = {"file": name}
+    try:
+        if member is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        else:
+            data = _zip(path).read(member)
+        text = read_resume_bytes(name, data)
+        if text.startswith(READ_ERROR_PREFIX):
+            raise ValueError(text)
+        row.update(compute_resume_scores(text, _skill_index))
+        row["error"] = ""
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+def batch_score(src: str, out: str, workers: Optional[int] = None,
+                skill_names: Optional[Sequence[object]] = None, progress_every: int = 100) -> int:
+    """src(디렉터리/zip)의 자소서를 프로세스 풀로 평가해 out(.csv/.parquet)에 순차 기록. 처리 건수 반환."""
+    items = list(iter_batch_inputs(src))
+    total = len(items)
+    as_parquet = out.lower().endswith(".parquet")
+    if as_parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([(c, pa.string() if c in ("file", "error") else pa.float64()) for c in COLUMNS])
+        writer = pq.ParquetWriter(out, schema)
+        buf: List[Dict[str, object]] = []
+    else:
+        fh = open(out, "w", newline="", encoding="utf-8-sig")
+        writer = csv.DictWriter(fh, fieldnames=COLUMNS, restval="")
+        writer.writeheader()
+
+    # fork가 가능하면 사용: 워커 기동 시 인터프리터/모듈 로딩을 다시 하지 않는다
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+    start = time.time()
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(skill_names,)) as pool:
+            for row in pool.map(score_item, items, chunksize=32):
+                if as_parquet:
+                    buf.append(row)
+                    if len(buf) >= 1000:
+                        writer.write_table(pa.Table.from_pylist(buf, schema=schema))
+                        buf = []
+                else:
+                    writer.writerow(row)
+                done += 1
+                if done % progress_every == 0 or done == total:
+                    elapsed = max(1e-9, time.time() - start)
+                    print(f"[{done}/{total}] {done / elapsed:.1f} files/s", file=sys.stderr, flush=True)
+        if as_parquet and buf:
+            writer.write_table(pa.Table.from_pylist(buf, schema=schema))
+    finally:
+        if as_parquet:
+            writer.close()
+        else:
+            fh.close()
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m coach_core.batch",
+                                     description="자소서 배치 평가 (txt/docx 디렉터리 또는 zip)")
+    parser.add_argument("src", nargs="?", help="자소서 디렉터리 또는 zip 파일")
+    parser.add_argument("--batch", dest="batch_src", metavar="SRC", help="src와 같음 (앱 스크립트 호환)")
+    parser.add_argument("--out", default="batch_scores.csv", help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--skills", default=None, help="skills_analysis.csv 경로 (기본: 앱 데이터 경로, 빈 값이면 스킬 커버리지 없이 평가)")
+    args = parser.parse_args(argv)
+    src = args.src or args.batch_src
+    if not src:
+        parser.error("자소서 디렉터리 또는 zip 파일을 지정하세요")
+    if not os.path.isdir(src) and not zipfile.is_zipfile(src):
+        print(f"입력을 찾을 수 없거나 zip이 아닙니다: {src}", file=sys.stderr)
+        return 2
+    start = time.time()
+    skills_path = default_skills_path() if args.skills is None else args.skills
+    n = batch_score(src, args.out, args.workers, load_skill_names(skills_path))
+    elapsed = max(1e-9, time.time() - start)
+    print(f"완료: {n}건, {elapsed:.1f}s ({n / elapsed:.1f} files/s) → {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
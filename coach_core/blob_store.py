@@ -0,0 +1,118 @@
+"""내보낸 파일 보관소 (내용 주소 파일 + SQLite 목록)."""
+import datetime
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+
+class BlobStore:
+    """내보낸 파일 보관소.
+    내용은 sha256 이름의 파일로 디스크에 한 번만 두고(같은 내용은 공유),
+    누가 어떤 이름으로 저장했는지는 SQLite 목록에 남긴다. 세션에는 목록을 찾을 owner만 둔다.
+    TTL이 지난 항목과 사용자별 용량을 넘는 오래된 항목은 저장할 때 정리한다."""
+
+    def __init__(self, root: str, ttl: int, quota: int):
+        self.root = root
+        self.ttl = ttl
+        self.quota = quota
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "catalog.db"), check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    owner TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    mime TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_owner ON files(owner, created)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_digest ON files(digest)")
+            self.conn.commit()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _delete(self, where: str, params: tuple) -> None:
+        """조건에 맞는 목록을 지우고, 더 이상 참조되지 않는 내용 파일도 삭제 (lock 안에서 호출)"""
+        digests = {d for (d,) in self.conn.execute(f"SELECT digest FROM files WHERE {where}", params)}
+        self.conn.execute(f"DELETE FROM files WHERE {where}", params)
+        for digest in digests:
+            if not self.conn.execute("SELECT 1 FROM files WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                try:
+                    os.remove(self._path(digest))
+                except OSError:
+                    pass
+
+    def put(self, owner: str, name: str, data, mime: str, replace: bool = False) -> int:
+        """replace=True면 같은 owner·이름의 이전 항목을 지우고 저장 (자동 저장 파일 덮어쓰기)"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        now = time.time()
+        with self.lock:
+            if replace:
+                self._delete("owner = ? AND name = ?", (owner, name))
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            file_id = self.conn.execute(
+                "INSERT INTO files (owner, name, mime, digest, size, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (owner, name, mime, digest, len(data), now),
+            ).lastrowid
+            self._delete("created < ?", (now - self.ttl,))
+            # 용량을 넘으면 방금 저장한 파일을 뺀 나머지 중 오래된 것부터 정리
+            rows = self.conn.execute(
+                "SELECT id, size FROM files WHERE owner = ? ORDER BY id DESC", (owner,)
+            ).fetchall()
+            total, drop = 0, []
+            for fid, size in rows:
+                total += size
+                if total > self.quota and fid != file_id:
+                    drop.append(fid)
+            if drop:
+                self._delete(f"id IN ({','.join('?' * len(drop))})", tuple(drop))
+            self.conn.commit()
+        return file_id
+
+    def list(self, owner: str) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, name, mime, size, created FROM files WHERE owner = ? AND created >= ? ORDER BY id",
+                (owner, time.time() - self.ttl),
+            ).fetchall()
+        return [
+            {"id": fid, "name": name, "mime": mime, "size": size,
+             "date": datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M")}
+            for fid, name, mime, size, created in rows
+        ]
+
+    def read(self, owner: str, file_id: int) -> Optional[bytes]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT digest FROM files WHERE id = ? AND owner = ?", (file_id, owner)
+            ).fetchone()
+            if not row:
+                return None
+            try:
+                with open(self._path(row[0]), "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+
+    def clear(self, owner: str) -> None:
+        with self.lock:
+            self._delete("owner = ?", (owner,))
+            self.conn.commit()
@@ -0,0 +1,79 @@
+"""기업명 인덱스 (채용공고 표의 회사명 조회)."""
+import bisect
+import difflib
+import re
+from typing import Dict, List, Mapping, Sequence
+
+# 한글/영문 표기가 다른 주요 기업 (정규화된 이름끼리 매핑)
+COMPANY_ALIASES = {
+    "네이버": "naver", "카카오": "kakao", "라인": "line", "쿠팡": "coupang",
+    "삼성전자": "samsungelectronics", "삼성": "samsung", "엘지": "lg", "lg전자": "lgelectronics",
+    "현대자동차": "hyundaimotor", "sk하이닉스": "skhynix", "토스": "toss", "당근": "daangn",
+    "우아한형제들": "woowabrothers", "배달의민족": "baemin", "엔씨소프트": "ncsoft", "넥슨": "nexon",
+}
+_COMPANY_ALIASES_BOTH = {**COMPANY_ALIASES, **{v: k for k, v in COMPANY_ALIASES.items()}}
+
+
+def norm_company(name: str) -> str:
+    s = str(name).lower()
+    s = re.sub(r"주식회사|\(주\)|㈜", "", s)
+    return re.sub(r"\s+", "", s)
+
+
+class CompanyIndex:
+    """정규화된 회사명 → 행 위치, 공고 수, 최신 공고일.
+
+    lookup(query)은 원래의 `company.str.contains(query, case=False)`처럼 query를 포함하는 회사를 모두 돌려준다.
+    비교는 정규화된 이름끼리 하고(대소문자, 공백, "주식회사"/"(주)" 무시), 한/영 별칭을 포함하는 회사도 더한다.
+    포함하는 회사가 하나도 없을 때만 오타 허용(difflib) 후보를 최대 3개 돌려준다 (원래는 0건).
+    회사명을 개행으로 이어 붙인 문자열에서 str.find로 찾으므로 행 수가 아니라 회사 수에 비례해 한 번 훑는다."""
+
+    def __init__(self, positions: Mapping[str, Sequence[int]], counts: Mapping[str, int],
+                 latest: Mapping[str, object] = None):
+        self.positions = dict(positions)
+        self.keys: List[str] = sorted(self.positions)
+        self.counts = dict(counts)
+        self.latest = dict(latest or {})
+        self._blob = "\n".join(self.keys)
+        self._starts: List[int] = []
+        pos = 0
+        for k in self.keys:
+            self._starts.append(pos)
+            pos += len(k) + 1
+
+    @classmethod
+    def from_frame(cls, df) -> "CompanyIndex":
+        """job_market 표(company, 선택: job_code, posted_date)에서 만든다."""
+        import pandas as pd
+
+        keys = df["company"].astype(str).map(norm_company)
+        grouped = df.groupby(keys.values, sort=True)
+        counts = grouped["job_code"].nunique().to_dict() if "job_code" in df.columns else grouped.size().to_dict()
+        latest = {}
+        if "posted_date" in df.columns:
+            dates = pd.to_datetime(df["posted_date"], errors="coerce")
+            latest = dates.groupby(keys.values).max().dropna().to_dict()
+        return cls(grouped.indices, counts, latest)
+
+    def _containing(self, q: str) -> List[str]:
+        hits = []
+        i = self._blob.find(q)
+        while i != -1:
+            k = bisect.bisect_right(self._starts, i) - 1
+            hits.append(self.keys[k])
+            if k + 1 == len(self.keys):
+                break
+            i = self._blob.find(q, self._starts[k + 1])  # 같은 회사에서 또 찾지 않고 다음 회사부터
+        return hits
+
+    def lookup(self, query: str) -> List[str]:
+        q = norm_company(query)
+        if not q:
+            return list(self.keys)
+        hits = set(self._containing(q))
+        alias = _COMPANY_ALIASES_BOTH.get(q)
+        if alias:
+            hits.update(self._containing(alias))
+        if hits:
+            return sorted(hits)
+        return difflib.get_close_matches(q, self.keys, n=3, cutoff=0.8)
@@ -0,0 +1,175 @@
+"""대화 내보내기 빌더 (TXT / HTML / DOCX / PDF).
+
+빌더는 메시지를 형식에 맞게 렌더링한 조각을 디스크의 스풀 파일에만 이어 쓰고,
+객체에는 스풀 경로와 커서(쓴 메시지 수, 마지막 메시지 id)만 둔다.
+세션에 빌더를 보관해도 대화 사본이 메모리에 쌓이지 않으며, DOCX/PDF는 저장할 때 스풀을 읽어 한 번에 조판한다.
+"""
+import html
+import io
+import json
+import os
+import tempfile
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+
+def message_id(msg: Dict) -> str:
+    """메시지 id. 없으면(이전 세션에서 넘어온 메시지 등) 처음 볼 때 붙인다."""
+    mid = msg.get("id")
+    if mid is None:
+        mid = msg["id"] = uuid.uuid4().hex
+    return mid
+
+
+def default_role_label(msg: Dict) -> str:
+    return "👤 사용자" if msg["role"] == "user" else "🤖 AI 코치"
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ExportBuilder(ABC):
+    """대화를 메시지 단위로 이어 쓰는 내보내기.
+    다시 저장할 때는 새 메시지만 추가한다. 마지막으로 쓴 메시지의 id가 목록의 같은 자리에 없으면
+    (대화를 지웠거나 새로 채운 경우) 스풀을 비우고 처음부터 다시 쓴다."""
+    ext = "txt"
+    mime = "text/plain"
+
+    def __init__(self, role_label: Callable[[Dict], str] = default_role_label, spool_dir: Optional[str] = None):
+        self.role_label = role_label
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix="export_", suffix=f".{self.ext}.part", dir=spool_dir)
+        os.close(fd)
+        self._cleanup = weakref.finalize(self, _remove, self.path)  # 세션이 끝나 빌더가 사라지면 스풀도 삭제
+        self.count = 0
+        self.last_id: Optional[str] = None
+
+    def _in_sync(self, messages: List[Dict]) -> bool:
+        if self.count == 0:
+            return True
+        return self.count <= len(messages) and messages[self.count - 1].get("id") == self.last_id
+
+    def reset(self) -> None:
+        open(self.path, "wb").close()
+        self.count, self.last_id = 0, None
+
+    def append(self, messages: List[Dict], end: Optional[int] = None) -> None:
+        """messages[:end]까지 아직 쓰지 않은 메시지를 스풀에 추가"""
+        if not self._in_sync(messages):
+            self.reset()
+        end = len(messages) if end is None else min(end, len(messages))
+        if self.count >= end:
+            return
+        with open(self.path, "ab") as f:
+            for msg in messages[self.count:end]:
+                f.write(self.render(msg))
+                self.last_id = message_id(msg)
+                self.count += 1
+
+    def spooled(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def head(self, msg: Dict) -> str:
+        return f"[{msg.get('time', '')}] {self.role_label(msg)}"
+
+    def close(self) -> None:
+        self._cleanup()
+
+    @abstractmethod
+    def render(self, msg: Dict) -> bytes:
+        """메시지 1개를 스풀에 쓸 바이트로 변환"""
+
+    @abstractmethod
+    def getvalue(self) -> bytes:
+        """지금까지 쓴 메시지로 완성한 파일 내용"""
+
+
+class TextExport(ExportBuilder):
+    def render(self, msg: Dict) -> bytes:
+        return f"{self.head(msg)}\n{msg['content']}\n\n".encode("utf-8")
+
+    def getvalue(self) -> bytes:
+        return self.spooled()
+
+
+class HtmlExport(ExportBuilder):
+    ext = "html"
+    mime = "text/html"
+    HEADER = b"<html><head><meta charset='utf-8'></head><body>"
+    FOOTER = b"</body></html>"
+
+    def __init__(self, role_label: Callable[[Dict], str] = default_role_label, spool_dir: Optional[str] = None,
+                 message_html: Optional[Callable[[Dict], str]] = None):
+        super().__init__(role_label, spool_dir)
+        self.message_html = message_html or (lambda m: "<p>" + html.escape(m["content"]).replace("\n", "<br>") + "</p>")
+
+    def render(self, msg: Dict) -> bytes:
+        return f"<p><small>{html.escape(self.head(msg))}</small></p>{self.message_html(msg)}".encode("utf-8")
+
+    def getvalue(self) -> bytes:
+        return self.HEADER + self.spooled() + self.FOOTER
+
+
+class _ParagraphExport(ExportBuilder):
+    """(머리말, 본문) 쌍을 JSON 줄로 스풀에 쌓고, 저장할 때 문서로 조판하는 형식의 공통 부분"""
+    TITLE = "AI 자기소개서 코칭 대화"
+
+    def render(self, msg: Dict) -> bytes:
+        return (json.dumps([self.head(msg), msg["content"]], ensure_ascii=False) + "\n").encode("utf-8")
+
+    def paragraphs(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+class DocxExport(_ParagraphExport):
+    ext = "docx"
+    mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    def getvalue(self) -> bytes:
+        from docx import Document
+
+        doc = Document()
+        doc.add_heading(self.TITLE, 0)
+        for head, body in self.paragraphs():
+            doc.add_paragraph(head)
+            doc.add_paragraph(body)  # 줄바꿈은 python-docx가 문단 안 줄바꿈으로 바꾼다
+        bio = io.BytesIO()
+        doc.save(bio)
+        return bio.getvalue()
+
+
+class PdfExport(_ParagraphExport):
+    """style(ParagraphStyle)과 make_doc(target, title)은 호출하는 쪽이 미리 만들어 넘긴다
+    (한글 폰트 등록/스타일 생성은 앱의 스크립트 스레드에서 한 번만)."""
+    ext = "pdf"
+    mime = "application/pdf"
+
+    def __init__(self, role_label: Callable[[Dict], str] = default_role_label, spool_dir: Optional[str] = None, *,
+                 style, make_doc):
+        super().__init__(role_label, spool_dir)
+        self.style = style
+        self.make_doc = make_doc
+
+    def getvalue(self) -> bytes:
+        from reportlab.platypus import Paragraph, Spacer
+
+        story = []
+        for head, body in self.paragraphs():
+            story += [
+                Paragraph(html.escape(head), self.style),
+                Paragraph(html.escape(body).replace("\n", "<br/>"), self.style),
+                Spacer(1, 6),
+            ]
+        bio = io.BytesIO()
+        self.make_doc(bio, title=self.TITLE).build(story)
+        return bio.getvalue()
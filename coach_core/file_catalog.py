@@ -0,0 +1,108 @@
+"""저장 파일 카탈로그 (save_dir 파일 목록의 SQLite 인덱스)."""
+import datetime
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+FILE_CATALOG_DIR = ".catalog"  # save_dir 안의 하위 폴더 (DB 쓰기가 save_dir의 수정 시각을 바꾸지 않도록)
+FILE_CATALOG_NAME = "files.db"
+FILE_PAGE_SIZE = 10
+
+
+class FileCatalog:
+    """save_dir에 저장한 파일 목록 (SQLite).
+    저장할 때마다 한 줄씩 기록하고, 목록 화면은 인덱스로 페이지 단위 조회한다.
+    조회할 때 save_dir의 수정 시각(st_mtime_ns)이 마지막 확인 때와 다르면 (파일 추가/삭제/이름 변경)
+    디렉터리를 한 번 훑어 새 파일은 등록하고 없어진 파일은 목록에서 뺀다.
+    바뀌지 않았으면 stat 한 번으로 끝난다."""
+
+    def __init__(self, save_dir: str):
+        self.save_dir = save_dir
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()     # 디렉터리 맞추기는 한 번에 하나만 (늦게 끝난 훑기가 최신 결과를 덮지 않게)
+        self.dir_mtime: Optional[int] = None  # 마지막으로 맞춰 본 save_dir 수정 시각
+        db_dir = os.path.join(save_dir, FILE_CATALOG_DIR)
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(db_dir, FILE_CATALOG_NAME), check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    owner TEXT
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_created ON files(created)")
+            self.conn.commit()
+
+    def sync(self) -> None:
+        """디렉터리가 바뀌었으면 목록을 디렉터리 내용에 맞춘다."""
+        with self.sync_lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        try:
+            mtime = os.stat(self.save_dir).st_mtime_ns  # 훑기 전에 읽어 두어, 훑는 중의 변경은 다음 조회에서 다시 잡는다
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self.dir_mtime:
+            return
+        found = {}
+        if mtime is not None:
+            for entry in os.scandir(self.save_dir):
+                if entry.is_file():
+                    stat = entry.stat()
+                    found[entry.path] = (entry.name, stat.st_size, stat.st_ctime)
+        with self.lock:
+            known = {path for (path,) in self.conn.execute("SELECT path FROM files")}
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in known - found.keys()])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO files (path, name, size, created, owner) VALUES (?, ?, ?, ?, NULL)",
+                [(p, *found[p]) for p in found.keys() - known],
+            )
+            self.conn.commit()
+            self.dir_mtime = mtime
+
+    def record(self, path: str, owner: Optional[str] = None) -> None:
+        """저장한 파일 등록. 같은 경로에 다시 저장하면 기존 항목을 갱신한다."""
+        stat = os.stat(path)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, name, size, created, owner) VALUES (?, ?, ?, ?, ?)",
+                (path, os.path.basename(path), stat.st_size, stat.st_ctime, owner),
+            )
+            self.conn.commit()
+
+    def forget(self, path: str) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.conn.commit()
+
+    def page(self, query: str = "", page: int = 0, page_size: int = FILE_PAGE_SIZE) -> Tuple[List[Dict], int]:
+        """(최신순 page번째 페이지의 파일 목록, 검색 결과 전체 개수)"""
+        self.sync()
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", query.strip()) + "%"
+        with self.lock:
+            (total,) = self.conn.execute(
+                "SELECT COUNT(*) FROM files WHERE name LIKE ? ESCAPE '\\'", (pattern,)
+            ).fetchone()
+            rows = self.conn.execute(
+                "SELECT path, name, size, created, owner FROM files WHERE name LIKE ? ESCAPE '\\' "
+                "ORDER BY created DESC LIMIT ? OFFSET ?",
+                (pattern, page_size, page * page_size),
+            ).fetchall()
+        return [
+            {
+                "name": name,
+                "path": path,
+                "created_ts": created,
+                "created": datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S"),
+                "size": size,
+                "owner": owner,
+            }
+            for path, name, size, created, owner in rows
+        ], total
@@ -0,0 +1,38 @@
+"""세션에 보관하는 백그라운드 LLM 작업 핸들."""
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Tuple
+
+
+class LLMJob:
+    """세션에 보관하는 LLM 작업 핸들. executor는 앱이 st.cache_resource로 만든 공용 풀을 스크립트 스레드에서 넘긴다.
+    취소하면 대기 중인 작업은 실행되지 않고, 이미 실행 중인 호출은 끝나더라도 결과를 버린다."""
+
+    def __init__(self, executor: Executor, fn, *args, **kwargs):
+        self.started = time.monotonic()
+        self.cancelled = threading.Event()
+        self.future = executor.submit(self._run, fn, args, kwargs)
+
+    def _run(self, fn, args, kwargs):
+        if self.cancelled.is_set():
+            return None
+        return fn(*args, **kwargs)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        self.future.cancel()
+
+    def result(self) -> Tuple[bool, object]:
+        """(성공 여부, 결과 또는 오류 메시지). done()일 때만 호출."""
+        try:
+            return True, self.future.result(timeout=0)
+        except Exception as e:
+            return False, f"오류가 발생했습니다: {e}"
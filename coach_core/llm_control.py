@@ -0,0 +1,187 @@
+"""LLM 요청 제어: 속도 제한(RPM/TPM 토큰 버킷), 중복 요청 합치기(single-flight), 재시도.
+
+LangChain에 의존하지 않도록 실제 호출은 run()(텍스트 조각을 내는 이터러블을 돌려주는 함수)으로 받는다.
+RateLimiter/SingleFlight는 프로세스 공용 객체라 앱에서 st.cache_resource로 감싸 하나만 만든다.
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "0"))  # 한도가 찰 때까지 기다리는 최대 시간(초). 0이면 바로 거절
+LLM_FLIGHT_TIMEOUT = 180.0     # 같은 요청의 결과를 기다리는 최대 시간(초)
+LLM_MAX_RETRIES = 4
+LLM_BACKOFF_BASE = 1.0         # 초
+LLM_BACKOFF_CAP = 20.0         # 초
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMBusyError(Exception):
+    """속도 제한 때문에 지금 보낼 수 없는 요청. retry_after: 다시 시도할 수 있을 때까지의 초 (모르면 None)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """API 키를 직접 담지 않는 짧은 식별자 (한도/중복 요청을 키별로 나누는 데 쓴다)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class TokenBucket:
+    """분당 한도만큼 연속으로 다시 채워지는 버킷"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """(API 키, 모델)별 RPM/TPM 토큰 버킷. 프로세스의 모든 세션이 함께 쓴다.
+    한도는 API 키(조직)마다 따로 매겨지므로 버킷도 키 지문별로 나눈다."""
+
+    def __init__(self, limits: Dict[str, Tuple[int, int]], default: Tuple[int, int]):
+        self.limits = limits
+        self.default = default
+        self.buckets: Dict[Tuple[str, str], Tuple[TokenBucket, TokenBucket]] = {}
+        self.lock = threading.Lock()
+
+    def try_acquire(self, model: str, tokens: int, account: str = "") -> float:
+        """한도 안이면 차감하고 0, 아니면 차감 없이 기다려야 할 초를 반환 (대기하지 않음)"""
+        with self.lock:
+            bucket_key = (account, model)
+            if bucket_key not in self.buckets:
+                rpm, tpm = self.limits.get(model, self.default)
+                self.buckets[bucket_key] = (TokenBucket(rpm), TokenBucket(tpm))
+            requests, token_bucket = self.buckets[bucket_key]
+            now = time.monotonic()
+            wait = max(requests.wait_time(1, now), token_bucket.wait_time(tokens, now))
+            if wait == 0:
+                requests.take(1)
+                token_bucket.take(tokens)
+            return wait
+
+    def acquire(self, model: str, tokens: int, account: str = "", timeout: float = LLM_QUEUE_TIMEOUT) -> None:
+        """한도가 찰 때까지 최대 timeout초 기다린다. 그 안에 안 되면 LLMBusyError(retry_after=필요한 대기 시간).
+        화면을 그리는 스크립트 스레드에서는 timeout=0(기본)으로 기다리지 않고 바로 알린다."""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(model, tokens, account)
+            if wait == 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise LLMBusyError(
+                    f"지금 요청이 많아 답변이 지연되고 있어요. 약 {max(1, round(wait))}초 후 다시 시도해주세요.",
+                    retry_after=wait,
+                )
+            # 여러 세션이 같은 순간에 깨어나 몰리지 않도록 약간 흩뜨린다
+            time.sleep(wait + random.uniform(0, 0.05))
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 요청이 이미 진행 중이면 새로 호출하지 않고 먼저 시작한 호출의 결과를 나눠 받는다"""
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def begin(self, key: str):
+        """(leader 여부, flight) 반환. leader만 실제 호출 후 finish를 불러야 한다."""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                return False, flight
+            flight = self.flights[key] = _Flight()
+            return True, flight
+
+    def finish(self, key: str, flight: _Flight, result: Optional[str] = None, error: Optional[Exception] = None) -> None:
+        flight.result, flight.error = result, error
+        with self.lock:
+            self.flights.pop(key, None)
+        flight.done.set()
+
+    @staticmethod
+    def wait(flight: _Flight, timeout: float = LLM_FLIGHT_TIMEOUT) -> str:
+        if not flight.done.wait(timeout):
+            raise LLMBusyError("같은 요청의 답변을 기다리다 시간이 초과됐어요. 다시 시도해주세요.")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """429/5xx면 다음 시도까지 기다릴 초, 재시도하지 않을 오류면 None"""
+    if getattr(error, "status_code", None) not in RETRYABLE_STATUS or attempt >= LLM_MAX_RETRIES:
+        return None
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * 2 ** attempt))  # full jitter
+
+
+def call_with_limits(run: Callable[[], Iterable[str]], limiter: RateLimiter, model: str, tokens: int,
+                     account: str = "") -> Iterator[str]:
+    """속도 제한을 지키며 run()의 텍스트 조각을 내보내는 제너레이터.
+    429/5xx는 지터를 준 지수 백오프로 재시도하되, 이미 일부를 내보냈다면 재시도하지 않는다."""
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        limiter.acquire(model, tokens, account)
+        sent = False
+        try:
+            for piece in run():
+                sent = True
+                yield piece
+            return
+        except Exception as e:
+            delay = None if sent else retry_delay(e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+def coalesce(flights: SingleFlight, key: Optional[str], produce: Callable[[], Iterable[str]]) -> Iterator[str]:
+    """key가 같은 요청이 진행 중이면 그 결과를 기다리고, 아니면 produce()를 직접 돌려 결과를 공유한다.
+    key에는 API 키 지문을 넣어 다른 키(조직)의 요청과 결과를 나누지 않게 한다."""
+    if key is None:
+        yield from produce()
+        return
+    leader, flight = flights.begin(key)
+    if not leader:
+        yield flights.wait(flight)
+        return
+    parts = []
+    try:
+        for piece in produce():
+            parts.append(piece)
+            yield piece
+    except Exception as e:
+        flights.finish(key, flight, error=e)
+        raise
+    except BaseException:
+        # 화면이 다시 그려지며 스트리밍이 중단된 경우: 기다리던 요청은 직접 다시 시도하게 한다
+        flights.finish(key, flight, error=LLMBusyError("같은 요청이 중단됐어요. 다시 시도해주세요."))
+        raise
+    flights.finish(key, flight, result="".join(parts))
@@ -0,0 +1,100 @@
+"""대화 메모리 (토큰 예산 기반 슬라이딩 윈도 + 오래된 대화의 누적 요약).
+
+최근 대화는 토큰 예산 안에서 원문 그대로, 예산을 넘긴 오래된 대화는 요약 한 덩어리로 유지한다.
+요약은 앱이 넘겨준 executor(백그라운드 스레드)에서 만들어 응답 시간에 영향을 주지 않는다.
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import List, Tuple
+
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+MEMORY_SUMMARY_CHARS = int(os.getenv("MEMORY_SUMMARY_CHARS", "600"))
+
+
+def approx_tokens(text: str) -> int:
+    """tiktoken 없이 쓰는 대략적인 토큰 수 (한글은 글자당 1, 그 외는 4글자당 1)"""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul) // 4 + 1
+
+
+class SummarizingMemory:
+    """토큰 예산 기반 슬라이딩 윈도 + 오래된 대화의 누적 요약.
+    윈도에서 밀려난 턴은 요약에 반영될 때까지 원문 그대로 대화 기록에 남겨 두어,
+    요약이 끝나기 전 다음 질문에서도 맥락이 빠지지 않게 한다.
+    대화를 지우면 새 객체로 바꾼다 (진행 중이던 요약은 버려진 객체에만 반영된다)."""
+
+    def __init__(self, executor: Executor, token_budget: int = MEMORY_TOKEN_BUDGET):
+        self.executor = executor
+        self.token_budget = token_budget
+        self.summary = ""
+        self._turns = deque()   # (human, ai, tokens)
+        self._tokens = 0
+        self._pending = []      # 윈도에서 밀려나 요약을 기다리는 대화 (요약되면 앞에서부터 지운다)
+        self._summarizing = False
+        self._lock = threading.Lock()
+
+    def history(self) -> Tuple[str, List[Tuple[str, str]]]:
+        """(요약, 요약에 아직 반영되지 않은 턴 + 윈도 안의 턴)"""
+        with self._lock:
+            turns = [(human, ai) for human, ai, _ in self._pending]
+            turns += [(human, ai) for human, ai, _ in self._turns]
+            return self.summary, turns
+
+    def messages(self) -> list:
+        """프롬프트의 chat_history 자리에 넣을 메시지 목록"""
+        from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+
+        summary, turns = self.history()
+        msgs = [SystemMessage(content=f"이전 대화 요약:\n{summary}")] if summary else []
+        for human, ai in turns:
+            msgs += [HumanMessage(content=human), AIMessage(content=ai)]
+        return msgs
+
+    def save(self, human: str, ai: str, llm=None):
+        """대화 한 턴을 기록하고, 예산을 넘기면 오래된 턴을 요약 대기열로 보낸다"""
+        tokens = approx_tokens(human) + approx_tokens(ai)
+        with self._lock:
+            self._turns.append((human, ai, tokens))
+            self._tokens += tokens
+            while self._tokens > self.token_budget and len(self._turns) > 1:
+                old = self._turns.popleft()
+                self._tokens -= old[2]
+                self._pending.append(old)
+            if not self._pending or self._summarizing:
+                return
+            self._summarizing = True
+        self.executor.submit(self._compress, llm)
+
+    def _compress(self, llm):
+        while True:
+            with self._lock:
+                batch = list(self._pending)
+                summary = self.summary
+                if not batch:
+                    self._summarizing = False
+                    return
+            summary = self._summarize(llm, summary, batch)
+            with self._lock:
+                # 요약이 반영된 턴만 뺀다 (요약하는 동안 밀려난 턴은 다음 차례에)
+                self.summary = summary
+                del self._pending[:len(batch)]
+
+    @staticmethod
+    def _summarize(llm, summary: str, batch: list) -> str:
+        dialog = "\n".join(f"사용자: {h}\n코치: {a}" for h, a, _ in batch)
+        if llm is not None:
+            try:
+                result = llm.invoke(
+                    "다음은 자기소개서 코칭 대화의 기존 요약과 이어진 대화입니다. "
+                    "지원 회사/직무, 사용자의 경험과 성과, 요청사항을 빠짐없이 담아 "
+                    f"{MEMORY_SUMMARY_CHARS}자 이내의 갱신된 요약만 작성하세요.\n\n"
+                    f"[기존 요약]\n{summary or '(없음)'}\n\n[이어진 대화]\n{dialog}"
+                )
+                return str(getattr(result, "content", result)).strip()[:MEMORY_SUMMARY_CHARS]
+            except Exception:
+                pass
+        # LLM이 없거나 실패하면 각 턴의 앞부분만 이어 붙이고 최근 내용 위주로 자른다
+        lines = [f"- 사용자: {h[:80]} / 코치: {a[:80]}" for h, a, _ in batch]
+        return "\n".join([summary] + lines).strip()[-MEMORY_SUMMARY_CHARS:]
@@ -0,0 +1,121 @@
+"""회사 리서치 요약 저장소와 출처 정렬.
+
+같은 원문(+프롬프트 버전)의 요약은 SQLite에 저장해 LLM을 다시 부르지 않고,
+원문이 바뀌면 주제(회사)의 이전 요약을 먼저 돌려준 뒤 새 요약은 백그라운드에서 만든다.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+NO_TEXT_MESSAGE = "(웹 페이지에서 요약할 텍스트를 수집하지 못했습니다.)"
+
+
+class SummaryStore:
+    """(프롬프트 버전 + 수집 원문) 해시별 LLM 요약과, 주제(회사)별 가장 최근 요약을 SQLite에 저장.
+    요약 프롬프트를 바꾸면 prompt_version을 올려 기존 요약을 무효화한다."""
+
+    def __init__(self, path: str, prompt_version: str):
+        self.prompt_version = prompt_version
+        self.lock = threading.Lock()
+        self.inflight = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries (hash TEXT PRIMARY KEY, summary TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS latest (subject TEXT PRIMARY KEY, hash TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            self.conn.commit()
+
+    def key(self, joined: str) -> str:
+        return hashlib.sha256(f"{self.prompt_version}\x00{joined}".encode("utf-8")).hexdigest()
+
+    def get(self, h: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT summary FROM summaries WHERE hash = ?", (h,)).fetchone()
+        return row[0] if row else None
+
+    def latest(self, subject: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT s.summary FROM latest l JOIN summaries s ON s.hash = l.hash WHERE l.subject = ?", (subject,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, h: str, summary: str, subject: Optional[str] = None) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO summaries (hash, summary, created) VALUES (?, ?, ?)", (h, summary, now))
+            if subject:
+                self.conn.execute("INSERT OR REPLACE INTO latest (subject, hash, updated) VALUES (?, ?, ?)", (subject, h, now))
+            self.conn.commit()
+
+    def mark_latest(self, subject: str, h: str) -> None:
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO latest (subject, hash, updated) VALUES (?, ?, ?)", (subject, h, time.time()))
+            self.conn.commit()
+
+    def begin(self, h: str) -> bool:
+        """같은 원문에 대한 백그라운드 갱신이 이미 돌고 있으면 False"""
+        with self.lock:
+            if h in self.inflight:
+                return False
+            self.inflight.add(h)
+            return True
+
+    def end(self, h: str) -> None:
+        with self.lock:
+            self.inflight.discard(h)
+
+
+def _refresh_summary(store: SummaryStore, summarize: Callable[[str], str], joined: str, h: str, subject: str) -> None:
+    try:
+        store.put(h, summarize(joined), subject)
+    finally:
+        store.end(h)
+
+
+def summarize_research(texts: List[str], store: SummaryStore, pool: Executor,
+                       summarize: Optional[Callable[[str], str]], subject: Optional[str] = None) -> Tuple[str, bool]:
+    """수집한 페이지 텍스트 요약. 반환: (요약, 백그라운드 갱신 중 여부)
+    summarize는 원문 → 요약 함수 (None이면 원문 앞부분). pool은 백그라운드 갱신을 돌릴 실행기.
+    texts는 완료 순서가 아닌 고정된 순서(검색 순번/순위, URL 순서)로 넘겨야 같은 출처가 같은 해시가 된다.
+    - 같은 원문(+프롬프트 버전)은 저장된 요약을 LLM 호출 없이 반환
+    - 원문이 바뀌었고 subject의 이전 요약이 있으면 그것을 먼저 반환하고 새 요약은 백그라운드에서 계산"""
+    joined = "\n\n".join(t for t in texts if t)
+    if not joined:
+        return NO_TEXT_MESSAGE, False
+    if summarize is None:
+        return joined[:1500], False
+    h = store.key(joined)
+    cached = store.get(h)
+    if cached is not None:
+        if subject:
+            store.mark_latest(subject, h)
+        return cached, False
+    stale = store.latest(subject) if subject else None
+    if stale is not None:
+        if store.begin(h):
+            pool.submit(_refresh_summary, store, summarize, joined, h, subject)
+        return stale, True
+    summary = summarize(joined)
+    store.put(h, summary, subject)
+    return summary, False
+
+
+def rank_source_urls(hits_by_query: List[List[Dict[str, str]]], limit: int) -> List[str]:
+    """검색 결과를 (검색 순번, 결과 순위) 순으로 훑어 중복 URL을 빼고 앞에서 limit개.
+    검색이 끝난 순서와 무관하므로 같은 검색 결과면 항상 같은 출처와 순서가 된다."""
+    urls: List[str] = []
+    for hits in hits_by_query:
+        for h in hits:
+            u = h.get("url")
+            if u and u not in urls:
+                urls.append(u)
+                if len(urls) >= limit:
+                    return urls
+    return urls
@@ -0,0 +1,113 @@
+"""LLM 응답 캐시 (SQLite, 정확 일치 + 선택적 임베딩 유사도)."""
+import hashlib
+import json
+import math
+import operator
+import sqlite3
+import threading
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+
+def _normalize_prompt(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class ResponseCache:
+    """LLM 응답 캐시 (SQLite).
+    1차: 정규화된 (prompt, model, tone, length, temperature) 키 정확 일치
+    2차: (선택) 같은 설정 범위에서 최근 사용한 scan개 중 임베딩 코사인 유사도가 threshold 이상인 응답 재사용
+    (임베딩은 단위 벡터 float32 BLOB으로 저장)
+    TTL이 지난 항목은 무시/삭제하고, max_entries를 넘으면 오래 안 쓴 항목부터 제거한다."""
+
+    def __init__(self, path: str, ttl: int, max_entries: int, threshold: float, scan: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.scan = scan
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    embedding BLOB,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_scope_used ON responses(scope, last_used)")
+            # 예전 JSON 텍스트 임베딩은 버린다 (정확 일치 캐시는 유지)
+            self.conn.execute("UPDATE responses SET embedding = NULL WHERE typeof(embedding) = 'text'")
+            self.conn.commit()
+
+    @staticmethod
+    def scope(model: str, tone: str, length: int, temperature: float) -> str:
+        return json.dumps([model, tone, int(length), round(float(temperature), 2)], ensure_ascii=False)
+
+    @staticmethod
+    def key(prompt: str, scope: str) -> str:
+        return hashlib.sha256(f"{scope}\x00{_normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _unit(vec: List[float]) -> List[float]:
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def get(self, prompt: str, scope: str, embed=None) -> Tuple[Optional[str], Optional[bytes]]:
+        """반환: (캐시된 응답 또는 None, 질의 임베딩 또는 None).
+        빗나갔을 때 받은 임베딩을 put()에 넘기면 같은 질의를 다시 임베딩하지 않는다."""
+        now = time.time()
+        key = self.key(prompt, scope)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                return row[0], None
+        if embed is None:
+            return None, None
+
+        query = array("f", self._unit(embed(_normalize_prompt(prompt))))
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, response, embedding FROM responses "
+                "WHERE scope = ? AND embedding IS NOT NULL AND created >= ? "
+                "ORDER BY last_used DESC LIMIT ?",
+                (scope, now - self.ttl, self.scan),
+            ).fetchall()
+        best_key, best_resp, best_sim = None, None, self.threshold
+        for k, resp, emb in rows:
+            sim = sum(map(operator.mul, query, array("f", emb)))
+            if sim >= best_sim:
+                best_key, best_resp, best_sim = k, resp, sim
+        if best_key:
+            with self.lock:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, best_key))
+                self.conn.commit()
+        return best_resp, query.tobytes()
+
+    def put(self, prompt: str, scope: str, response: str, vector: Optional[bytes] = None) -> None:
+        """vector: get()이 돌려준 질의 임베딩 (없으면 유사도 검색 대상에서 빠짐)"""
+        now = time.time()
+        emb = sqlite3.Binary(vector) if vector else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, scope, response, embedding, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(prompt, scope), scope, response, emb, now, now),
+            )
+            self.conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self.conn.commit()
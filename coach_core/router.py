@@ -0,0 +1,47 @@
+"""키워드 기반 의도 라우터 (오프라인/무료 모드 응답)."""
+import re
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+
+class IntentRouter:
+    """키워드 기반 의도 분류기.
+    규칙 순서대로 `any(키워드 in 입력)`을 확인하던 if/elif 사슬과 같은 결과를 낸다.
+    - 모든 키워드를 lookahead 정규식 `(?=(kw1|kw2|...))` 하나로 미리 컴파일해 입력을 한 번만 훑는다.
+      폭이 0인 매칭이라 겹치는 키워드(예: "예시작성"의 "예시"와 "시작")도 각 위치에서 모두 잡힌다.
+    - 한 위치에서는 가장 긴 키워드만 잡히므로, 그 키워드의 접두어인 키워드도 함께 일치한 것으로 본다.
+    - 일치한 의도 중 우선순위(규칙 순서)가 가장 높은 것을 고른다.
+    lower=True면 입력만 소문자로 바꿔 비교한다 (키워드는 그대로; 원래 `user_message.lower()` 방식).
+    템플릿은 모듈 로드 시 한 번 만든 문자열을 그대로 돌려준다."""
+
+    def __init__(self, rules: List[Tuple[str, List[str]]], templates: Dict[str, str], default: str = "default",
+                 lower: bool = False):
+        self.intents = [intent for intent, _ in rules]
+        self.default = default
+        self.lower = lower
+        self.templates = MappingProxyType(dict(templates))
+        rank_of: Dict[str, int] = {}
+        self.always = len(rules)  # 빈 키워드는 모든 입력에 들어 있다
+        for rank, (_, words) in enumerate(rules):
+            for word in words:
+                if word:
+                    rank_of.setdefault(word, rank)
+                else:
+                    self.always = min(self.always, rank)
+        ordered = sorted(rank_of, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))") if ordered else None
+        # 잡힌 키워드 → 그 키워드와 접두어 키워드 중 가장 높은 우선순위
+        self.rank_of = {w: min(rank_of[w[:i]] for i in range(1, len(w) + 1) if w[:i] in rank_of) for w in ordered}
+
+    def route(self, text: str) -> Tuple[str, str]:
+        """(의도, 템플릿 응답) 반환"""
+        best = self.always
+        if self.pattern is not None and best:
+            for match in self.pattern.finditer(text.lower() if self.lower else text):
+                rank = self.rank_of[match.group(1)]
+                if rank < best:
+                    best = rank
+                    if rank == 0:
+                        break
+        intent = self.intents[best] if best < len(self.intents) else self.default
+        return intent, self.templates[intent]
@@ -0,0 +1,179 @@
+"""규칙 기반 자소서 스코어러.
+
+UI(test.py)와 배치 CLI(coach_core.batch)가 함께 쓴다. 스킬 목록은 호출하는 쪽이 SkillIndex로 만들어 넘기며,
+이 모듈은 pandas/streamlit 없이 import 된다(docx는 .docx를 읽을 때만 불러온다).
+"""
+import io
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+ACTION_WORDS = [
+    "개선", "최적화", "설계", "구현", "분석", "자동화", "협업", "리팩터", "검증",
+    "성과", "증가", "감소", "달성", "기여", "해결", "리더", "조율"
+]
+STAR_TOKENS = ["상황", "과제", "행동", "결과", "Situation", "Task", "Action", "Result"]
+FILLERS = ["최대한", "정말", "매우", "다양한", "많은", "열정", "성실", "노력"]
+
+NUM_RE = re.compile(r"(?<!\w)(?:[0-9]+(?:\.[0-9]+)?%?|[일이삼사오육칠팔구십]+%?)(?!\w)")
+
+TOKEN_RE = re.compile(r"[\w가-힣%]+")
+
+SCORE_COLUMNS = ["총점(0-100)", "성과(숫자)밀도", "행동성", "STAR구조", "길이적정", "스킬커버리지", "군더더기감점"]
+
+READ_ERROR_PREFIX = "[파일 읽기 오류]"
+
+
+def tokenize_kr(text: str) -> List[str]:
+    # 간단 토큰화(공백 기준). 형태소분석기 없이 동작
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """여러 키워드에 대해 "어떤 토큰의 부분문자열인가"(any(w in t for t in tokens))를
+    한 번의 정규식 스캔으로 판정한다.
+    - 토큰들을 개행으로 이어 붙인 문자열을 lookahead 정규식으로 한 번만 훑는다.
+    - 각 위치에서는 가장 긴 키워드만 잡히므로, 그 키워드의 접두어인 키워드도 함께 매칭 처리.
+    - 토큰 문자(TOKEN_RE)가 아닌 글자를 포함한 키워드는 어떤 토큰에도 들어갈 수 없으므로 제외."""
+
+    def __init__(self, words):
+        vocab = {w for w in words if w and TOKEN_RE.fullmatch(w)}
+        ordered = sorted(vocab, key=len, reverse=True)
+        self._re = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))") if ordered else None
+        self._prefixes = {w: [w[:i] for i in range(1, len(w) + 1) if w[:i] in vocab] for w in ordered}
+
+    def found(self, tokens) -> set:
+        hits = set()
+        if self._re is None:
+            return hits
+        for m in self._re.finditer("\n".join(tokens)):
+            w = m.group(1)
+            if w not in hits:
+                hits.update(self._prefixes[w])
+        return hits
+
+
+# 행동/STAR 키워드 매처 (import 시 1회 컴파일)
+_RESUME_MATCHER = KeywordMatcher(ACTION_WORDS + [w.lower() for w in STAR_TOKENS])
+_FILLERS_LOWER = [f.lower() for f in FILLERS]
+
+
+class SkillIndex(NamedTuple):
+    """스킬 커버리지 계산용: (매처, 전체 스킬 수, 빈 문자열 스킬 포함 여부)"""
+    matcher: KeywordMatcher
+    n_listed: int
+    has_empty: bool
+
+
+def build_skill_index(skill_names: Iterable[object]) -> SkillIndex:
+    listed = {str(s).lower() for s in skill_names}
+    return SkillIndex(KeywordMatcher(listed), len(listed), "" in listed)
+
+
+def month_skills(skills_df, month=None) -> List[object]:
+    """skills_analysis 표에서 month의 스킬 목록 (해당 월이 없거나 month가 없으면 전체)"""
+    df = skills_df
+    if month and "month" in df.columns:
+        df = df[df["month"] == month] if (df["month"] == month).any() else df
+    return df["skill"].unique().tolist()
+
+
+def latest_month(skills_df):
+    if skills_df is not None and "month" in skills_df.columns:
+        return skills_df["month"].max()
+    return None
+
+
+def skill_coverage(text: str, index: Optional[SkillIndex]) -> Tuple[float, List[str]]:
+    if index is None:
+        return 0.0, []
+    toks = set(tokenize_kr(text))
+    found = index.matcher.found(toks)
+    if index.has_empty and toks:
+        found.add("")  # 원래 구현에서 빈 문자열은 모든 토큰의 부분문자열
+    matched = sorted(found)
+    cov = len(matched) / max(1, index.n_listed)
+    return cov, matched[:20]
+
+
+def compute_resume_scores(text: str, skill_index: Optional[SkillIndex] = None) -> Dict[str, float]:
+    tokens = tokenize_kr(text)
+    n_words = len(tokens)
+    n_chars = len(text)
+
+    # 숫자(성과) 밀도
+    nums = NUM_RE.findall(text)
+    metric_density = min(1.0, len(nums) / max(1, n_words) * 10)  # 대략적 정규화
+
+    # 행동동사/STAR 단서는 한 번의 스캔으로 함께 수집
+    found = _RESUME_MATCHER.found(tokens)
+
+    # 행동동사/액션
+    action_hits = sum(1 for w in ACTION_WORDS if w in found)
+    action_score = min(1.0, action_hits / 6)
+
+    # STAR 단서
+    star_hits = sum(1 for w in STAR_TOKENS if w.lower() in found)
+    star_score = min(1.0, star_hits / 4)
+
+    # 군더더기(감점)
+    token_counts = Counter(tokens)
+    filler_hits = sum(token_counts[f] for f in _FILLERS_LOWER)
+    filler_penalty = min(0.3, filler_hits / max(1, n_words) * 5)
+
+    # 길이 적정성(600~1200자 권장)
+    length_score = 1.0 if 600 <= n_chars <= 1200 else max(0.3, 1 - abs(n_chars - 900) / 1200)
+
+    # 스킬 커버리지(트렌드 반영)
+    cov, matched = skill_coverage(text, skill_index)
+    coverage_score = min(1.0, 0.5 + cov)  # 0.5~1.0
+
+    # 가중합
+    weights = {
+        'metrics': 0.25,
+        'action': 0.15,
+        'star': 0.15,
+        'length': 0.15,
+        'coverage': 0.30,
+    }
+
+    total = (
+        metric_density * weights['metrics'] +
+        action_score * weights['action'] +
+        star_score * weights['star'] +
+        length_score * weights['length'] +
+        coverage_score * weights['coverage']
+    )
+    total = max(0.0, min(1.0, total - filler_penalty))
+
+    return {
+        '총점(0-100)': round(total * 100, 1),
+        '성과(숫자)밀도': round(metric_density, 3),
+        '행동성': round(action_score, 3),
+        'STAR구조': round(star_score, 3),
+        '길이적정': round(length_score, 3),
+        '스킬커버리지': round(coverage_score, 3),
+        '군더더기감점': round(filler_penalty, 3),
+    }
+
+
+def read_resume_file(name: str, fileobj) -> str:
+    """업로드/배치 입력 파일(.txt/.docx)의 텍스트. 실패하면 READ_ERROR_PREFIX로 시작하는 문자열."""
+    name = name.lower()
+    try:
+        if name.endswith('.docx'):
+            try:
+                from docx import Document
+            except ImportError:
+                Document = None
+            if Document is not None:
+                doc = Document(fileobj)
+                return "\n".join(p.text for p in doc.paragraphs)
+        # 기본 텍스트 시도
+        return fileobj.read().decode('utf-8', errors='ignore')
+    except Exception as e:
+        return f"{READ_ERROR_PREFIX} {e}"
+
+
+def read_resume_bytes(name: str, data: bytes) -> str:
+    return read_resume_file(name, io.BytesIO(data))
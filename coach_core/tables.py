@@ -0,0 +1,99 @@
+"""시장 데이터 CSV 로딩 (Feather 컬럼형 캐시 + 세션별 복사본)과 기술 수요 집계.
+
+CSV를 한 번 Feather(비압축)로 변환해 두고 이후엔 CSV 파싱/타입 변환 없이 로드한다.
+pandas/pyarrow는 선택 의존성이라 함수 안에서 import 한다.
+"""
+import os
+import tempfile
+
+CATEGORICAL_COLS = ("skill", "company")
+DATE_COLS = ("posted_date",)
+
+
+def apply_dtypes(df):
+    for c in CATEGORICAL_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    for c in DATE_COLS:
+        if c in df.columns:
+            import pandas as pd
+            df[c] = pd.to_datetime(df[c], errors="coerce")
+    return df
+
+
+def read_table(path: str, mtime_ns: int, size: int, cache_dir: str):
+    """CSV를 읽는다. cache_dir에 (mtime, 크기)가 같은 Feather 캐시가 있으면 그것을, 없으면 CSV를 읽고 캐시를 만든다.
+    CSV가 바뀌면 캐시 이름이 달라져 새로 만들고 이전 버전은 지운다."""
+    import pandas as pd
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        feather = None
+
+    base = os.path.basename(path)
+    cache_path = os.path.join(cache_dir, f"{base}.{mtime_ns}_{size}.feather")
+    df = None
+    if feather is not None and os.path.isfile(cache_path):
+        try:
+            df = feather.read_feather(cache_path)  # pandas로 변환되며 복사되므로 memory-map은 쓰지 않음
+        except Exception:
+            df = None
+    if df is None:
+        df = apply_dtypes(pd.read_csv(path))
+        if feather is not None:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # 여러 세션이 동시에 만들어도 서로의 임시 파일을 덮어쓰지 않도록 고유 이름에 쓰고 교체
+                with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=base + ".", suffix=".tmp", delete=False) as tmp:
+                    pass
+                try:
+                    feather.write_feather(df, tmp.name, compression="uncompressed")
+                    os.replace(tmp.name, cache_path)
+                finally:
+                    if os.path.exists(tmp.name):
+                        os.remove(tmp.name)
+                # 같은 CSV의 이전 버전 캐시 정리
+                for f in os.listdir(cache_dir):
+                    if f.startswith(base + ".") and f.endswith(".feather") and os.path.join(cache_dir, f) != cache_path:
+                        os.remove(os.path.join(cache_dir, f))
+            except Exception:
+                pass  # 캐시 디렉터리에 쓸 수 없으면 CSV만 사용
+    # 파생 인덱스(스킬 매처 등) 캐시 키로 쓰는 원본 버전
+    df.attrs["source_version"] = f"{path}:{mtime_ns}"
+    return df
+
+
+def copy_on_write_enabled() -> bool:
+    import pandas as pd
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True  # 3.0부터 기본 동작
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except Exception:  # pandas < 2.0: 옵션 없음
+        return False
+
+
+def session_copy(df):
+    """공유 캐시(st.cache_resource)의 DataFrame을 세션에 넘길 때의 복사본.
+    열 추가/값 수정/attrs 변경이 캐시된 원본과 다른 세션으로 새지 않는다.
+    Copy-on-Write가 켜져 있으면 수정할 때까지 데이터를 복사하지 않고, 아니면 깊은 복사."""
+    out = df.copy(deep=not copy_on_write_enabled())
+    out.attrs = dict(df.attrs)  # 오래된 pandas는 얕은 복사에서 attrs 딕셔너리를 공유한다
+    return out
+
+
+def skill_demand_tables(df, top_n: int):
+    """(최신 월, {월: 상위 top_n 기술 수요표(skill, job_count|count)}).
+    month 컬럼이 없으면 전체 데이터를 키 None 으로 집계한다."""
+
+    def _top(g):
+        if "job_count" in g.columns:
+            # skill 이 category 타입이어도 해당 월에 실제로 있는 기술만 집계
+            return g.groupby("skill", observed=True)["job_count"].sum().sort_values(ascending=False).head(top_n).reset_index()
+        counts = g["skill"].value_counts()
+        return counts[counts > 0].head(top_n).rename_axis("skill").reset_index(name="count")
+
+    if "month" in df.columns and df["month"].notna().any():
+        latest = df["month"].max()
+        return latest, {m: _top(g) for m, g in df.groupby("month")}
+    return None, {None: _top(df)}
@@ -0,0 +1,352 @@
+"""웹 요청 공통: 호스트별 동시성 제한, 디스크 HTTP 캐시(SQLite), 스트리밍 다운로드, 페이지 텍스트 추출.
+
+함수의 clients 인자는 session(requests.Session), limiter(HostLimiter), cache(HttpCache) 속성을 가진 객체다
+(앱의 ResearchClients). 프로세스 공용 핸들은 앱이 st.cache_resource로 만들어 스크립트 스레드에서 넘긴다.
+requests는 캐시 적중 응답을 만들 때만 함수 안에서 import 한다.
+"""
+import codecs
+import contextlib
+import email.message
+import hashlib
+import json
+import re
+import sqlite3
+import textwrap
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+HTTP_TIMEOUT = 15           # 요청 1건 최대 대기(초)
+HTTP_CACHE_TTL = {          # 출처별 신선도(초). 지나면 ETag/Last-Modified로 재검증
+    "search": 24 * 3600,    # SerpAPI / Bing 검색 결과 (쿼터 절약)
+    "page": 6 * 3600,       # 수집한 웹 페이지
+}
+PAGE_TEXT_BUDGET = 3000               # 페이지당 사용할 텍스트 글자 수
+PAGE_MAX_BYTES = 2 * 1024 * 1024      # 페이지당 최대 다운로드 바이트
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+class HostLimiter:
+    """호스트별 동시 요청 수 제한 (BoundedSemaphore)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.sems: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextlib.contextmanager
+    def slot(self, host: str, timeout: float):
+        with self.lock:
+            sem = self.sems.setdefault(host, threading.BoundedSemaphore(self.limit))
+        if not sem.acquire(timeout=timeout):
+            raise TimeoutError(f"{host}: 동시 요청 대기 시간 초과")
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+class HttpCache:
+    """GET 응답(200)을 SQLite에 저장하는 크기 제한 LRU 캐시.
+    TTL 안이면 네트워크 없이 반환하고, 지나면 조건부 요청(If-None-Match / If-Modified-Since)으로
+    재검증해 304면 저장본을 그대로 쓴다."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS http_cache (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_lru ON http_cache(last_used)")
+            self.conn.commit()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None, variant: str = "") -> str:
+        raw = url + "?" + json.dumps(sorted((params or {}).items()), ensure_ascii=False, default=str)
+        if variant:
+            raw += "#" + variant
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, str], bytes, float]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT headers, body, fetched FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self.conn.execute("UPDATE http_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                self.conn.commit()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def refresh(self, key: str) -> None:
+        """304 재검증 성공: 신선도 갱신"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE http_cache SET fetched = ?, last_used = ? WHERE key = ?", (now, now, key))
+            self.conn.commit()
+
+    def put(self, key: str, url: str, headers: Dict[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, url, headers, body, size, fetched, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(headers), sqlite3.Binary(body), len(body), now, now),
+            )
+            (total,) = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+            while total > self.max_bytes:
+                victim = self.conn.execute(
+                    "SELECT key, size FROM http_cache ORDER BY last_used ASC LIMIT 1"
+                ).fetchone()
+                if not victim:
+                    break
+                self.conn.execute("DELETE FROM http_cache WHERE key = ?", (victim[0],))
+                total -= victim[1]
+            self.conn.commit()
+
+
+def _cached_response(url: str, headers: Dict[str, str], body: bytes):
+    import requests
+
+    r = requests.Response()
+    r.status_code = 200
+    r.url = url
+    r._content = body
+    r.headers.update(headers)
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    return r
+
+
+def _request_timeout(deadline: Optional[float]) -> float:
+    if deadline is None:
+        return HTTP_TIMEOUT
+    return max(0.1, min(HTTP_TIMEOUT, deadline - time.monotonic()))
+
+
+def _cache_lookup(cache: HttpCache, url: str, source: str, params: Optional[Dict], variant: str = ""):
+    """반환: (key, entry, fresh)"""
+    key = HttpCache.key(url, params, variant)
+    entry = cache.get(key)
+    fresh = bool(entry) and time.time() - entry[2] < HTTP_CACHE_TTL.get(source, HTTP_CACHE_TTL["page"])
+    return key, entry, fresh
+
+
+def _revalidate(kwargs: Dict, entry) -> Dict:
+    """만료된 저장본이 있으면 조건부 요청 헤더(If-None-Match / If-Modified-Since)를 붙인다."""
+    if not entry:
+        return kwargs
+    headers = entry[0]
+    cond = dict(kwargs.get("headers") or {})
+    if headers.get("ETag"):
+        cond["If-None-Match"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        cond["If-Modified-Since"] = headers["Last-Modified"]
+    return {**kwargs, "headers": cond}
+
+
+def _cacheable(r) -> Optional[Dict[str, str]]:
+    if r.status_code != 200 or "no-store" in r.headers.get("Cache-Control", ""):
+        return None
+    return {k: r.headers[k] for k in ("Content-Type", "ETag", "Last-Modified") if k in r.headers}
+
+
+def http_get(url: str, clients, deadline: Optional[float] = None, source: str = "page", **kwargs):
+    """공유 세션 + 호스트별 동시성 제한 + (선택) 전체 마감시각(time.monotonic 기준)을 지키는 GET.
+    디스크 캐시를 먼저 보고, 만료된 항목은 조건부 요청으로 재검증한다."""
+    cache = clients.cache
+    key, entry, fresh = _cache_lookup(cache, url, source, kwargs.get("params"))
+    if fresh:
+        return _cached_response(url, entry[0], entry[1])
+    kwargs = _revalidate(kwargs, entry)
+
+    timeout = _request_timeout(deadline)
+    with clients.limiter.slot(urlparse(url).netloc, timeout):
+        r = clients.session.get(url, timeout=timeout, **kwargs)
+
+    if r.status_code == 304 and entry:
+        cache.refresh(key)
+        return _cached_response(url, entry[0], entry[1])
+    keep = _cacheable(r)
+    if keep is not None:
+        cache.put(key, url, keep, r.content)
+    return r
+
+
+class ChunkStream:
+    """http_get_stream이 돌려주는 본문 chunk 이터레이터.
+    끝까지 읽었을 때(전체 본문)와 소비자가 finish()로 예산 도달을 알렸을 때(앞부분)만 store(body, complete)를 부른다.
+    close()만 불린 경우(타임아웃, 연결 끊김, 파싱 오류 등)는 잘린 본문이므로 캐시하지 않는다."""
+
+    def __init__(self, response, chunk_size: int, max_bytes: int = 0, store=None):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.store = store
+        self.received = bytearray()
+        self.complete = False
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+            if self.max_bytes and len(self.received) + len(chunk) > self.max_bytes:
+                chunk = chunk[: self.max_bytes - len(self.received)]
+            self.received.extend(chunk)
+            yield chunk
+            if self.max_bytes and len(self.received) >= self.max_bytes:
+                self.finish()  # 다운로드 예산 도달
+                return
+        self.complete = True
+        self.finish()
+
+    def finish(self) -> None:
+        """의도한 종료: 받은 만큼 저장하고 연결을 닫는다."""
+        if not self.closed and self.store is not None and self.received:
+            self.store(bytes(self.received), self.complete)
+        self.close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.response.close()
+
+
+class _StoredBody:
+    """캐시 저장본을 응답처럼 흘려보내는 대역 (ChunkStream 입력용)"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+def http_get_stream(url: str, clients, deadline: Optional[float] = None, source: str = "page",
+                    max_bytes: int = 0, chunk_size: int = 16 * 1024, **kwargs):
+    """http_get의 스트리밍 버전. (headers, ChunkStream)을 반환하며, 캐시 적중 시 저장본을 흘려보낸다.
+    max_bytes(0이면 무제한)에 닿거나 소비자가 finish()로 멈추면 다운로드를 끊고 그 앞부분만
+    별도 키("prefix:<max_bytes>")로 캐시한다. http_get은 이 키를 읽지 않으므로 잘린 본문을 전체로 쓰지 않는다."""
+    cache = clients.cache
+    params = kwargs.get("params")
+    prefix = f"prefix:{max_bytes}"
+    key, entry, fresh = _cache_lookup(cache, url, source, params)
+    if not entry:
+        key, entry, fresh = _cache_lookup(cache, url, source, params, prefix)
+    if fresh:
+        return entry[0], ChunkStream(_StoredBody(entry[1]), chunk_size, max_bytes)
+    kwargs = _revalidate(kwargs, entry)
+
+    timeout = _request_timeout(deadline)
+    with clients.limiter.slot(urlparse(url).netloc, timeout):
+        r = clients.session.get(url, timeout=timeout, stream=True, **kwargs)
+
+    if r.status_code == 304 and entry:
+        r.close()
+        cache.refresh(key)
+        return entry[0], ChunkStream(_StoredBody(entry[1]), chunk_size, max_bytes)
+    r.raise_for_status()
+    keep = _cacheable(r)
+
+    def store(body: bytes, complete: bool) -> None:
+        if keep is not None:
+            cache.put(HttpCache.key(url, params, "" if complete else prefix), url, keep, body)
+
+    return dict(r.headers), ChunkStream(r, chunk_size, max_bytes, store)
+
+
+class _BudgetTextParser(HTMLParser):
+    """p/li 안의 텍스트만 모으는 증분 파서. 모은 글자 수가 budget을 넘으면 done=True."""
+
+    TEXT_TAGS = {"p", "li"}
+    SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+    def __init__(self, budget: int):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.parts: List[str] = []
+        self.buf: List[str] = []   # 태그 사이 텍스트 (feed 경계에서 잘린 조각을 이어 붙임)
+        self.size = 0
+        self.depth = 0
+        self.skip = 0
+        self.done = False
+
+    def _flush(self):
+        t = "".join(self.buf).strip()
+        self.buf = []
+        if t:
+            self.parts.append(t)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in self.TEXT_TAGS:
+            self.depth += 1
+        elif tag in self.SKIP_TAGS:
+            self.skip += 1
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in self.TEXT_TAGS and self.depth:
+            self.depth -= 1
+        elif tag in self.SKIP_TAGS and self.skip:
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if self.done or not self.depth or self.skip:
+            return
+        self.buf.append(data)
+        self.size += len(data)
+        self.done = self.size > self.budget
+
+    def text(self) -> str:
+        self._flush()
+        return " ".join(self.parts)
+
+
+def _header_charset(content_type: str) -> Optional[str]:
+    msg = email.message.Message()
+    msg["Content-Type"] = content_type
+    return msg.get_param("charset")
+
+
+def stream_page_text(url: str, clients, deadline: Optional[float] = None,
+                     budget: int = PAGE_TEXT_BUDGET, max_bytes: int = PAGE_MAX_BYTES) -> str:
+    """페이지를 받으면서 p/li 텍스트를 최대 budget자까지 모은다. 예산을 채우면 나머지는 받지 않는다."""
+    headers, stream = http_get_stream(url, clients, deadline, max_bytes=max_bytes)
+    encoding = _header_charset(headers.get("Content-Type", ""))
+    parser = _BudgetTextParser(budget)
+    decoder = None
+    try:
+        for chunk in stream:
+            if decoder is None:
+                if not encoding:
+                    m = _META_CHARSET_RE.search(chunk[:4096])
+                    encoding = m.group(1).decode("ascii") if m else "utf-8"
+                try:
+                    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            parser.feed(decoder.decode(chunk))
+            if parser.done:
+                break  # 예산을 채웠으면 나머지는 받지 않음
+        stream.finish()  # 끝까지 읽었거나 예산을 채운 경우만 받은 만큼 캐시
+    finally:
+        stream.close()
+    return textwrap.shorten(parser.text(), budget)
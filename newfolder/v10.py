@@ -6,10 +6,15 @@
 # 실행: streamlit run v8.py
 # =========================================================
 
-import os, io, datetime, json
-from typing import Optional, List, Dict
+import os, io, sys, datetime, json, uuid
+from typing import Optional, List, Dict, Tuple
 import streamlit as st
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+from coach_core.exports import ExportBuilder, TextExport, DocxExport
+from coach_core.router import IntentRouter
+from coach_core.blob_store import BlobStore
+
 # ===== 문서 생성 라이브러리 (선택) =====
 try:
     from docx import Document
@@ -95,8 +100,9 @@ if "current_tab" not in st.session_state:
 if "api_key" not in st.session_state:
     st.session_state.api_key = os.getenv("OPENAI_API_KEY", "")
 
-if "saved_files" not in st.session_state:
-    st.session_state.saved_files = []
+if "blob_owner" not in st.session_state:
+    # 저장 파일은 BlobStore에 두고 세션에는 내 파일을 찾을 키만 보관
+    st.session_state.blob_owner = uuid.uuid4().hex
 
 if "save_format" not in st.session_state:
     st.session_state.save_format = "txt"
@@ -139,21 +145,16 @@ def get_guideline_response():
 
 💡 **Tip**: 한 번에 모든 걸 해결하려 하지 말고, 단계별로 질문하세요!"""
 
-# ================= AI 응답 생성 =================
-def get_ai_response(user_input: str, uploaded_file=None) -> str:
-    guideline_keywords = ["가이드", "가이드라인", "도움말", "사용법", "어떻게"]
-    if any(keyword in user_input for keyword in guideline_keywords):
-        return get_guideline_response()
-
-    if not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
-        templates = {
-            "default": """자기소개서 작성을 도와드리겠습니다!
+# ================= 오프라인 응답 (의도 라우터) =================
+OFFLINE_TEMPLATES = {
+    "guide": get_guideline_response(),
+    "default": """자기소개서 작성을 도와드리겠습니다!
 
 구체적으로 알려주시면 더 정확한 도움을 드릴 수 있어요:
 • 어떤 직무에 지원하시나요?
 • 어떤 부분이 어려우신가요?
 • 특별히 강조하고 싶은 경험이 있나요?""",
-            "첨삭": """자기소개서 첨삭 포인트를 알려드릴게요:
+    "첨삭": """자기소개서 첨삭 포인트를 알려드릴게요:
 
 ✅ 구체적인 숫자와 성과 포함
 ✅ 직무와 연관된 경험 강조
@@ -161,7 +162,7 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
 ✅ 진정성 있는 지원동기
 
 파일을 업로드하거나 내용을 보내주시면 더 자세히 봐드릴게요!""",
-            "시작": """자기소개서 작성을 시작해볼까요?
+    "시작": """자기소개서 작성을 시작해볼까요?
 
 **Step 1. 기본 정보**
 • 지원 회사:
@@ -169,19 +170,38 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
 • 경력 구분: (신입/경력)
 
 이 정보를 알려주시면 맞춤형으로 도와드릴게요!""",
-        }
-        if "첨삭" in user_input or "수정" in user_input:
-            return templates["첨삭"]
-        elif "시작" in user_input or "처음" in user_input:
-            return templates["시작"]
-        else:
-            return templates["default"]
+}
+
+# 가이드 요청은 API 키가 있어도 항상 오프라인으로 답한다 (우선순위 최상위)
+OFFLINE_ROUTER = IntentRouter(
+    [
+        ("guide", ["가이드", "가이드라인", "도움말", "사용법", "어떻게"]),
+        ("첨삭", ["첨삭", "수정"]),
+        ("시작", ["시작", "처음"]),
+    ],
+    OFFLINE_TEMPLATES,
+)
+
+# ================= LLM 클라이언트 풀 =================
+LLM_POOL_SIZE = 32  # 서로 다른 (api_key, model, temperature) 조합 최대 보관 수 (LRU)
+
+@st.cache_resource(max_entries=LLM_POOL_SIZE, show_spinner=False)
+def get_llm(api_key: str, model: str, temperature: float):
+    """(api_key, model, temperature)별 ChatOpenAI를 프로세스 전역에서 재사용.
+    클라이언트 내부 HTTP 커넥션이 유지되어 메시지마다 TLS 핸드셰이크를 하지 않는다."""
+    return ChatOpenAI(api_key=api_key, model=model, temperature=temperature)
+
+# ================= AI 응답 생성 =================
+def get_ai_response(user_input: str, uploaded_file=None) -> str:
+    intent, reply = OFFLINE_ROUTER.route(user_input)
+    if intent == "guide" or not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
+        return reply
 
     try:
-        llm = ChatOpenAI(
+        llm = get_llm(
             api_key=st.session_state.api_key,
             model="gpt-4o-mini",
-            temperature=st.session_state.model_settings["temperature"]
+            temperature=st.session_state.model_settings["temperature"],
         )
 
         system_prompt = f"""당신은 전문 자기소개서 작성 코치입니다.
@@ -216,44 +236,56 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
     except Exception as e:
         return f"오류가 발생했습니다. 다시 시도해주세요.\n{str(e)}"
 
+# ================= 저장 파일 보관소 =================
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "./saved_exports")
+BLOB_TTL = int(os.getenv("BLOB_TTL", str(7 * 24 * 3600)))                      # 초
+BLOB_QUOTA_BYTES = int(os.getenv("BLOB_QUOTA_BYTES", str(50 * 1024 * 1024)))   # 사용자(세션)당
+
+@st.cache_resource(show_spinner=False)
+def get_blob_store() -> BlobStore:
+    return BlobStore(BLOB_STORE_DIR, BLOB_TTL, BLOB_QUOTA_BYTES)
+
+def render_saved_file(file: Dict) -> None:
+    """파일 내용은 '다운로드 준비'를 누른 항목만 읽어서 download_button에 넘긴다"""
+    st.write(f"📄 {file['name']} ({file['date']}, {file['size']} bytes)")
+    if st.session_state.get("download_ready") == file["id"]:
+        data = get_blob_store().read(st.session_state.blob_owner, file["id"])
+        if data is None:
+            st.warning("보관 기간이 지나 삭제된 파일입니다.")
+            return
+        st.download_button(
+            label="다운로드",
+            data=data,
+            file_name=file["name"],
+            mime=file["mime"],
+            key=f"download_{file['id']}",
+        )
+    elif st.button("다운로드 준비", key=f"prepare_{file['id']}"):
+        st.session_state.download_ready = file["id"]
+        st.rerun()
+
 # ================= 대화 저장 =================
-def save_conversation():
-    content = ""
-    for msg in st.session_state.messages:
-        role = "👤 사용자" if msg["role"] == "user" else "🤖 AI 코치"
-        content += f"[{msg.get('time', '')}] {role}\n{msg['content']}\n\n"
+EXPORT_SPOOL_DIR = os.getenv("EXPORT_SPOOL_DIR") or None  # 내보내기 작업 파일 위치 (기본: 시스템 임시 폴더)
 
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"자소서대화_{timestamp}"
-
-    if st.session_state.save_format == "txt":
-        file_data = content
-        mime = "text/plain"
-        ext = "txt"
-    elif st.session_state.save_format == "docx" and DOC_LIBS_AVAILABLE:
-        doc = Document()
-        doc.add_heading('AI 자기소개서 코칭 대화', 0)
-        for para in content.split('\n'):
-            doc.add_paragraph(para)
-        bio = io.BytesIO()
-        doc.save(bio)
-        file_data = bio.getvalue()
-        mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        ext = "docx"
-    else:
-        file_data = content
-        mime = "text/plain"
-        ext = "txt"
-
-    st.session_state.saved_files.append({
-        "name": f"{filename}.{ext}",
-        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-        "size": len(file_data),
-        "data": file_data,
-        "mime": mime
-    })
+def _role_label(msg: Dict) -> str:
+    return "👤 사용자" if msg["role"] == "user" else "🤖 AI 코치"
 
-    return f"{filename}.{ext}"
+def get_export_builder(save_format: str) -> ExportBuilder:
+    """세션·형식별 내보내기 빌더 (세션에는 스풀 경로와 커서만 남는다)"""
+    cls = DocxExport if save_format == "docx" and DOC_LIBS_AVAILABLE else TextExport
+    builders = st.session_state.setdefault("export_builders", {})
+    builder = builders.get(cls.__name__)
+    if builder is None:
+        builder = builders[cls.__name__] = cls(_role_label, EXPORT_SPOOL_DIR)
+    return builder
+
+def save_conversation():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    builder = get_export_builder(st.session_state.save_format)
+    builder.append(st.session_state.messages)
+    filename = f"자소서대화_{timestamp}.{builder.ext}"
+    get_blob_store().put(st.session_state.blob_owner, filename, builder.getvalue(), builder.mime)
+    return filename
 
 # ================= UI 렌더링 함수 =================
 def render_header(title: str = "AI 자기소개서 코칭") -> None:
@@ -388,23 +420,17 @@ def render_advanced_settings_tab():
 def render_storage_tab():
     """저장소 화면"""
     render_header("저장소")
-    if not st.session_state.saved_files:
+    saved_files = get_blob_store().list(st.session_state.blob_owner)
+    if not saved_files:
         st.info("저장된 파일이 없습니다. 대화를 저장하려면 설정 탭을 이용하세요.")
     else:
-        st.write(f"총 {len(st.session_state.saved_files)}개의 파일이 저장되어 있습니다.")
-        for i, file in enumerate(st.session_state.saved_files):
-            st.write(f"📄 {file['name']} ({file['date']}, {file['size']} bytes)")
-            st.download_button(
-                label="다운로드",
-                data=file["data"],
-                file_name=file["name"],
-                mime=file["mime"],
-                key=f"download_{i}_{file['name']}",
-            )
-    if st.session_state.saved_files:
+        st.write(f"총 {len(saved_files)}개의 파일이 저장되어 있습니다.")
+        for file in saved_files:
+            render_saved_file(file)
+    if saved_files:
         st.markdown("---")
         if st.button("🗑️ 모든 파일 삭제"):
-            st.session_state.saved_files = []
+            get_blob_store().clear(st.session_state.blob_owner)
             st.success("모든 파일이 삭제되었습니다!")
             st.rerun()
     render_bottom_nav()
@@ -1,15 +1,19 @@
 # Requirements (install first):
 #   pip install streamlit python-docx reportlab langchain langchain-openai python-dotenv
 
-import os, io, json, time, textwrap, re, datetime, urllib.parse
+import os, io, sys, json, time, textwrap, re, datetime, urllib.parse
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+from coach_core.memory import SummarizingMemory
+
 # ===== LangChain imports (조건부) =====
 try:
     from langchain_openai import ChatOpenAI
-    from langchain.prompts import ChatPromptTemplate
-    from langchain.memory import ConversationBufferMemory
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
     from langchain.chains import LLMChain
     LANGCHAIN_AVAILABLE = True
 except ImportError:
@@ -141,9 +145,14 @@ if "initialized" not in st.session_state:
         "timestamp": datetime.datetime.now().strftime("%p %I:%M")
     })
 
+# ================= 대화 메모리 =================
+@st.cache_resource
+def _memory_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
+
 # ===== LangChain 메모리 설정 =====
 if LANGCHAIN_AVAILABLE and "lc_memory" not in st.session_state:
-    st.session_state.lc_memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    st.session_state.lc_memory = SummarizingMemory(_memory_executor())
 
 # ================= 유틸리티 함수 =================
 def now_hhmm():
@@ -187,11 +196,14 @@ def get_ai_response(user_message: str) -> str:
                 - 구체적이고 실용적인 조언을 제공하세요
                 - 사용자의 경험을 바탕으로 개선점을 제안하세요
                 """),
+                MessagesPlaceholder(variable_name="chat_history"),
                 ("human", "{input}")
             ])
             
-            chain = LLMChain(llm=llm, prompt=prompt, memory=st.session_state.lc_memory)
-            response = chain.run(input=user_message)
+            memory = st.session_state.lc_memory
+            chain = LLMChain(llm=llm, prompt=prompt)
+            response = chain.run(input=user_message, chat_history=memory.messages())
+            memory.save(user_message, response, llm)
             return response
         else:
             # 데모 응답 (API 키가 없을 때)
@@ -343,7 +355,7 @@ def render_storage_tab():
                 "timestamp": now_hhmm()
             }]
             if LANGCHAIN_AVAILABLE:
-                st.session_state.lc_memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+                st.session_state.lc_memory = SummarizingMemory(_memory_executor())
             st.success("대화 내용이 초기화되었습니다.")
             st.rerun()
     else:
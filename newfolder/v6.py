@@ -1,17 +1,26 @@
 # Requirements (install first):
 #   pip install streamlit python-docx reportlab langchain langchain-openai langchain-google-genai python-dotenv googletrans
 
-import os, io, json, time, textwrap, re, datetime, urllib.parse
+import os, io, sys, json, time, textwrap, re, datetime, urllib.parse, html, uuid
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple, List, Dict
 import base64
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+from coach_core.router import IntentRouter
+from coach_core.memory import SummarizingMemory
+from coach_core.file_catalog import FileCatalog
+
 # ===== 문서 생성을 위한 라이브러리 =====
 try:
     from docx import Document
     from reportlab.lib.pagesizes import letter
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
     DOC_LIBS_AVAILABLE = True
 except ImportError:
     DOC_LIBS_AVAILABLE = False
@@ -20,8 +29,8 @@ except ImportError:
 try:
     from langchain_openai import ChatOpenAI
     from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.prompts import ChatPromptTemplate
-    from langchain.memory import ConversationBufferMemory
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
     from langchain.chains import LLMChain
     LANGCHAIN_AVAILABLE = True
 except ImportError:
@@ -204,11 +213,26 @@ if "initialized" not in st.session_state:
         "timestamp": datetime.datetime.now().strftime("%H:%M")
     })
 
-if "saved_files" not in st.session_state:
-    st.session_state.saved_files = []
+if "catalog_owner" not in st.session_state:
+    st.session_state.catalog_owner = uuid.uuid4().hex
+
+# ================= 대화 메모리 =================
+@st.cache_resource
+def _memory_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
 
 if LANGCHAIN_AVAILABLE and "lc_memory" not in st.session_state:
-    st.session_state.lc_memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    st.session_state.lc_memory = SummarizingMemory(_memory_executor())
+
+def reset_conversation():
+    """대화 내용과 LangChain 메모리를 함께 처음 상태로 되돌린다 (이전 대화가 요약/기록에 남지 않게)"""
+    st.session_state.msgs = [{
+        "role": "bot",
+        "content": "안녕하세요! AI 자기소개서 코치입니다. 🎯\n\n어떤 도움이 필요하신가요?",
+        "timestamp": datetime.datetime.now().strftime("%H:%M")
+    }]
+    if LANGCHAIN_AVAILABLE:
+        st.session_state.lc_memory = SummarizingMemory(_memory_executor())
 
 # ================= 유틸리티 함수 =================
 def now_hhmm():
@@ -229,10 +253,9 @@ def translate_to_english(text: str) -> str:
     except Exception as e:
         return f"번역 중 오류가 발생했습니다: {str(e)}"
 
-def get_free_ai_response(user_message: str) -> str:
-    """무료 AI 응답 생성"""
-    response_templates = {
-        "마케팅": """📊 **마케팅 직무 자기소개서 작성 가이드**
+# ================= 무료 모드 응답 (의도 라우터) =================
+FREE_TEMPLATES = {
+    "마케팅": """📊 **마케팅 직무 자기소개서 작성 가이드**
 
 **1. 핵심 역량 강조**
 - 데이터 분석 및 인사이트 도출 능력
@@ -248,8 +271,7 @@ def get_free_ai_response(user_message: str) -> str:
 - STAR 기법 활용 (상황-과제-행동-결과)
 - 문제 해결 과정과 결과 중심
 - 팀워크와 리더십 경험 포함""",
-        
-        "개발": """💻 **개발 직무 자기소개서 작성 가이드**
+    "개발": """💻 **개발 직무 자기소개서 작성 가이드**
 
 **1. 기술 스택 명시**
 - 사용 가능한 프로그래밍 언어
@@ -265,8 +287,7 @@ def get_free_ai_response(user_message: str) -> str:
 - 지속적 학습과 기술 트렌드 관심
 - 오픈소스 기여나 개인 프로젝트
 - 새로운 기술에 대한 도전 의지""",
-        
-        "영업": """🎯 **영업 직무 자기소개서 작성 가이드**
+    "영업": """🎯 **영업 직무 자기소개서 작성 가이드**
 
 **1. 영업 성과 강조**
 - 목표 달성률과 매출 기여도
@@ -281,19 +302,8 @@ def get_free_ai_response(user_message: str) -> str:
 **3. 시장 이해도**
 - 업계 트렌드 및 경쟁사 분석
 - 고객사 비즈니스 모델 이해
-- 시장 변화에 대한 대응 능력"""
-    }
-    
-    user_lower = user_message.lower()
-    
-    if "마케팅" in user_lower:
-        return response_templates["마케팅"]
-    elif any(word in user_lower for word in ["개발", "프로그래밍", "코딩", "IT"]):
-        return response_templates["개발"]
-    elif "영업" in user_lower:
-        return response_templates["영업"]
-    elif any(word in user_lower for word in ["첨삭", "피드백", "검토"]):
-        return """✏️ **자기소개서 첨삭 포인트**
+- 시장 변화에 대한 대응 능력""",
+    "첨삭": """✏️ **자기소개서 첨삭 포인트**
 
 **1. 구조와 논리성**
 - 도입-본론-결론의 명확한 구성
@@ -310,9 +320,8 @@ def get_free_ai_response(user_message: str) -> str:
 - 반복되는 표현 제거
 - 전문적이면서도 자연스러운 어조
 
-📎 파일을 업로드하시면 더 구체적인 첨삭을 도와드릴 수 있습니다!"""
-    else:
-        return """🎯 **자기소개서 작성을 도와드릴게요!**
+📎 파일을 업로드하시면 더 구체적인 첨삭을 도와드릴 수 있습니다!""",
+    "default": """🎯 **자기소개서 작성을 도와드릴게요!**
 
 **효과적인 질문 예시:**
 - "마케팅 직무 자기소개서 작성법 알려주세요"
@@ -323,7 +332,23 @@ def get_free_ai_response(user_message: str) -> str:
 **기본 작성 원칙:**
 1. **STAR 기법** - 상황, 과제, 행동, 결과
 2. **구체적 수치** - 성과를 정량적으로 표현
-3. **차별화** - 나만의 독특한 경험과 강점"""
+3. **차별화** - 나만의 독특한 경험과 강점""",
+}
+
+FREE_ROUTER = IntentRouter(
+    [
+        ("마케팅", ["마케팅"]),
+        ("개발", ["개발", "프로그래밍", "코딩", "IT"]),
+        ("영업", ["영업"]),
+        ("첨삭", ["첨삭", "피드백", "검토"]),
+    ],
+    FREE_TEMPLATES,
+    lower=True,
+)
+
+def get_free_ai_response(user_message: str) -> str:
+    """무료 AI 응답 생성"""
+    return FREE_ROUTER.route(user_message)[1]
 
 def get_ai_response(user_message: str, uploaded_file=None) -> str:
     """AI 응답 생성"""
@@ -401,11 +426,14 @@ def get_ai_response(user_message: str, uploaded_file=None) -> str:
         
         prompt = ChatPromptTemplate.from_messages([
             ("system", system_prompt),
+            MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}")
         ])
         
-        chain = LLMChain(llm=llm, prompt=prompt, memory=st.session_state.lc_memory)
-        response = chain.run(input=prompt_text)
+        memory = st.session_state.lc_memory
+        chain = LLMChain(llm=llm, prompt=prompt)
+        response = chain.run(input=prompt_text, chat_history=memory.messages())
+        memory.save(prompt_text, response, llm)
         
         # 영문 변환 기능
         if settings["enable_translation"] and not uploaded_file:
@@ -417,6 +445,46 @@ def get_ai_response(user_message: str, uploaded_file=None) -> str:
     except Exception as e:
         return f"오류가 발생했습니다: {str(e)}\n\n{get_free_ai_response(user_message)}"
 
+# ================= PDF 폰트/스타일 =================
+KOREAN_FONT_PATH = os.getenv("KOREAN_FONT_PATH", "./NanumGothic.ttf")
+KOREAN_FONT_NAME = "NanumGothic"
+KOREAN_CID_FONT = "HYGothic-Medium"  # TTF가 없을 때 쓰는 ReportLab 내장 한글 폰트
+
+def _register_korean_font(font_path: str) -> str:
+    """한글 폰트를 ReportLab에 등록하고 폰트 이름을 반환 (TTF → 내장 CID 폰트 → Helvetica 순)"""
+    if os.path.exists(font_path):
+        try:
+            pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+            return KOREAN_FONT_NAME
+        except Exception:
+            pass
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_CID_FONT))
+        return KOREAN_CID_FONT
+    except Exception:
+        return "Helvetica"
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_styles(font_path: str = KOREAN_FONT_PATH) -> Dict[str, "ParagraphStyle"]:
+    """폰트 등록(TTF 파싱)과 스타일 생성을 프로세스에서 한 번만 한다.
+    여러 세션이 같은 스타일 객체를 함께 쓰므로 반환값은 수정하지 않는다."""
+    font_name = _register_korean_font(font_path)
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "KoreanTitle", parent=base["Heading1"], fontName=font_name,
+            fontSize=18, spaceAfter=30, alignment=1, wordWrap="CJK",
+        ),
+        "heading": ParagraphStyle("KoreanHeading", parent=base["Heading2"], fontName=font_name, wordWrap="CJK"),
+        "normal": ParagraphStyle("KoreanNormal", parent=base["Normal"], fontName=font_name, wordWrap="CJK"),
+    }
+
+PDF_DOC_OPTIONS = {"pagesize": letter} if DOC_LIBS_AVAILABLE else {}
+
+def make_pdf_doc(target, title: str = "") -> "SimpleDocTemplate":
+    """모든 PDF 내보내기가 쓰는 공통 문서 템플릿 (target: 파일 경로 또는 BytesIO)"""
+    return SimpleDocTemplate(target, title=title, **PDF_DOC_OPTIONS)
+
 # ================= 문서 생성 함수들 =================
 def create_txt(content: str, filename: str) -> str:
     """TXT 파일 생성"""
@@ -461,27 +529,15 @@ def create_pdf(content: str, filename: str) -> str:
     
     try:
         filepath = os.path.join(st.session_state.settings["save_dir"], f"{filename}.pdf")
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-        
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # 제목
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1
-        )
-        
-        story.append(Paragraph("자기소개서", title_style))
-        story.append(Spacer(1, 12))
+        doc = make_pdf_doc(filepath, title="자기소개서")
+        styles = get_pdf_styles()
+
+        story = [Paragraph("자기소개서", styles["title"]), Spacer(1, 12)]
         
-        # 본문
+        # 본문 (Paragraph는 마크업을 해석하므로 이스케이프)
         for line in content.split('\n'):
             if line.strip():
-                story.append(Paragraph(line, styles['Normal']))
+                story.append(Paragraph(html.escape(line), styles["normal"]))
             else:
                 story.append(Spacer(1, 6))
         
@@ -510,38 +566,18 @@ def save_conversation(file_format: str, filename: str) -> str:
         filepath = create_txt(conversation_text, filename)
     
     if filepath and os.path.exists(filepath):
-        file_info = {
-            "name": os.path.basename(filepath),
-            "path": filepath,
-            "created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "size": os.path.getsize(filepath)
-        }
-        if file_info not in st.session_state.saved_files:
-            st.session_state.saved_files.append(file_info)
+        get_file_catalog(st.session_state.settings["save_dir"]).record(filepath, st.session_state.catalog_owner)
         return filepath
     return None
 
-def get_saved_files() -> List[Dict]:
-    """저장된 파일 목록 반환"""
-    saved_files = []
-    save_dir = st.session_state.settings["save_dir"]
-    
-    if os.path.exists(save_dir):
-        for filename in os.listdir(save_dir):
-            filepath = os.path.join(save_dir, filename)
-            if os.path.isfile(filepath):
-                file_info = {
-                    "name": filename,
-                    "path": filepath,
-                    "created": datetime.datetime.fromtimestamp(
-                        os.path.getctime(filepath)
-                    ).strftime("%Y-%m-%d %H:%M:%S"),
-                    "size": os.path.getsize(filepath)
-                }
-                saved_files.append(file_info)
-    
-    saved_files.sort(key=lambda x: x["created"], reverse=True)
-    return saved_files
+def get_saved_files(query: str = "", page: int = 0) -> Tuple[List[Dict], int]:
+    """저장된 파일 목록 한 페이지와 전체 개수 반환 (카탈로그 조회)"""
+    return get_file_catalog(st.session_state.settings["save_dir"]).page(query, page)
+
+# ================= 저장 파일 카탈로그 =================
+@st.cache_resource(show_spinner=False)
+def get_file_catalog(save_dir: str) -> FileCatalog:
+    return FileCatalog(save_dir)
 
 # ================= UI 렌더링 함수들 =================
 def render_header():
@@ -654,6 +690,10 @@ def render_chat_tab():
             
             st.rerun()
 
+    if st.button("🗑️ 대화 내용 초기화", type="secondary"):
+        reset_conversation()
+        st.rerun()
+
 def render_settings_tab():
     """설정 탭 렌더링"""
     st.markdown("""
@@ -9,7 +9,7 @@
 #   - OPENAI_API_KEY / GEMINI_API_KEY는 .env에 넣거나, 화면의 설정 탭에서 직접 입력하세요.
 # =========================================================
 
-import os, io, json, time, textwrap, re, datetime, urllib.parse, base64
+import os, io, json, time, textwrap, re, datetime, urllib.parse, base64, html
 from typing import Optional, Tuple, List, Dict
 
 import streamlit as st
@@ -105,6 +105,7 @@ try:
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
     DOC_LIBS_AVAILABLE = True
 except Exception:
     DOC_LIBS_AVAILABLE = False
@@ -252,18 +253,6 @@ def translate_to_english(text: str) -> str:
     except Exception as e:
         return f"번역 중 오류가 발생했습니다: {e}"
 
-def _ensure_korean_font(font_path: str, font_name: str = "NanumGothic"):
-    """ReportLab에 한글 폰트를 등록 (없으면 기본 폰트 사용)"""
-    if not DOC_LIBS_AVAILABLE:
-        return None
-    if not os.path.exists(font_path):
-        return None
-    try:
-        pdfmetrics.registerFont(TTFont(font_name, font_path))
-        return font_name
-    except Exception:
-        return None
-
 def _read_uploaded_text(uploaded_file) -> str:
     """txt/docx 업로드 파일을 안전하게 텍스트로 파싱"""
     name = uploaded_file.name.lower()
@@ -452,6 +441,46 @@ def get_ai_response(user_message: str, uploaded_file=None) -> str:
     except Exception as e:
         return f"오류가 발생했습니다: {e}\n\n{get_free_ai_response(user_message)}"
 
+# ================= PDF 폰트/스타일 =================
+KOREAN_FONT_PATH = os.getenv("KOREAN_FONT_PATH", "./NanumGothic.ttf")
+KOREAN_FONT_NAME = "NanumGothic"
+KOREAN_CID_FONT = "HYGothic-Medium"  # TTF가 없을 때 쓰는 ReportLab 내장 한글 폰트
+
+def _register_korean_font(font_path: str) -> str:
+    """한글 폰트를 ReportLab에 등록하고 폰트 이름을 반환 (TTF → 내장 CID 폰트 → Helvetica 순)"""
+    if os.path.exists(font_path):
+        try:
+            pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+            return KOREAN_FONT_NAME
+        except Exception:
+            pass
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_CID_FONT))
+        return KOREAN_CID_FONT
+    except Exception:
+        return "Helvetica"
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_styles(font_path: str = KOREAN_FONT_PATH) -> Dict[str, "ParagraphStyle"]:
+    """폰트 등록(TTF 파싱)과 스타일 생성을 프로세스에서 한 번만 한다.
+    여러 세션이 같은 스타일 객체를 함께 쓰므로 반환값은 수정하지 않는다."""
+    font_name = _register_korean_font(font_path)
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "KoreanTitle", parent=base["Heading1"], fontName=font_name,
+            fontSize=18, spaceAfter=30, alignment=1, wordWrap="CJK",
+        ),
+        "heading": ParagraphStyle("KoreanHeading", parent=base["Heading2"], fontName=font_name, wordWrap="CJK"),
+        "normal": ParagraphStyle("KoreanNormal", parent=base["Normal"], fontName=font_name, wordWrap="CJK"),
+    }
+
+PDF_DOC_OPTIONS = {"pagesize": letter} if DOC_LIBS_AVAILABLE else {}
+
+def make_pdf_doc(target, title: str = "") -> "SimpleDocTemplate":
+    """모든 PDF 내보내기가 쓰는 공통 문서 템플릿 (target: 파일 경로 또는 BytesIO)"""
+    return SimpleDocTemplate(target, title=title, **PDF_DOC_OPTIONS)
+
 # ================= 문서 생성/저장 =================
 def create_txt(content: str, filename: str) -> Optional[str]:
     try:
@@ -490,32 +519,13 @@ def create_pdf(content: str, filename: str) -> Optional[str]:
         return None
     try:
         filepath = os.path.join(st.session_state.settings["save_dir"], f"{filename}.pdf")
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-
-        # 한글 폰트 적용 시도 (없으면 기본폰트)
-        font_name = _ensure_korean_font("./NanumGothic.ttf") or "Helvetica"
-
-        styles = getSampleStyleSheet()
-        story = []
-
-        # 제목 스타일
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,
-            fontName=font_name
-        )
-        normal_style = styles['Normal']
-        normal_style.fontName = font_name
-
-        story.append(Paragraph("자기소개서", title_style))
-        story.append(Spacer(1, 12))
+        doc = make_pdf_doc(filepath, title="자기소개서")
+        styles = get_pdf_styles()
 
+        story = [Paragraph("자기소개서", styles["title"]), Spacer(1, 12)]
         for line in content.split('\n'):
             if line.strip():
-                story.append(Paragraph(line, normal_style))
+                story.append(Paragraph(html.escape(line), styles["normal"]))
             else:
                 story.append(Spacer(1, 6))
 
@@ -9,11 +9,17 @@
 #   - OPENAI_API_KEY / GEMINI_API_KEY는 .env에 넣거나, 화면의 설정 탭에서 직접 입력하세요.
 # =========================================================
 
-import os, io, json, time, textwrap, re, datetime, urllib.parse, base64
+import os, io, sys, json, time, textwrap, re, datetime, urllib.parse, base64, html, uuid
 from typing import Optional, Tuple, List, Dict
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+from coach_core.router import IntentRouter
+from coach_core.memory import SummarizingMemory
+from coach_core.file_catalog import FileCatalog, FILE_PAGE_SIZE
+
 # ===== 문서 생성을 위한 라이브러리 =====
 try:
     from docx import Document
@@ -22,6 +28,7 @@ try:
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
     DOC_LIBS_AVAILABLE = True
 except Exception:
     DOC_LIBS_AVAILABLE = False
@@ -31,7 +38,7 @@ try:
     from langchain_openai import ChatOpenAI
     from langchain_google_genai import ChatGoogleGenerativeAI
     from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-    from langchain.memory import ConversationBufferMemory
+    from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
     from langchain.chains import LLMChain
     LANGCHAIN_AVAILABLE = True
 except Exception:
@@ -137,11 +144,26 @@ if "initialized" not in st.session_state:
         "timestamp": _now_hhmm()
     })
 
-if "saved_files" not in st.session_state:
-    st.session_state.saved_files = []
+if "catalog_owner" not in st.session_state:
+    st.session_state.catalog_owner = uuid.uuid4().hex
+
+# ================= 대화 메모리 =================
+@st.cache_resource
+def _memory_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
 
 if LANGCHAIN_AVAILABLE and "lc_memory" not in st.session_state:
-    st.session_state.lc_memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    st.session_state.lc_memory = SummarizingMemory(_memory_executor())
+
+def reset_conversation():
+    """대화 내용과 LangChain 메모리를 함께 처음 상태로 되돌린다 (이전 대화가 요약/기록에 남지 않게)"""
+    st.session_state.msgs = [{
+        "role": "bot",
+        "content": "안녕하세요! AI 자기소개서 코치입니다. 🎯\n\n어떤 도움이 필요하신가요?",
+        "timestamp": _now_hhmm()
+    }]
+    if LANGCHAIN_AVAILABLE:
+        st.session_state.lc_memory = SummarizingMemory(_memory_executor())
 
 # ================= 유틸 함수 =================
 def translate_to_english(text: str) -> str:
@@ -153,18 +175,6 @@ def translate_to_english(text: str) -> str:
     except Exception as e:
         return f"번역 중 오류가 발생했습니다: {e}"
 
-def _ensure_korean_font(font_path: str, font_name: str = "NanumGothic"):
-    """ReportLab에 한글 폰트를 등록 (없으면 기본 폰트 사용)"""
-    if not DOC_LIBS_AVAILABLE:
-        return None
-    if not os.path.exists(font_path):
-        return None
-    try:
-        pdfmetrics.registerFont(TTFont(font_name, font_path))
-        return font_name
-    except Exception:
-        return None
-
 def _read_uploaded_text(uploaded_file) -> str:
     """txt/docx 업로드 파일을 안전하게 텍스트로 파싱"""
     name = uploaded_file.name.lower()
@@ -179,9 +189,9 @@ def _read_uploaded_text(uploaded_file) -> str:
     else:
         raise RuntimeError("지원하지 않는 파일 형식입니다. txt 또는 docx만 업로드하세요.")
 
-def get_free_ai_response(user_message: str) -> str:
-    response_templates = {
-        "마케팅": """📊 **마케팅 직무 자기소개서 작성 가이드**
+# ================= 무료 모드 응답 (의도 라우터) =================
+FREE_TEMPLATES = {
+    "마케팅": """📊 **마케팅 직무 자기소개서 작성 가이드**
 
 **1. 핵심 역량 강조**
 - 데이터 분석 및 인사이트 도출 능력
@@ -197,7 +207,7 @@ def get_free_ai_response(user_message: str) -> str:
 - STAR 기법(상황-과제-행동-결과)
 - 문제 해결 과정과 결과 중심
 - 팀워크/리더십 포함""",
-        "개발": """💻 **개발 직무 자기소개서 작성 가이드**
+    "개발": """💻 **개발 직무 자기소개서 작성 가이드**
 
 **1. 기술 스택 명시**
 - 언어/프레임워크/라이브러리
@@ -211,7 +221,7 @@ def get_free_ai_response(user_message: str) -> str:
 **3. 성장 의지**
 - 지속 학습/트렌드 관심
 - 오픈소스/개인 프로젝트""",
-        "영업": """🎯 **영업 직무 자기소개서 작성 가이드**
+    "영업": """🎯 **영업 직무 자기소개서 작성 가이드**
 
 **1. 성과 강조**
 - 목표 달성률/매출 기여
@@ -223,17 +233,8 @@ def get_free_ai_response(user_message: str) -> str:
 
 **3. 시장 이해**
 - 트렌드/경쟁사 분석
-- 고객사 비즈니스 이해"""
-    }
-    user_lower = user_message.lower()
-    if "마케팅" in user_lower:
-        return response_templates["마케팅"]
-    elif any(word in user_lower for word in ["개발", "프로그래밍", "코딩", "it"]):
-        return response_templates["개발"]
-    elif "영업" in user_lower:
-        return response_templates["영업"]
-    elif any(word in user_lower for word in ["첨삭", "피드백", "검토"]):
-        return """✏️ **자기소개서 첨삭 포인트**
+- 고객사 비즈니스 이해""",
+    "첨삭": """✏️ **자기소개서 첨삭 포인트**
 
 **1. 구조/논리**
 - 도입-본론-결론
@@ -247,9 +248,8 @@ def get_free_ai_response(user_message: str) -> str:
 - 간결/자연스러운 어조
 - 중복/군더더기 제거
 
-📎 파일을 업로드하시면 더 구체적으로 도와드려요."""
-    else:
-        return """🎯 **자기소개서 작성을 도와드릴게요!**
+📎 파일을 업로드하시면 더 구체적으로 도와드려요.""",
+    "default": """🎯 **자기소개서 작성을 도와드릴게요!**
 
 **효과적인 질문 예시**
 - "마케팅 직무 자기소개서 작성법"
@@ -258,7 +258,22 @@ def get_free_ai_response(user_message: str) -> str:
 - "제 자기소개서 첨삭해주세요"(파일 첨부)
 
 **작성 원칙**
-1) STAR 기법  2) 수치화  3) 차별화"""
+1) STAR 기법  2) 수치화  3) 차별화""",
+}
+
+FREE_ROUTER = IntentRouter(
+    [
+        ("마케팅", ["마케팅"]),
+        ("개발", ["개발", "프로그래밍", "코딩", "it"]),
+        ("영업", ["영업"]),
+        ("첨삭", ["첨삭", "피드백", "검토"]),
+    ],
+    FREE_TEMPLATES,
+    lower=True,
+)
+
+def get_free_ai_response(user_message: str) -> str:
+    return FREE_ROUTER.route(user_message)[1]
 
 def get_ai_response(user_message: str, uploaded_file=None) -> str:
     settings = st.session_state.settings
@@ -338,11 +353,13 @@ def get_ai_response(user_message: str, uploaded_file=None) -> str:
             ("human", "{input}")
         ])
 
-        chain = LLMChain(llm=llm, prompt=prompt, memory=st.session_state.lc_memory)
+        memory = st.session_state.lc_memory
+        chain = LLMChain(llm=llm, prompt=prompt)
 
         # invoke를 사용하면 버전 차이로 인한 run 디프리케이션 이슈를 피할 수 있어요
-        result = chain.invoke({"input": prompt_text})
+        result = chain.invoke({"input": prompt_text, "chat_history": memory.messages()})
         response_text = result.get("text") if isinstance(result, dict) else str(result)
+        memory.save(prompt_text, response_text, llm)
 
         if settings["enable_translation"] and uploaded_file is None:
             eng = translate_to_english(response_text)
@@ -353,6 +370,46 @@ def get_ai_response(user_message: str, uploaded_file=None) -> str:
     except Exception as e:
         return f"오류가 발생했습니다: {e}\n\n{get_free_ai_response(user_message)}"
 
+# ================= PDF 폰트/스타일 =================
+KOREAN_FONT_PATH = os.getenv("KOREAN_FONT_PATH", "./NanumGothic.ttf")
+KOREAN_FONT_NAME = "NanumGothic"
+KOREAN_CID_FONT = "HYGothic-Medium"  # TTF가 없을 때 쓰는 ReportLab 내장 한글 폰트
+
+def _register_korean_font(font_path: str) -> str:
+    """한글 폰트를 ReportLab에 등록하고 폰트 이름을 반환 (TTF → 내장 CID 폰트 → Helvetica 순)"""
+    if os.path.exists(font_path):
+        try:
+            pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+            return KOREAN_FONT_NAME
+        except Exception:
+            pass
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_CID_FONT))
+        return KOREAN_CID_FONT
+    except Exception:
+        return "Helvetica"
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_styles(font_path: str = KOREAN_FONT_PATH) -> Dict[str, "ParagraphStyle"]:
+    """폰트 등록(TTF 파싱)과 스타일 생성을 프로세스에서 한 번만 한다.
+    여러 세션이 같은 스타일 객체를 함께 쓰므로 반환값은 수정하지 않는다."""
+    font_name = _register_korean_font(font_path)
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "KoreanTitle", parent=base["Heading1"], fontName=font_name,
+            fontSize=18, spaceAfter=30, alignment=1, wordWrap="CJK",
+        ),
+        "heading": ParagraphStyle("KoreanHeading", parent=base["Heading2"], fontName=font_name, wordWrap="CJK"),
+        "normal": ParagraphStyle("KoreanNormal", parent=base["Normal"], fontName=font_name, wordWrap="CJK"),
+    }
+
+PDF_DOC_OPTIONS = {"pagesize": letter} if DOC_LIBS_AVAILABLE else {}
+
+def make_pdf_doc(target, title: str = "") -> "SimpleDocTemplate":
+    """모든 PDF 내보내기가 쓰는 공통 문서 템플릿 (target: 파일 경로 또는 BytesIO)"""
+    return SimpleDocTemplate(target, title=title, **PDF_DOC_OPTIONS)
+
 # ================= 문서 생성/저장 =================
 def create_txt(content: str, filename: str) -> Optional[str]:
     try:
@@ -391,32 +448,13 @@ def create_pdf(content: str, filename: str) -> Optional[str]:
         return None
     try:
         filepath = os.path.join(st.session_state.settings["save_dir"], f"{filename}.pdf")
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-
-        # 한글 폰트 적용 시도 (없으면 기본폰트)
-        font_name = _ensure_korean_font("./NanumGothic.ttf") or "Helvetica"
-
-        styles = getSampleStyleSheet()
-        story = []
-
-        # 제목 스타일
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,
-            fontName=font_name
-        )
-        normal_style = styles['Normal']
-        normal_style.fontName = font_name
-
-        story.append(Paragraph("자기소개서", title_style))
-        story.append(Spacer(1, 12))
+        doc = make_pdf_doc(filepath, title="자기소개서")
+        styles = get_pdf_styles()
 
+        story = [Paragraph("자기소개서", styles["title"]), Spacer(1, 12)]
         for line in content.split('\n'):
             if line.strip():
-                story.append(Paragraph(line, normal_style))
+                story.append(Paragraph(html.escape(line), styles["normal"]))
             else:
                 story.append(Spacer(1, 6))
 
@@ -444,35 +482,18 @@ def save_conversation(file_format: str, filename: str) -> Optional[str]:
         path = create_txt(text, filename)
 
     if path and os.path.exists(path):
-        info = {
-            "name": os.path.basename(path),
-            "path": path,
-            "created_ts": os.path.getctime(path),
-            "created": datetime.datetime.fromtimestamp(os.path.getctime(path)).strftime("%Y-%m-%d %H:%M:%S"),
-            "size": os.path.getsize(path),
-        }
-        if info not in st.session_state.saved_files:
-            st.session_state.saved_files.append(info)
+        get_file_catalog(st.session_state.settings["save_dir"]).record(path, st.session_state.catalog_owner)
         return path
     return None
 
-def get_saved_files() -> List[Dict]:
-    saved_files = []
-    d = st.session_state.settings["save_dir"]
-    if os.path.exists(d):
-        for filename in os.listdir(d):
-            path = os.path.join(d, filename)
-            if os.path.isfile(path):
-                ctime = os.path.getctime(path)
-                saved_files.append({
-                    "name": filename,
-                    "path": path,
-                    "created_ts": ctime,
-                    "created": datetime.datetime.fromtimestamp(ctime).strftime("%Y-%m-%d %H:%M:%S"),
-                    "size": os.path.getsize(path),
-                })
-    saved_files.sort(key=lambda x: x["created_ts"], reverse=True)
-    return saved_files
+def get_saved_files(query: str = "", page: int = 0) -> Tuple[List[Dict], int]:
+    """저장 파일 목록 한 페이지와 전체 개수 (카탈로그 조회)"""
+    return get_file_catalog(st.session_state.settings["save_dir"]).page(query, page)
+
+# ================= 저장 파일 카탈로그 =================
+@st.cache_resource(show_spinner=False)
+def get_file_catalog(save_dir: str) -> FileCatalog:
+    return FileCatalog(save_dir)
 
 # ================= UI 컴포넌트 =================
 def render_header():
@@ -498,6 +519,20 @@ def render_guidelines():
     </div>
     """, unsafe_allow_html=True)
 
+def _bubble_html(role: str, content: str) -> str:
+    role_class = "user" if role == "user" else "bot"
+    body = html.escape(content).replace("\n", "<br>")
+    return f'<div class="message-bubble {role_class}"><div class="message-content">{body}</div></div>'
+
+def _make_msg(role: str, content: str) -> Dict:
+    """렌더링용 HTML(이스케이프 완료)을 추가 시점에 한 번만 만들어 함께 저장"""
+    return {"role": role, "content": content, "timestamp": _now_hhmm(), "html": _bubble_html(role, content)}
+
+def _message_html(msg: Dict) -> str:
+    if "html" not in msg:
+        msg["html"] = _bubble_html(msg["role"], msg["content"])
+    return msg["html"]
+
 def render_chat_tab():
     render_header()
 
@@ -505,13 +540,7 @@ def render_chat_tab():
         render_guidelines()
 
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-    for msg in st.session_state.msgs:
-        role_class = "user" if msg["role"] == "user" else "bot"
-        st.markdown(f"""
-        <div class="message-bubble {role_class}">
-            <div class="message-content">{msg["content"].replace(chr(10), "<br>")}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("".join(_message_html(msg) for msg in st.session_state.msgs), unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
     allowed_types = ['txt'] + (['docx'] if DOC_LIBS_AVAILABLE else [])
@@ -531,12 +560,16 @@ def render_chat_tab():
             submit = st.form_submit_button("전송", use_container_width=True, type="primary")
 
         if submit and user_input.strip():
-            st.session_state.msgs.append({"role": "user", "content": user_input.strip(), "timestamp": _now_hhmm()})
+            st.session_state.msgs.append(_make_msg("user", user_input.strip()))
             with st.spinner("AI가 답변을 생성중입니다..."):
                 ai_response = get_ai_response(user_input.strip(), uploaded_file)
-            st.session_state.msgs.append({"role": "bot", "content": ai_response, "timestamp": _now_hhmm()})
+            st.session_state.msgs.append(_make_msg("bot", ai_response))
             st.rerun()
 
+    if st.button("🗑️ 대화 내용 초기화", type="secondary"):
+        reset_conversation()
+        st.rerun()
+
     # ===== 대화 저장/다운로드 =====
     st.markdown("### 💾 대화 저장")
     c1, c2, c3 = st.columns([2,2,3])
@@ -556,11 +589,20 @@ def render_chat_tab():
 
     # 저장된 파일 리스트
     st.markdown("### 📂 저장된 파일")
-    files = get_saved_files()
+    query = st.text_input(
+        "파일 검색", key="file_query", placeholder="파일명으로 검색",
+        on_change=lambda: st.session_state.update(file_page=0),
+    )
+    page = st.session_state.get("file_page", 0)
+    files, total = get_saved_files(query, page)
     if not files:
-        st.caption("아직 저장된 파일이 없습니다.")
+        st.caption("아직 저장된 파일이 없습니다." if not query else "검색 결과가 없습니다.")
     else:
-        for fobj in files[:10]:
+        for fobj in files:
+            if not os.path.exists(fobj["path"]):
+                # 폴더에서 직접 지운 파일은 목록에서도 뺀다
+                get_file_catalog(st.session_state.settings["save_dir"]).forget(fobj["path"])
+                continue
             with st.container():
                 st.markdown(
                     f"""<div class="file-item">
@@ -571,6 +613,16 @@ def render_chat_tab():
                 )
                 with open(fobj["path"], "rb") as fh:
                     st.download_button("다운로드", fh, file_name=fobj["name"], key=f"dl_{fobj['name']}")
+        pages = (total + FILE_PAGE_SIZE - 1) // FILE_PAGE_SIZE
+        if pages > 1:
+            p1, p2, p3 = st.columns([1, 2, 1])
+            if p1.button("◀ 이전", disabled=page == 0, key="file_prev"):
+                st.session_state.file_page = page - 1
+                st.rerun()
+            p2.caption(f"{page + 1} / {pages} 페이지 · 총 {total}개")
+            if p3.button("다음 ▶", disabled=page >= pages - 1, key="file_next"):
+                st.session_state.file_page = page + 1
+                st.rerun()
 
 def render_settings_tab():
     st.markdown('<div class="feature-card"><h2>⚙️ AI 모델 및 응답 설정</h2></div>', unsafe_allow_html=True)
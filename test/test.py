@@ -5,21 +5,48 @@
 # 설치(권장):
 #   pip install -U pip
 #   pip install streamlit langchain langchain-openai python-docx reportlab python-dotenv \
-#               pandas numpy altair plotly requests beautifulsoup4 tiktoken
+#               pandas numpy altair plotly requests beautifulsoup4 tiktoken pyarrow
 # 실행:
 #   streamlit run app_v12_resume_coach_plus.py
+# 배치 평가(헤드리스):
+#   python app_v12_resume_coach_plus.py --batch ./resumes --out scores.csv
+#   python -m coach_core.batch ./resumes --out scores.csv      (같은 CLI, 저장소 루트에서)
 # ---------------------------------------------------------
 # 선택 환경변수 (.env 또는 터미널 export)
 #   OPENAI_API_KEY=...
 #   SERPAPI_API_KEY=...           # (선택) 웹 동향/인재상 검색용
 #   BING_API_KEY=...              # (선택) Bing Web Search API
 #   DATA_DIR=./data               # (선택) CSV 저장 경로 (기본: /mnt/data 가 우선)
+#   CSV_CACHE_DIR=...             # (선택) CSV → Feather 변환 캐시 경로 (기본: DATA_DIR/.cache)
+#   HTTP_CACHE_PATH=...           # (선택) 웹 검색/페이지 디스크 캐시 (기본: ./http_cache.db)
+#   SUMMARY_STORE_PATH=...        # (선택) 인재상 요약 저장소 (기본: ./summary_cache.db)
+#   LLM_JOB_WORKERS=8             # (선택) 프로세스 전체 LLM 동시 호출 수
 # =========================================================
 
-import os, io, re, json, textwrap, datetime, time
-from typing import Optional, List, Dict, Tuple
+import os, io, re, sys, json, textwrap, datetime, time
+from typing import Optional, List, Dict, Tuple, NamedTuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 
 import streamlit as st
+from streamlit import runtime as st_runtime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 공용 모듈(coach_core)은 저장소 루트에 있다
+
+# 배치 평가: `python test.py --batch ...` 는 UI/CSV 로딩 전에 coach_core.batch CLI로 넘긴다.
+# 그 모듈을 __main__으로 실행하므로 spawn 워커도 이 스크립트가 아닌 coach_core.batch만 다시 import 한다.
+if __name__ == "__main__" and not st_runtime.exists() and "--batch" in sys.argv[1:]:
+    import runpy
+    runpy.run_module("coach_core.batch", run_name="__main__", alter_sys=True)
+
+from coach_core import scoring
+from coach_core.companies import CompanyIndex, norm_company
+from coach_core.tables import read_table, session_copy, skill_demand_tables
+from coach_core import research
+from coach_core.jobs import LLMJob
+from coach_core.research import SummaryStore, rank_source_urls
+from coach_core.web import PAGE_TEXT_BUDGET, HostLimiter, HttpCache, http_get, stream_page_text
+from coach_core.scoring import SkillIndex, build_skill_index, latest_month, month_skills, read_resume_file
 
 # ===== Optional libs =====
 try:
@@ -29,6 +56,11 @@ try:
 except Exception:
     PANDAS_OK = False
 
+# 캐시된 DataFrame은 모든 세션이 공유한다. 호출부에는 load_csv가 세션 복사본을 주고,
+# 값 수정은 Copy-on-Write로 그 복사본에만 반영되게 한다 (pandas 2.x는 옵션, 3.0부터 기본 동작).
+if PANDAS_OK and int(pd.__version__.split(".")[0]) == 2:
+    pd.set_option("mode.copy_on_write", True)
+
 try:
     import altair as alt
     import plotly.express as px
@@ -38,6 +70,7 @@ except Exception:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from bs4 import BeautifulSoup
     HTTP_OK = True
 except Exception:
@@ -101,7 +134,14 @@ def _default_data_dir() -> str:
 
 DATA_DIR = _default_data_dir()
 
-@st.cache_data(show_spinner=False)
+# 컬럼형 캐시: CSV를 한 번 Feather(비압축)로 변환해 두고 이후엔 CSV 파싱/타입 변환 없이 로드 (coach_core.tables)
+CSV_CACHE_DIR = _env("CSV_CACHE_DIR", os.path.join(DATA_DIR, ".cache"))
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_table(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """(경로, mtime, 크기)별 1회 로드. 모든 세션이 같은 DataFrame을 공유하므로 load_csv의 session_copy로만 꺼낸다."""
+    return read_table(path, mtime_ns, size, CSV_CACHE_DIR)
+
 def load_csv(name: str) -> Optional[pd.DataFrame]:
     if not PANDAS_OK:
         return None
@@ -110,12 +150,93 @@ def load_csv(name: str) -> Optional[pd.DataFrame]:
     for path in candidates:
         if os.path.isfile(path):
             try:
-                df = pd.read_csv(path)
-                return df
+                stat = os.stat(path)
+                return session_copy(_load_table(path, stat.st_mtime_ns, stat.st_size))
             except Exception:
                 pass
     return None
 
+LLM_POOL_SIZE = 32  # 서로 다른 (api_key, model, temperature) 조합 최대 보관 수 (LRU)
+
+@st.cache_resource(max_entries=LLM_POOL_SIZE, show_spinner=False)
+def _pooled_llm(api_key: str, model: str, temperature: float):
+    return ChatOpenAI(api_key=api_key, model=model, temperature=temperature)
+
+def get_llm(model: str = "gpt-4o-mini", temperature: float = 0.5):
+    """(api_key, model, temperature)별 ChatOpenAI를 프로세스 전역에서 재사용 (HTTP 커넥션 유지).
+    st.cache_resource를 거치므로 스크립트 스레드에서 꺼내 작업에 넘긴다 (작업 스레드에서 호출하지 않음)."""
+    return _pooled_llm(os.getenv("OPENAI_API_KEY", ""), model, temperature)
+
+def llm_if_available(model: str = "gpt-4o-mini", temperature: float = 0.5):
+    """LangChain과 API 키가 있으면 get_llm(...), 없으면 None."""
+    if not LLM_OK or not os.getenv("OPENAI_API_KEY"):
+        return None
+    return get_llm(model, temperature)
+
+# ================= LLM 비동기 작업 =================
+# LLM 호출은 프로세스 공용 스레드 풀에서 실행하고, 세션에는 작업 핸들만 둔다.
+# 스크립트 스레드는 결과를 기다리지 않고 fragment 주기 실행으로 완료 여부만 확인한다.
+# 작업 함수에는 LLM 등 캐시된 자원을 스크립트 스레드에서 꺼내 인자로 넘긴다.
+# 끝난 작업은 결과(llm_results)만 남기고 세션에서 뺀다.
+LLM_JOB_WORKERS = int(_env("LLM_JOB_WORKERS", "8"))  # 프로세스 전체 LLM 동시 호출 수
+LLM_JOB_POLL = 1.0                                   # 완료 확인 주기(초)
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+@st.cache_resource(show_spinner=False)
+def _llm_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=LLM_JOB_WORKERS, thread_name_prefix="llm-job")
+
+def submit_llm_job(key: str, fn, *args, **kwargs) -> LLMJob:
+    """같은 key의 이전 작업/결과는 버리고 새 작업을 등록."""
+    cancel_llm_job(key)
+    jobs = st.session_state.setdefault("llm_jobs", {})
+    jobs[key] = LLMJob(_llm_executor(), fn, *args, **kwargs)
+    return jobs[key]
+
+def cancel_llm_job(key: str) -> None:
+    st.session_state.get("llm_results", {}).pop(key, None)
+    job = st.session_state.get("llm_jobs", {}).pop(key, None)
+    if job is not None and not job.done():
+        job.cancel()
+
+def render_llm_job(key: str, render, label: str = "AI 응답 생성 중") -> None:
+    """작업 상태를 표시. 진행 중이면 주기적으로 다시 확인하고, 끝나면 render(result)로 그린다.
+    끝난 작업은 세션에서 빼고 결과만 llm_results에 남겨 이후 rerun에서도 그린다.
+    실패한 작업은 오류만 한 번 보여준다 (render에는 넘기지 않음)."""
+    results = st.session_state.setdefault("llm_results", {})
+    jobs = st.session_state.get("llm_jobs", {})
+    job = jobs.get(key)
+    if job is None:
+        if key in results:
+            render(results[key])
+        return
+
+    if job.done():
+        jobs.pop(key, None)
+        ok, value = job.result()
+        if ok:
+            results[key] = value
+            render(value)
+        else:
+            st.error(value)
+        return
+
+    def pending():
+        if job.done():
+            st.rerun()  # 전체 rerun으로 결과를 그리고 주기 실행을 멈춘다
+        c1, c2 = st.columns([4, 1])
+        c1.caption(f"⏳ {label}… ({job.elapsed:.0f}초)")
+        if c2.button("취소", key=f"cancel_{key}"):
+            cancel_llm_job(key)
+            st.rerun()
+        if _fragment is None:
+            st.button("결과 확인", key=f"poll_{key}")
+
+    if _fragment is not None:
+        _fragment(run_every=LLM_JOB_POLL)(pending)()
+    else:
+        pending()
+
 # ================= 데이터 로딩 =================
 if PANDAS_OK:
     job_market = load_csv("job_market.csv")
@@ -130,107 +251,36 @@ else:
 def read_text_from_upload(uploaded) -> str:
     if uploaded is None:
         return ""
-    name = uploaded.name.lower()
-    try:
-        if name.endswith('.txt'):
-            return uploaded.read().decode('utf-8', errors='ignore')
-        if name.endswith('.docx') and DOCX_OK:
-            doc = Document(uploaded)
-            return "\n".join(p.text for p in doc.paragraphs)
-        # 기본 텍스트 시도
-        return uploaded.read().decode('utf-8', errors='ignore')
-    except Exception as e:
-        return f"[파일 읽기 오류] {e}"
+    return read_resume_file(uploaded.name, uploaded)
 
 # ================= 규칙 기반 스코어러 =================
-ACTION_WORDS = [
-    "개선", "최적화", "설계", "구현", "분석", "자동화", "협업", "리팩터", "검증",
-    "성과", "증가", "감소", "달성", "기여", "해결", "리더", "조율"
-]
-STAR_TOKENS = ["상황", "과제", "행동", "결과", "Situation", "Task", "Action", "Result"]
-FILLERS = ["최대한", "정말", "매우", "다양한", "많은", "열정", "성실", "노력"]
-
-NUM_RE = re.compile(r"(?<!\w)(?:[0-9]+(?:\.[0-9]+)?%?|[일이삼사오육칠팔구십]+%?)(?!\w)")
-
-def tokenize_kr(text: str) -> List[str]:
-    # 간단 토큰화(공백 기준). 형태소분석기 없이 동작
-    return re.findall(r"[\w가-힣%]+", text.lower())
+# 점수 규칙/키워드 매처는 배치 CLI(coach_core.batch)와 함께 쓰는 coach_core.scoring 에 있다.
+def _df_version(df: pd.DataFrame) -> str:
+    v = df.attrs.get("source_version")
+    if v:
+        return v
+    return str(int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _skill_index(_skills_df: pd.DataFrame, version: str, month) -> SkillIndex:
+    """(CSV 버전, 월)별 스킬 매처"""
+    return build_skill_index(month_skills(_skills_df, month))
+
+def skill_index_for(skills_df: Optional[pd.DataFrame], month=None) -> Optional[SkillIndex]:
+    if skills_df is None or len(skills_df) == 0:
+        return None
+    return _skill_index(skills_df, _df_version(skills_df), month)
 
 def skill_coverage(text: str, skills_df: Optional[pd.DataFrame], month: Optional[str]=None) -> Tuple[float, List[str]]:
-    if skills_df is None or len(skills_df) == 0:
-        return 0.0, []
-    toks = set(tokenize_kr(text))
-    # 최신 월 우선
-    df = skills_df.copy()
-    if month and 'month' in df.columns:
-        df = df[df['month'] == month] if (df['month'] == month).any() else df
-    # 상위 기술 상관없이 전체 기술 기준으로 커버리지 평가
-    listed = [str(s).lower() for s in df['skill'].unique().tolist()]
-    matched = sorted({s for s in listed if any(s in t for t in toks)})
-    cov = len(matched) / max(1, len(set(listed)))
-    return cov, matched[:20]
+    # 최신 월 우선, 상위 기술 상관없이 전체 기술 기준으로 커버리지 평가
+    return scoring.skill_coverage(text, skill_index_for(skills_df, month))
 
 def compute_resume_scores(text: str, role: str = "", company: str = "", skills_df: Optional[pd.DataFrame]=None) -> Dict[str, float]:
-    tokens = tokenize_kr(text)
-    n_words = len(tokens)
-    n_chars = len(text)
-
-    # 숫자(성과) 밀도
-    nums = NUM_RE.findall(text)
-    metric_density = min(1.0, len(nums) / max(1, n_words) * 10)  # 대략적 정규화
-
-    # 행동동사/액션
-    action_hits = sum(1 for w in ACTION_WORDS if any(w in t for t in tokens))
-    action_score = min(1.0, action_hits / 6)
-
-    # STAR 단서
-    star_hits = sum(1 for w in STAR_TOKENS if any(w.lower() in t for t in tokens))
-    star_score = min(1.0, star_hits / 4)
-
-    # 군더더기(감점)
-    filler_hits = sum(tokens.count(f.lower()) for f in FILLERS)
-    filler_penalty = min(0.3, filler_hits / max(1, n_words) * 5)
-
-    # 길이 적정성(600~1200자 권장)
-    length_score = 1.0 if 600 <= n_chars <= 1200 else max(0.3, 1 - abs(n_chars - 900) / 1200)
-
-    # 스킬 커버리지(트렌드 반영)
-    month = None
-    if skills_df is not None and 'month' in skills_df.columns:
-        month = skills_df['month'].max()
-    cov, matched = skill_coverage(text, skills_df, month)
-    coverage_score = min(1.0, 0.5 + cov)  # 0.5~1.0
-
-    # 가중합
-    weights = {
-        'metrics': 0.25,
-        'action': 0.15,
-        'star': 0.15,
-        'length': 0.15,
-        'coverage': 0.30,
-    }
-
-    total = (
-        metric_density * weights['metrics'] +
-        action_score * weights['action'] +
-        star_score * weights['star'] +
-        length_score * weights['length'] +
-        coverage_score * weights['coverage']
-    )
-    total = max(0.0, min(1.0, total - filler_penalty))
-
-    return {
-        '총점(0-100)': round(total * 100, 1),
-        '성과(숫자)밀도': round(metric_density, 3),
-        '행동성': round(action_score, 3),
-        'STAR구조': round(star_score, 3),
-        '길이적정': round(length_score, 3),
-        '스킬커버리지': round(coverage_score, 3),
-        '군더더기감점': round(filler_penalty, 3),
-    }
-
-def llm_improve(text: str, role: str, company: str, tone: str, length: int) -> str:
-    if not LLM_OK or not os.getenv('OPENAI_API_KEY'):
+    return scoring.compute_resume_scores(text, skill_index_for(skills_df, latest_month(skills_df)))
+
+def llm_improve(text: str, role: str, company: str, tone: str, length: int, llm=None) -> str:
+    """llm: 스크립트 스레드에서 꺼낸 llm_if_available("gpt-4o-mini", 0.4)"""
+    if llm is None:
         return "[LLM 미사용] OpenAI API 키가 없거나 라이브러리가 없습니다. 설정 탭에서 API 키를 입력하세요."
     system = f"""당신은 한국어 자기소개서 첨삭 전문가입니다. 
     - 톤: {tone}
@@ -241,10 +291,34 @@ def llm_improve(text: str, role: str, company: str, tone: str, length: int) -> s
         ("system", system),
         ("human", "원문:\n{orig}")
     ])
-    chain = LLMChain(llm=ChatOpenAI(model="gpt-4o-mini", temperature=0.4), prompt=tmpl)
+    chain = LLMChain(llm=llm, prompt=tmpl)
     out = chain.invoke({"orig": text})
     return out.get("text", str(out))
 
+def coach_answer(question: str, llm) -> str:
+    """대화 탭의 일반 코칭 답변. llm은 스크립트 스레드에서 꺼내 넘긴다."""
+    tmpl = ChatPromptTemplate.from_messages([
+        ("system", "전문 자기소개서 코치. 간결하고 실용적인 예시와 구조를 제시."), ("human", "{q}")
+    ])
+    out = LLMChain(llm=llm, prompt=tmpl).invoke({"q": question})
+    return out.get("text", str(out))
+
+# ================= 기술 수요 집계 (캐시) =================
+SKILL_TOP_N = 20  # 월별로 미리 계산해 두는 상위 기술 수
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _skill_demand_tables(_skills_df: pd.DataFrame, version: str) -> Tuple[object, Dict[object, pd.DataFrame]]:
+    """CSV 버전(mtime)별 1회 집계 (coach_core.tables.skill_demand_tables).
+    cache_data처럼 호출마다 모든 월의 표를 역직렬화하지 않도록 공유 객체로 두고, 꺼낼 때 session_copy로 복사한다."""
+    return skill_demand_tables(_skills_df, SKILL_TOP_N)
+
+def latest_top_skills(n: int = 10) -> Tuple[object, Optional[pd.DataFrame]]:
+    """최신 월 상위 n개 기술 수요표. skills_analysis.csv가 없으면 (None, None)."""
+    if skills is None or "skill" not in skills.columns:
+        return None, None
+    month, tables = _skill_demand_tables(skills, _df_version(skills))
+    return month, session_copy(tables[month].head(n))
+
 # ================= (NEW) 채팅용 기업 데이터 요청 처리 (UI 변경 없음) =================
 
 COMPANY_CMD_RE = re.compile(
@@ -266,6 +340,14 @@ def try_parse_company_query(text: str) -> Optional[str]:
         return None
     return _clean_company(m.group("company"))
 
+# ================= 기업명 인덱스 =================
+# CompanyIndex/정규화/별칭은 coach_core.companies 에 있다
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _company_index(_job_market: pd.DataFrame, version: str) -> Optional[CompanyIndex]:
+    if "company" not in _job_market.columns:
+        return None
+    return CompanyIndex.from_frame(_job_market)
+
 def summarize_company_from_csvs(company: str) -> str:
     """
     로컬 CSV만 사용해 간단 요약. pandas/CSV 없으면 안내만 반환.
@@ -281,23 +363,33 @@ def summarize_company_from_csvs(company: str) -> str:
 
     # 채용공고 요약
     if job_market is not None:
-        sub = job_market.copy()
-        if "company" in sub.columns:
-            sub = sub[sub["company"].astype(str).str.contains(company, case=False, na=False)]
-        # 공고수
-        try:
-            cnt = sub["job_code"].nunique() if "job_code" in sub.columns else len(sub)
-        except Exception:
-            cnt = len(sub)
-        # 최신 날짜
-        recent = ""
-        if "posted_date" in sub.columns:
+        index = _company_index(job_market, _df_version(job_market))
+        if index is None:
+            # company 컬럼이 없으면 전체 공고 기준
+            sub = job_market
             try:
-                _d = pd.to_datetime(sub["posted_date"], errors="coerce")
-                if _d.notna().any():
-                    recent = _d.max().date().isoformat()
+                cnt = sub["job_code"].nunique() if "job_code" in sub.columns else len(sub)
             except Exception:
-                pass
+                cnt = len(sub)
+            recent = ""
+            if "posted_date" in sub.columns:
+                try:
+                    _d = pd.to_datetime(sub["posted_date"], errors="coerce")
+                    if _d.notna().any():
+                        recent = _d.max().date().isoformat()
+                except Exception:
+                    pass
+        else:
+            keys = index.lookup(company)
+            if len(keys) == 1:
+                cnt = index.counts.get(keys[0], 0)
+            elif "job_code" in job_market.columns and keys:
+                rows = np.concatenate([index.positions[k] for k in keys])
+                cnt = job_market["job_code"].iloc[rows].nunique()
+            else:
+                cnt = sum(index.counts.get(k, 0) for k in keys)
+            dates = [index.latest[k] for k in keys if k in index.latest]
+            recent = max(dates).date().isoformat() if dates else ""
 
         msg = f"- 최근 수집 공고 수: **{cnt}건**"
         if recent:
@@ -308,19 +400,9 @@ def summarize_company_from_csvs(company: str) -> str:
 
     # 상위 기술 수요 (전체 최신월 기준)
     if skills is not None and "skill" in skills.columns:
-        kdf = skills.copy()
-        if "month" in kdf.columns and kdf["month"].notna().any():
-            top_month = kdf["month"].max()
-            if (kdf["month"] == top_month).any():
-                kdf = kdf[kdf["month"] == top_month]
         try:
-            if "job_count" in kdf.columns:
-                top_skills = (
-                    kdf.groupby("skill")["job_count"]
-                    .sum().sort_values(ascending=False).head(10).index.tolist()
-                )
-            else:
-                top_skills = kdf["skill"].value_counts().head(10).index.tolist()
+            _, kdf = latest_top_skills(10)
+            top_skills = kdf["skill"].tolist()
         except Exception:
             top_skills = []
         if top_skills:
@@ -330,9 +412,50 @@ def summarize_company_from_csvs(company: str) -> str:
 
     return "\n".join(lines) + "\n\n> *참고: 데이터는 로컬 CSV 기준 요약이며, 더 자세한 웹 리서치는 선택적으로 확장 가능합니다.*"
 
+# ================= 웹 요청 공통 (커넥션 풀 / 동시성 제한) =================
+RESEARCH_DEADLINE = float(_env("RESEARCH_DEADLINE", "20"))  # 웹 리서치 전체 마감(초)
+RESEARCH_MAX_WORKERS = 16
+PER_HOST_LIMIT = 2                                         # 같은 호스트 동시 요청 수
+RESEARCH_MAX_PAGES = 5
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """프로세스 전역 requests.Session (keep-alive 커넥션 풀 공유)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=RESEARCH_MAX_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; resume-coach-research)"
+    return session
+
+@st.cache_resource(show_spinner=False)
+def _research_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=RESEARCH_MAX_WORKERS, thread_name_prefix="research")
+
+@st.cache_resource(show_spinner=False)
+def _host_limiter() -> HostLimiter:
+    return HostLimiter(PER_HOST_LIMIT)
+
+class ResearchClients(NamedTuple):
+    """웹 리서치가 쓰는 프로세스 공용 핸들. research_clients()로 스크립트 스레드에서 꺼내
+    작업/풀 스레드에는 인자로 넘긴다 (st.cache_resource는 스크립트 스레드에서만 호출)."""
+    pool: ThreadPoolExecutor
+    session: object            # requests.Session
+    limiter: HostLimiter
+    cache: HttpCache
+    store: SummaryStore
+
+# ----- 디스크 HTTP 캐시 (SQLite, coach_core.web.HttpCache) -----
+HTTP_CACHE_PATH = _env("HTTP_CACHE_PATH", "./http_cache.db")
+HTTP_CACHE_MAX_BYTES = int(_env("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+@st.cache_resource(show_spinner=False)
+def get_http_cache() -> HttpCache:
+    return HttpCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES)
+
 # ================= 웹 동향/기업 인재상 수집(선택) =================
 
-def search_web(query: str, topk: int = 5) -> List[Dict[str, str]]:
+def search_web(query: str, clients: ResearchClients, topk: int = 5, deadline: Optional[float] = None) -> List[Dict[str, str]]:
     """간단한 웹 검색: SERPAPI 또는 Bing API가 있으면 사용. 없으면 빈 리스트.
     반환: [{title, url, snippet}]"""
     res: List[Dict[str, str]] = []
@@ -347,7 +470,7 @@ def search_web(query: str, topk: int = 5) -> List[Dict[str, str]]:
                 "num": topk,
                 "hl": "ko"
             }
-            r = requests.get("https://serpapi.com/search.json", params=params, timeout=15)
+            r = http_get("https://serpapi.com/search.json", clients, deadline, source="search", params=params)
             j = r.json()
             for it in j.get("organic_results", [])[:topk]:
                 res.append({
@@ -357,11 +480,13 @@ def search_web(query: str, topk: int = 5) -> List[Dict[str, str]]:
                 })
         elif bing_key:
             headers = {"Ocp-Apim-Subscription-Key": bing_key}
-            r = requests.get(
+            r = http_get(
                 "https://api.bing.microsoft.com/v7.0/search",
+                clients,
+                deadline,
+                source="search",
                 params={"q": query, "count": topk, "mkt": "ko-KR"},
                 headers=headers,
-                timeout=15,
             )
             j = r.json()
             for it in j.get("webPages", {}).get("value", [])[:topk]:
@@ -374,32 +499,69 @@ def search_web(query: str, topk: int = 5) -> List[Dict[str, str]]:
     except Exception:
         return res
 
-def fetch_and_summarize(urls: List[str]) -> str:
-    """간단 크롤링 후 요약 (LLM 사용 가능 시)."""
-    texts = []
-    for u in urls[:5]:
-        try:
-            html = requests.get(u, timeout=15).text
-            soup = BeautifulSoup(html, "html.parser")
-            t = " ".join([p.get_text(" ", strip=True) for p in soup.find_all(["p", "li"])])
-            texts.append(textwrap.shorten(t, 3000))
-        except Exception:
-            pass
-    joined = "\n\n".join(texts) if texts else ""
-    if not joined:
-        return "(웹 페이지에서 요약할 텍스트를 수집하지 못했습니다.)"
-    if LLM_OK and os.getenv('OPENAI_API_KEY'):
-        sys = "너는 리서치 요약가다. 한국어로 5개 불릿, 5줄 이하 요약으로 정리하라."
-        tmpl = ChatPromptTemplate.from_messages([
-            ("system", sys), ("human", "다음 자료를 요약:\n{t}")
-        ])
-        out = LLMChain(llm=ChatOpenAI(model="gpt-4o-mini", temperature=0.2), prompt=tmpl).invoke({"t": joined})
-        return out.get("text", str(out))
-    return joined[:1500]
-
-def company_persona_and_requirements(company: str, role: str) -> Dict[str, str]:
-    """회사 인재상/요구역량 요약 (웹 검색 키 설정 시)."""
-    result = {"인재상": "", "요구역량": "", "출처": []}
+PAGE_STREAMING = True                 # False면 전체 HTML을 받아 BeautifulSoup으로 파싱(이전 방식)
+
+def fetch_page_text(url: str, clients: ResearchClients, deadline: Optional[float] = None) -> str:
+    """페이지의 p/li 텍스트 (최대 PAGE_TEXT_BUDGET자). 실패 시 빈 문자열."""
+    try:
+        if PAGE_STREAMING:
+            return stream_page_text(url, clients, deadline)
+        html = http_get(url, clients, deadline).text
+        soup = BeautifulSoup(html, "html.parser")
+        t = " ".join([p.get_text(" ", strip=True) for p in soup.find_all(["p", "li"])])
+        return textwrap.shorten(t, PAGE_TEXT_BUDGET)
+    except Exception:
+        return ""
+
+# ----- 리서치 요약 저장소 (원문 해시 → 요약, coach_core.research.SummaryStore) -----
+SUMMARY_STORE_PATH = _env("SUMMARY_STORE_PATH", "./summary_cache.db")
+SUMMARY_PROMPT_VERSION = "v1"  # 요약 프롬프트를 바꾸면 올려서 기존 요약을 무효화
+SUMMARY_SYSTEM_PROMPT = "너는 리서치 요약가다. 한국어로 5개 불릿, 5줄 이하 요약으로 정리하라."
+
+@st.cache_resource(show_spinner=False)
+def get_summary_store() -> SummaryStore:
+    return SummaryStore(SUMMARY_STORE_PATH, SUMMARY_PROMPT_VERSION)
+
+def research_clients() -> ResearchClients:
+    """스크립트 스레드에서 호출: 캐시된 리서치 핸들을 한 번에 꺼낸다."""
+    return ResearchClients(_research_executor(), get_http_session(), _host_limiter(), get_http_cache(), get_summary_store())
+
+def _llm_summary(llm, joined: str) -> str:
+    tmpl = ChatPromptTemplate.from_messages([
+        ("system", SUMMARY_SYSTEM_PROMPT), ("human", "다음 자료를 요약:\n{t}")
+    ])
+    out = LLMChain(llm=llm, prompt=tmpl).invoke({"t": joined})
+    return out.get("text", str(out))
+
+def summarize_research(texts: List[str], clients: ResearchClients, subject: Optional[str] = None,
+                       llm=None) -> Tuple[str, bool]:
+    """수집한 페이지 텍스트 요약 (coach_core.research.summarize_research). 반환: (요약, 백그라운드 갱신 중 여부)
+    llm은 스크립트 스레드에서 꺼낸 llm_if_available("gpt-4o-mini", 0.2) (None이면 원문 앞부분)"""
+    summarize = partial(_llm_summary, llm) if llm is not None else None
+    return research.summarize_research(texts, clients.store, clients.pool, summarize, subject)
+
+def summarize_texts(texts: List[str], clients: ResearchClients, llm=None) -> str:
+    """수집한 페이지 텍스트 요약 (LLM 사용 가능 시)."""
+    return summarize_research(texts, clients, llm=llm)[0]
+
+def fetch_and_summarize(urls: List[str], clients: ResearchClients, deadline: Optional[float] = None, llm=None) -> str:
+    """간단 크롤링 후 요약 (LLM 사용 가능 시). 페이지는 동시에 받고, 마감까지 받은 것만 사용."""
+    if deadline is None:
+        deadline = time.monotonic() + RESEARCH_DEADLINE
+    futs = [clients.pool.submit(fetch_page_text, u, clients, deadline) for u in urls[:RESEARCH_MAX_PAGES]]
+    wait(futs, timeout=max(0.0, deadline - time.monotonic()))
+    return summarize_texts([f.result() for f in futs if f.done()], clients, llm)
+
+def company_persona_and_requirements(company: str, role: str, clients: ResearchClients, llm=None,
+                                     top_skills: Optional[List[str]] = None,
+                                     deadline_s: float = RESEARCH_DEADLINE) -> Dict[str, str]:
+    """회사 인재상/요구역량 요약 (웹 검색 키 설정 시).
+    작업 스레드에서 실행되므로 clients(research_clients()), llm, 상위 기술 목록(latest_top_skills)은
+    스크립트 스레드에서 구해 넘긴다.
+    검색 3건을 동시에 보내 모두 모은 뒤, 순위가 정해진 상위 URL 페이지를 동시에 수집한다.
+    (먼저 끝난 검색부터 페이지를 고르면 실행마다 출처가 달라져 요약 캐시가 빗나간다.)
+    deadline_s 안에 끝나지 않은 요청은 버리고 부분 결과로 요약한다."""
+    result = {"인재상": "", "요구역량": "", "출처": [], "부분결과": False, "요약갱신중": False}
     if not HTTP_OK:
         return result
     queries = [
@@ -407,24 +569,24 @@ def company_persona_and_requirements(company: str, role: str) -> Dict[str, str]:
         f"{company} 채용 {role} 자기소개서",
         f"{company} core values culture"
     ]
-    urls = []
-    for q in queries:
-        hits = search_web(q, topk=5)
-        urls.extend([h["url"] for h in hits])
+    deadline = time.monotonic() + deadline_s
+    pool = clients.pool
+    search_futs = [pool.submit(search_web, q, clients, 5, deadline) for q in queries]
+    late = wait(search_futs, timeout=max(0.0, deadline - time.monotonic())).not_done
+    hits_by_query = [f.result() if f.done() else [] for f in search_futs]
+
+    page_futs = [pool.submit(fetch_page_text, u, clients, deadline)
+                 for u in rank_source_urls(hits_by_query, RESEARCH_MAX_PAGES)]
+    late_pages = wait(page_futs, timeout=max(0.0, deadline - time.monotonic())).not_done
+    result["부분결과"] = bool(late or late_pages)  # 마감 초과
+
+    for hits in hits_by_query:
         result["출처"].extend(hits)
-    urls = list(dict.fromkeys([u for u in urls if u]))  # unique
-    summary = fetch_and_summarize(urls)
-    result["인재상"] = summary
+    result["인재상"], result["요약갱신중"] = summarize_research(
+        [f.result() for f in page_futs if f.done()], clients, subject=norm_company(company), llm=llm
+    )
     # 추가적으로 skills_df가 있다면 role 관련 상위 기술 키워드를 추려 제안
-    if skills is not None and 'skill' in skills.columns:
-        top_month = skills['month'].max() if 'month' in skills.columns else None
-        kdf = skills.copy()
-        if top_month:
-            kdf = kdf[kdf['month'] == top_month]
-        top_skills = (
-            kdf.groupby('skill')['job_count'].sum().sort_values(ascending=False).head(10).index.tolist()
-            if 'job_count' in kdf.columns else kdf['skill'].value_counts().head(10).index.tolist()
-        )
+    if top_skills:
         result["요구역량"] = "최근 수요 상위 기술 예시: " + ", ".join(top_skills)
     return result
 
@@ -462,6 +624,26 @@ st.markdown(f"<div class='header'><b>AI 자기소개서 코칭 +</b></div>", uns
 
 st.markdown(GUIDE)
 
+def show_improved(improved: str) -> None:
+    st.markdown("### ✍️ 개선안")
+    st.markdown(improved)
+
+def show_research(info: Dict[str, object]) -> None:
+    if info.get("부분결과"):
+        st.caption(f"⏱️ {RESEARCH_DEADLINE:.0f}초 안에 응답하지 않은 요청은 제외하고 요약했습니다.")
+    if info.get("요약갱신중"):
+        st.caption("🔄 출처 내용이 바뀌어 이전 요약을 먼저 보여드립니다. 새 요약은 백그라운드에서 갱신 중입니다.")
+    if info.get("인재상"):
+        st.markdown("### 🏢 인재상 요약")
+        st.write(info["인재상"]) 
+    if info.get("요구역량"):
+        st.markdown("### ✅ 요구역량(트렌드 기반 제안)")
+        st.write(info["요구역량"]) 
+    if info.get("출처"):
+        st.markdown("#### 🔗 참고 링크")
+        for s in info["출처"][:8]:
+            st.markdown(f"- [{s.get('title','(제목없음)')}]({s.get('url','')}) — {s.get('snippet','')}")
+
 # ================= 탭 =================
 tab_chat, tab_eval, tab_trend = st.tabs(["💬 대화", "🧭 자소서 평가", "📈 트렌드/기업"])
 
@@ -473,18 +655,16 @@ with tab_chat:
         # (NEW) 기업 데이터 질의 패턴 우선 응답 — UI 영향 없음, 텍스트만 출력
         company_name = try_parse_company_query(user_q)
         if company_name:
+            cancel_llm_job("chat")
             st.markdown(summarize_company_from_csvs(company_name))
         else:
             if not LLM_OK or not os.getenv("OPENAI_API_KEY"):
+                cancel_llm_job("chat")
                 st.info("OpenAI 키가 없거나 라이브러리가 없어 기본 가이드를 표시합니다.")
                 st.write(GUIDE)
             else:
-                sys = "전문 자기소개서 코치. 간결하고 실용적인 예시와 구조를 제시."
-                tmpl = ChatPromptTemplate.from_messages([
-                    ("system", sys), ("human", "{q}")
-                ])
-                out = LLMChain(llm=ChatOpenAI(model="gpt-4o-mini", temperature=0.5), prompt=tmpl).invoke({"q": user_q})
-                st.markdown(out.get("text", str(out)))
+                submit_llm_job("chat", coach_answer, user_q, get_llm("gpt-4o-mini", 0.5))
+    render_llm_job("chat", st.markdown, "답변 생성 중")
 
 # --------- 🧭 자소서 평가 ---------
 with tab_eval:
@@ -509,8 +689,19 @@ with tab_eval:
         improved_box = st.empty()
 
     if run and text.strip():
-        with st.spinner("평가 중…"):
-            scores = compute_resume_scores(text, role, company, skills)
+        # 가장 오래 걸리는 LLM 개선안을 먼저 제출하고, 그동안 규칙 기반 점수/스킬 매칭을 계산한다.
+        # 각 패널은 결과가 준비되는 대로 그려지므로 체감 시간은 LLM 호출 하나와 같다.
+        submit_llm_job("improve", llm_improve, text, role, company, tone, length,
+                       llm=llm_if_available("gpt-4o-mini", 0.4))
+        st.session_state.eval_result = {
+            "scores": compute_resume_scores(text, role, company, skills),
+            "coverage": skill_coverage(text, skills) if PANDAS_OK and skills is not None else None,
+        }
+
+    # 평가 결과는 세션에 두고, 개선안 작업이 끝나 rerun 되어도 그대로 다시 그린다
+    eval_result = st.session_state.get("eval_result")
+    if eval_result is not None:
+        scores = eval_result["scores"]
         with placeholder_metrics.container():
             if VIZ_OK and PANDAS_OK:
                 df_score = pd.DataFrame({"항목":["총점","성과","행동","STAR","길이","스킬","감점"],
@@ -521,25 +712,18 @@ with tab_eval:
                 st.plotly_chart(fig, use_container_width=True)
             st.json(scores)
 
-        with st.spinner("개선안 작성…"):
-            improved = llm_improve(text, role, company, tone, length)
         with improved_box.container():
-            st.markdown("### ✍️ 개선안")
-            st.markdown(improved)
+            render_llm_job("improve", show_improved, "개선안 작성 중")
 
         # 스킬 매칭 표
-        if PANDAS_OK and skills is not None:
-            cov, matched = skill_coverage(text, skills)
+        if eval_result["coverage"] is not None:
+            cov, matched = eval_result["coverage"]
             st.markdown("---")
             st.markdown("**스킬 매칭(최근 수요 기준)**")
             st.write(f"커버리지: {cov*100:.1f}% / 매칭: {', '.join(matched) if matched else '(없음)'}")
             if VIZ_OK:
-                top_month = skills['month'].max() if 'month' in skills.columns else None
-                kdf = skills.copy()
-                if top_month:
-                    kdf = kdf[kdf['month']==top_month]
-                if 'job_count' in kdf.columns:
-                    kdf = kdf.groupby('skill')['job_count'].sum().sort_values(ascending=False).head(15).reset_index()
+                top_month, kdf = latest_top_skills(15)
+                if kdf is not None and 'job_count' in kdf.columns:
                     st.altair_chart(
                         alt.Chart(kdf).mark_bar().encode(x='job_count', y=alt.Y('skill', sort='-x'))
                         .properties(height=380, title=f"{top_month or ''} 상위 기술 수요"), use_container_width=True
@@ -578,12 +762,8 @@ with tab_trend:
             except Exception:
                 pass
     if PANDAS_OK and skills is not None and VIZ_OK:
-        top_month = skills['month'].max() if 'month' in skills.columns else None
-        kdf = skills.copy()
-        if top_month:
-            kdf = kdf[kdf['month']==top_month]
-        if 'job_count' in kdf.columns:
-            kdf = kdf.groupby('skill')['job_count'].sum().sort_values(ascending=False).head(15).reset_index()
+        top_month, kdf = latest_top_skills(15)
+        if kdf is not None and 'job_count' in kdf.columns:
             st.altair_chart(
                 alt.Chart(kdf).mark_bar().encode(x='job_count', y=alt.Y('skill', sort='-x'))
                 .properties(height=360, title=f"{top_month or ''} 상위 기술 수요"), use_container_width=True
@@ -594,18 +774,11 @@ with tab_trend:
         if not HTTP_OK:
             st.warning("requests/bs4 미설치로 웹 리서치를 생략합니다. 'pip install requests beautifulsoup4' 설치 후 재시도")
         else:
-            with st.spinner("회사 인재상/요구역량 수집 중…"):
-                info = company_persona_and_requirements(t_company, t_role)
-            if info.get("인재상"):
-                st.markdown("### 🏢 인재상 요약")
-                st.write(info["인재상"]) 
-            if info.get("요구역량"):
-                st.markdown("### ✅ 요구역량(트렌드 기반 제안)")
-                st.write(info["요구역량"]) 
-            if info.get("출처"):
-                st.markdown("#### 🔗 참고 링크")
-                for s in info["출처"][:8]:
-                    st.markdown(f"- [{s.get('title','(제목없음)')}]({s.get('url','')}) — {s.get('snippet','')}")
+            _, kdf = latest_top_skills(10)
+            submit_llm_job("research", company_persona_and_requirements, t_company, t_role, research_clients(),
+                           llm=llm_if_available("gpt-4o-mini", 0.2),
+                           top_skills=kdf['skill'].tolist() if kdf is not None else None)
+    render_llm_job("research", show_research, "회사 인재상/요구역량 수집 중")
 
 # ================= 내보내기(대화 저장) 예시 =================
 def export_text(name: str, content: str) -> Tuple[str, bytes, str]:
@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from coach_core.autosave import AutoSaver
+from coach_core.blob_store import BlobStore
+from coach_core.exports import HtmlExport, TextExport
+
+
+def label(msg):
+    return msg["role"]
+
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def wait_saved(saver, timeout=5):
+    deadline = time.monotonic() + timeout
+    while saver.last_saved is None and saver.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    saved, saver.last_saved = saver.last_saved, None
+    return saved
+
+
+def msg(i):
+    return {"role": "user", "content": f"메시지{i}", "time": "10:00"}
+
+
+def test_changes_within_delay_are_saved_once(tmp_path, pool):
+    store = BlobStore(str(tmp_path / "blobs"), 3600, 1024 * 1024)
+    saver = AutoSaver(store, "u1", delay=0.05, name="auto")
+    factory = partial(TextExport, label, str(tmp_path))
+    messages = []
+    for i in range(3):
+        messages.append(msg(i))
+        saver.schedule(messages, factory, pool)
+    assert wait_saved(saver) and saver.error is None
+
+    files = store.list("u1")
+    assert [f["name"] for f in files] == ["auto.txt"]
+    body = store.read("u1", files[0]["id"]).decode("utf-8")
+    assert all(f"메시지{i}" in body for i in range(3))
+
+
+def test_later_saves_replace_file_and_reuse_builder(tmp_path, pool):
+    store = BlobStore(str(tmp_path / "blobs"), 3600, 1024 * 1024)
+    saver = AutoSaver(store, "u1", delay=0.01, name="auto")
+    factory = partial(TextExport, label, str(tmp_path))
+    messages = [msg(0)]
+    saver.schedule(messages, factory, pool)
+    wait_saved(saver)
+    builder = saver.builder
+
+    messages.append(msg(1))
+    saver.schedule(messages, factory, pool)
+    wait_saved(saver)
+    assert saver.builder is builder  # 새로 붙은 대화만 이어 쓴다
+    files = store.list("u1")
+    assert len(files) == 1
+    assert "메시지1" in store.read("u1", files[0]["id"]).decode("utf-8")
+
+    saver.schedule(messages, partial(HtmlExport, label, str(tmp_path)), pool)  # 형식이 바뀌면 새 빌더
+    wait_saved(saver)
+    assert isinstance(saver.builder, HtmlExport)
+    assert "auto.html" in [f["name"] for f in store.list("u1")]
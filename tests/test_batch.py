@@ -0,0 +1,64 @@
+import csv
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from coach_core import batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = "Python으로 데이터 파이프라인을 설계하고 처리 시간을 30% 감소시켰습니다."
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return {row["file"]: row for row in csv.DictReader(f)}
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    src = tmp_path / "resumes"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text(RESUME, encoding="utf-8")
+    (src / "sub" / "b.txt").write_text(RESUME, encoding="utf-8")
+    (src / "ignore.pdf").write_bytes(b"%PDF")
+    return src
+
+
+def test_batch_score_directory(resumes, tmp_path):
+    out = str(tmp_path / "out.csv")
+    assert batch.batch_score(str(resumes), out, workers=2, skill_names=["python", "go"]) == 2
+    rows = read_rows(out)
+    assert set(rows) == {"a.txt", os.path.join("sub", "b.txt")}
+    assert rows["a.txt"]["error"] == ""
+    assert float(rows["a.txt"]["스킬커버리지"]) == 1.0  # 0.5 + 1/2
+
+
+def test_batch_score_zip(tmp_path):
+    src = tmp_path / "cohort.zip"
+    with zipfile.ZipFile(src, "w") as zf:
+        zf.writestr("x/one.txt", RESUME)
+        zf.writestr("two.txt", RESUME)
+        zf.writestr("x/", "")
+    out = str(tmp_path / "out.csv")
+    assert batch.batch_score(str(src), out, workers=1) == 2
+    assert set(read_rows(out)) == {"x/one.txt", "two.txt"}
+
+
+def test_main_accepts_positional_or_batch_flag(resumes, tmp_path):
+    out = str(tmp_path / "out.csv")
+    assert batch.main([str(resumes), "--out", out, "--workers", "1", "--skills", ""]) == 0
+    assert batch.main(["--batch", str(resumes), "--out", out, "--workers", "1", "--skills", ""]) == 0
+    assert batch.main([str(tmp_path / "missing")]) == 2
+    with pytest.raises(SystemExit):
+        batch.main([])
+
+
+def test_module_cli(resumes, tmp_path):
+    out = tmp_path / "out.csv"
+    r = subprocess.run([sys.executable, "-m", "coach_core.batch", str(resumes), "--out", str(out),
+                        "--workers", "1", "--skills", ""], cwd=ROOT, capture_output=True, text=True)
+    assert r.returncode == 0, r.stderr
+    assert len(read_rows(out)) == 2
@@ -0,0 +1,49 @@
+import hashlib
+import os
+
+from coach_core.blob_store import BlobStore
+
+
+def make_store(tmp_path, ttl=3600, quota=1024):
+    return BlobStore(str(tmp_path / "blobs"), ttl, quota)
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store = make_store(tmp_path)
+    a = store.put("u1", "a.txt", "같은 내용", "text/plain")
+    b = store.put("u2", "b.txt", "같은 내용", "text/plain")
+    assert store.read("u1", a) == store.read("u2", b) == "같은 내용".encode("utf-8")
+    blobs = [f for _, _, files in os.walk(store.root) for f in files if f != "catalog.db"]
+    assert len(blobs) == 1
+
+
+def test_owners_only_see_their_files(tmp_path):
+    store = make_store(tmp_path)
+    fid = store.put("u1", "a.txt", b"x", "text/plain")
+    assert [f["name"] for f in store.list("u1")] == ["a.txt"]
+    assert store.list("u2") == []
+    assert store.read("u2", fid) is None
+
+
+def test_replace_keeps_one_autosave(tmp_path):
+    store = make_store(tmp_path)
+    store.put("u1", "autosave.txt", b"v1", "text/plain", replace=True)
+    fid = store.put("u1", "autosave.txt", b"v2", "text/plain", replace=True)
+    assert [f["id"] for f in store.list("u1")] == [fid]
+    assert store.read("u1", fid) == b"v2"
+
+
+def test_quota_drops_oldest_and_unreferenced_content(tmp_path):
+    store = make_store(tmp_path, quota=10)
+    old = store.put("u1", "old.txt", b"123456", "text/plain")
+    new = store.put("u1", "new.txt", b"abcdef", "text/plain")
+    assert [f["id"] for f in store.list("u1")] == [new]
+    assert store.read("u1", old) is None
+    assert not os.path.exists(store._path(hashlib.sha256(b"123456").hexdigest()))
+
+
+def test_clear_removes_owner_files(tmp_path):
+    store = make_store(tmp_path)
+    store.put("u1", "a.txt", b"x", "text/plain")
+    store.clear("u1")
+    assert store.list("u1") == []
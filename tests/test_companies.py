@@ -0,0 +1,61 @@
+import pytest
+
+from coach_core.companies import CompanyIndex, norm_company
+
+NAMES = ["네이버", "네이버클라우드", "(주)네이버웹툰", "NAVER Labs", "카카오", "카카오뱅크", "삼성전자", "삼성SDS"]
+
+
+def make_index(names):
+    positions, counts = {}, {}
+    for row, name in enumerate(names):
+        key = norm_company(name)
+        positions.setdefault(key, []).append(row)
+        counts[key] = counts.get(key, 0) + 1
+    return CompanyIndex(positions, counts)
+
+
+def baseline(names, query):
+    """원래 구현: company.str.contains(query, case=False)"""
+    return {norm_company(n) for n in names if query.lower() in n.lower()}
+
+
+@pytest.mark.parametrize("query", ["네이버", "카카오", "삼성", "뱅크", "웹툰", "sds", "Labs", "버클"])
+def test_lookup_returns_every_company_containing_the_query(query):
+    assert baseline(NAMES, query) <= set(make_index(NAMES).lookup(query))
+
+
+def test_exact_name_does_not_hide_longer_names():
+    assert make_index(NAMES).lookup("카카오") == ["카카오", "카카오뱅크"]
+
+
+def test_alias_adds_other_script():
+    assert make_index(NAMES).lookup("네이버") == ["naverlabs", "네이버", "네이버웹툰", "네이버클라우드"]
+    assert make_index(NAMES).lookup("kakao") == ["카카오", "카카오뱅크"]
+
+
+def test_normalized_comparison_ignores_spacing_and_corporate_suffix():
+    assert make_index(NAMES).lookup("주식회사 네이버 웹툰") == ["네이버웹툰"]
+
+
+def test_typo_fallback_only_when_nothing_contains_the_query():
+    index = make_index(NAMES)
+    assert index.lookup("네이버클라우더") == ["네이버클라우드"]
+    assert index.lookup("없는회사이름") == []
+
+
+def test_empty_query_returns_all():
+    assert make_index(NAMES).lookup(" ") == sorted({norm_company(n) for n in NAMES})
+
+
+def test_from_frame():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({
+        "company": ["네이버", "네이버", "카카오"],
+        "job_code": ["a", "a", "b"],
+        "posted_date": ["2024-01-01", "2024-02-01", "bad"],
+    })
+    index = CompanyIndex.from_frame(df)
+    assert index.counts == {"네이버": 1, "카카오": 1}
+    assert list(index.positions["네이버"]) == [0, 1]
+    assert index.latest["네이버"] == pd.Timestamp("2024-02-01")
+    assert "카카오" not in index.latest
@@ -0,0 +1,84 @@
+import gc
+import os
+
+import pytest
+
+from coach_core.exports import ExportBuilder, HtmlExport, TextExport
+
+
+def msg(role, content, time="10:00"):
+    return {"role": role, "content": content, "time": time}
+
+
+def test_builder_is_abstract():
+    with pytest.raises(TypeError):
+        ExportBuilder()
+
+
+def test_append_writes_only_new_messages(tmp_path):
+    builder = TextExport(spool_dir=str(tmp_path))
+    messages = [msg("user", "안녕"), msg("ai", "반갑습니다")]
+    builder.append(messages)
+    first = builder.getvalue()
+
+    messages.append(msg("user", "자소서 봐줘"))
+    builder.append(messages)
+
+    assert builder.count == 3
+    assert builder.getvalue().startswith(first)
+    assert builder.getvalue().count("안녕".encode("utf-8")) == 1
+    assert "자소서 봐줘".encode("utf-8") in builder.getvalue()
+
+
+def test_end_limits_snapshot(tmp_path):
+    builder = TextExport(spool_dir=str(tmp_path))
+    messages = [msg("user", "하나"), msg("ai", "둘"), msg("user", "셋")]
+    builder.append(messages, 2)
+    assert builder.count == 2
+    assert "셋".encode("utf-8") not in builder.getvalue()
+
+
+def test_cleared_and_refilled_history_is_rebuilt(tmp_path):
+    builder = TextExport(spool_dir=str(tmp_path))
+    messages = [msg("user", "예전 대화"), msg("ai", "예전 답변")]
+    builder.append(messages)
+
+    messages.clear()
+    messages.extend([msg("user", "새 대화"), msg("ai", "새 답변"), msg("user", "추가")])
+    builder.append(messages)
+
+    data = builder.getvalue()
+    assert "예전".encode("utf-8") not in data
+    assert data.count(b"\n\n") == 3
+
+
+def test_transcript_lives_on_disk_not_in_builder(tmp_path):
+    builder = TextExport(spool_dir=str(tmp_path))
+    builder.append([msg("user", "x" * 10_000)])
+    assert os.path.getsize(builder.path) > 10_000
+    assert all(len(str(v)) < 1000 for v in vars(builder).values())
+
+
+def test_html_export_wraps_and_escapes(tmp_path):
+    builder = HtmlExport(spool_dir=str(tmp_path))
+    builder.append([msg("user", "<b>굵게</b>\n다음 줄")])
+    data = builder.getvalue().decode("utf-8")
+    assert data.startswith("<html>") and data.endswith("</html>")
+    assert "&lt;b&gt;" in data and "<br>" in data
+
+
+def test_spool_is_removed_with_builder(tmp_path):
+    builder = TextExport(spool_dir=str(tmp_path))
+    path = builder.path
+    del builder
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_docx_export(tmp_path):
+    pytest.importorskip("docx")
+    from coach_core.exports import DocxExport
+
+    builder = DocxExport(spool_dir=str(tmp_path))
+    builder.append([msg("user", "워드 내보내기")])
+    assert builder.getvalue()[:2] == b"PK"
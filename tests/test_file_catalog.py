@@ -0,0 +1,60 @@
+import os
+
+from coach_core.file_catalog import FileCatalog
+
+
+def write(path, data="x"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+
+
+def names(catalog, query=""):
+    files, _total = catalog.page(query, page_size=100)
+    return sorted(f["name"] for f in files)
+
+
+def test_existing_files_are_listed(tmp_path):
+    write(tmp_path / "old.txt")
+    assert names(FileCatalog(str(tmp_path))) == ["old.txt"]
+
+
+def test_files_added_and_deleted_outside_the_app_are_reconciled(tmp_path):
+    catalog = FileCatalog(str(tmp_path))
+    assert names(catalog) == []
+
+    write(tmp_path / "a.txt")
+    write(tmp_path / "b.txt")
+    assert names(catalog) == ["a.txt", "b.txt"]
+
+    os.remove(tmp_path / "a.txt")
+    assert names(catalog) == ["b.txt"]
+
+
+def test_unchanged_directory_is_not_rescanned(tmp_path, monkeypatch):
+    catalog = FileCatalog(str(tmp_path))
+    write(tmp_path / "a.txt")
+    catalog.page()
+    calls = []
+    monkeypatch.setattr(os, "scandir", lambda p: calls.append(p) or iter(()))
+    catalog.page()
+    assert calls == []
+
+
+def test_catalog_writes_do_not_trigger_rescans(tmp_path):
+    catalog = FileCatalog(str(tmp_path))
+    write(tmp_path / "a.txt")
+    catalog.record(str(tmp_path / "a.txt"), owner="me")
+    catalog.page()
+    before = catalog.dir_mtime
+    catalog.forget(str(tmp_path / "nothing"))  # DB만 쓰는 작업
+    assert os.stat(tmp_path).st_mtime_ns == before
+
+
+def test_record_keeps_owner_and_search(tmp_path):
+    catalog = FileCatalog(str(tmp_path))
+    write(tmp_path / "자소서_1.txt")
+    write(tmp_path / "memo_%.txt")
+    catalog.record(str(tmp_path / "자소서_1.txt"), owner="me")
+    files, total = catalog.page("자소서")
+    assert total == 1 and files[0]["owner"] == "me"
+    assert names(catalog, "%") == ["memo_%.txt"]  # LIKE 와일드카드는 글자 그대로 검색
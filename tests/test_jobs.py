@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from coach_core.jobs import LLMJob
+
+
+def test_job_runs_in_the_pool_and_returns_its_result():
+    with ThreadPoolExecutor(1) as pool:
+        job = LLMJob(pool, lambda a, b=0: threading.current_thread().name + str(a + b), 1, b=2)
+        job.future.result(5)
+    assert job.done()
+    ok, value = job.result()
+    assert ok and value.endswith("3") and not value.startswith("MainThread")
+
+
+def test_failure_becomes_a_message():
+    def boom():
+        raise ValueError("키 없음")
+
+    with ThreadPoolExecutor(1) as pool:
+        job = LLMJob(pool, boom)
+        job.future.exception(5)
+    assert job.result() == (False, "오류가 발생했습니다: 키 없음")
+
+
+def test_cancelled_job_waiting_in_the_queue_never_runs():
+    release = threading.Event()
+    calls = []
+    with ThreadPoolExecutor(1) as pool:
+        blocker = LLMJob(pool, release.wait, 5)
+        job = LLMJob(pool, calls.append, "호출됨")
+        job.cancel()
+        release.set()
+        blocker.future.result(5)
+    assert calls == []
+    assert job.done()
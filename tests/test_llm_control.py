@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from coach_core import llm_control
+from coach_core.llm_control import (
+    LLMBusyError, RateLimiter, SingleFlight, api_key_fingerprint, call_with_limits, coalesce, retry_delay,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+
+def test_fingerprint_is_short_stable_and_hides_the_key():
+    fp = api_key_fingerprint("sk-secret")
+    assert fp == api_key_fingerprint("sk-secret")
+    assert fp != api_key_fingerprint("sk-other")
+    assert len(fp) == 16 and "secret" not in fp
+
+
+def test_exhausted_limiter_fails_fast_with_retry_after():
+    limiter = RateLimiter({"m": (1, 1000)}, (500, 30_000))
+    limiter.acquire("m", 10, account="a")
+    start = time.monotonic()
+    with pytest.raises(LLMBusyError) as info:
+        limiter.acquire("m", 10, account="a")
+    assert time.monotonic() - start < 0.5
+    assert info.value.retry_after == pytest.approx(60, abs=1)
+    assert "초 후" in str(info.value)
+
+
+def test_limits_are_kept_per_api_key():
+    limiter = RateLimiter({"m": (1, 1000)}, (500, 30_000))
+    limiter.acquire("m", 10, account="a")
+    limiter.acquire("m", 10, account="b")  # 다른 키는 자기 한도를 쓴다
+
+
+def test_try_acquire_does_not_take_when_over_limit():
+    limiter = RateLimiter({}, (60, 100))
+    assert limiter.try_acquire("m", 100) == 0
+    assert limiter.try_acquire("m", 50) > 0
+    assert limiter.buckets[("", "m")][1].level == pytest.approx(0, abs=1)
+
+
+def test_retry_delay_only_for_retryable_status():
+    assert retry_delay(StatusError(400), 0) is None
+    assert retry_delay(StatusError(429), llm_control.LLM_MAX_RETRIES) is None
+    assert 0 <= retry_delay(StatusError(503), 2) <= llm_control.LLM_BACKOFF_BASE * 4
+
+
+def test_call_with_limits_retries_before_anything_is_sent(monkeypatch):
+    monkeypatch.setattr(llm_control.time, "sleep", lambda s: None)
+    attempts = []
+
+    def run():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise StatusError(429)
+        yield "ok"
+
+    limiter = RateLimiter({}, (500, 30_000))
+    assert list(call_with_limits(run, limiter, "m", 10)) == ["ok"]
+    assert len(attempts) == 2
+
+
+def test_same_key_requests_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def produce():
+        calls.append(1)
+        release.wait(5)
+        yield "답"
+
+    leader = threading.Thread(target=lambda: results.append("".join(coalesce(flights, "k", produce))))
+    results = []
+    leader.start()
+    while "k" not in flights.flights:
+        time.sleep(0.01)
+    follower = threading.Thread(target=lambda: results.append("".join(coalesce(flights, "k", produce))))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ["답", "답"] and len(calls) == 1
+    assert flights.flights == {}
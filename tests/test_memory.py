@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from coach_core.memory import SummarizingMemory, approx_tokens
+
+
+class ManualExecutor:
+    """submit된 작업을 run()을 부를 때까지 보관하는 실행기 (요약이 도는 중인 상태를 재현)"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+        return Future()
+
+    def run(self):
+        jobs, self.jobs = self.jobs, []
+        for fn, args in jobs:
+            fn(*args)
+
+
+def turn(i):
+    return f"질문{i}" * 20, f"답변{i}" * 20
+
+
+def test_approx_tokens_counts_hangul_per_char():
+    assert approx_tokens("가나다") == 4
+    assert approx_tokens("abcdefgh") == 3
+
+
+def test_evicted_turns_stay_in_history_until_summarized():
+    executor = ManualExecutor()
+    memory = SummarizingMemory(executor, token_budget=100)
+    for i in range(3):
+        memory.save(*turn(i))
+    summary, turns = memory.history()
+    assert summary == ""
+    assert turns == [turn(i) for i in range(3)]  # 요약 전에는 밀려난 턴도 원문 그대로
+    assert len(executor.jobs) == 1
+
+    executor.run()
+    summary, turns = memory.history()
+    assert "질문0" in summary and "질문1" in summary
+    assert turns == [turn(2)]
+
+
+def test_turns_evicted_while_summarizing_are_kept_for_the_next_round():
+    memory = SummarizingMemory(ManualExecutor(), token_budget=100)
+    memory.save(*turn(0))
+    memory.save(*turn(1))
+    started, release = threading.Event(), threading.Event()
+
+    def slow_summarize(llm, summary, batch):
+        started.set()
+        release.wait(5)
+        return "요약:" + ",".join(h[:3] for h, _, _ in batch)
+
+    memory._summarize = slow_summarize
+    worker = threading.Thread(target=memory._compress, args=(None,))
+    worker.start()
+    started.wait(5)
+    memory.save(*turn(2))  # 요약하는 동안 turn(1)이 밀려난다
+    assert [t[0] for t in memory.history()[1]] == [turn(i)[0] for i in range(3)]
+    release.set()
+    worker.join(5)
+    summary, turns = memory.history()
+    assert turns == [turn(2)]
+    assert "질문1" in summary
+
+
+def test_messages_put_summary_first():
+    pytest.importorskip("langchain_core")
+    executor = ManualExecutor()
+    memory = SummarizingMemory(executor, token_budget=100)
+    for i in range(3):
+        memory.save(*turn(i))
+    executor.run()
+    msgs = memory.messages()
+    assert msgs[0].content.startswith("이전 대화 요약")
+    assert [m.content for m in msgs[1:]] == list(turn(2))
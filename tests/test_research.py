@@ -0,0 +1,59 @@
+from coach_core.research import NO_TEXT_MESSAGE, SummaryStore, rank_source_urls, summarize_research
+
+
+class InlinePool:
+    """submit을 바로 실행하는 실행기"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        fn(*args)
+
+
+class CountingSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, joined):
+        self.calls.append(joined)
+        return f"요약{len(self.calls)}"
+
+
+def make_store(tmp_path, version="v1"):
+    return SummaryStore(str(tmp_path / "summaries.db"), version)
+
+
+def test_same_text_is_summarized_once(tmp_path):
+    store, pool, summarize = make_store(tmp_path), InlinePool(), CountingSummarizer()
+    first = summarize_research(["가", "나"], store, pool, summarize, "네이버")
+    second = summarize_research(["가", "나"], store, pool, summarize, "네이버")
+    assert first == second == ("요약1", False)
+    assert len(summarize.calls) == 1
+
+
+def test_changed_text_returns_previous_summary_and_refreshes_in_background(tmp_path):
+    store, pool, summarize = make_store(tmp_path), InlinePool(), CountingSummarizer()
+    summarize_research(["예전 글"], store, pool, summarize, "네이버")
+    assert summarize_research(["새 글"], store, pool, summarize, "네이버") == ("요약1", True)
+    assert pool.submitted == 1
+    assert summarize_research(["새 글"], store, pool, summarize, "네이버") == ("요약2", False)
+
+
+def test_prompt_version_invalidates_summaries(tmp_path):
+    assert make_store(tmp_path, "v1").key("글") != make_store(tmp_path, "v2").key("글")
+
+
+def test_without_llm_or_text():
+    assert summarize_research([], None, None, None) == (NO_TEXT_MESSAGE, False)
+    assert summarize_research(["가" * 2000], None, None, None) == ("가" * 1500, False)
+
+
+def test_rank_source_urls_is_deterministic_and_deduplicated():
+    hits = [
+        [{"url": "a"}, {"url": "b"}],
+        [{"url": "b"}, {"url": ""}, {"url": "c"}],
+    ]
+    assert rank_source_urls(hits, 10) == ["a", "b", "c"]
+    assert rank_source_urls(hits, 2) == ["a", "b"]
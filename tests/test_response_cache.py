@@ -0,0 +1,54 @@
+import time
+
+from coach_core.response_cache import ResponseCache
+
+
+def make_cache(tmp_path, **kw):
+    args = dict(ttl=3600, max_entries=100, threshold=0.95, scan=50)
+    args.update(kw)
+    return ResponseCache(str(tmp_path / "responses.db"), **args)
+
+
+SCOPE = ResponseCache.scope("gpt-4o-mini", "정중한", 800, 0.7)
+
+
+def test_exact_hit_ignores_case_and_whitespace(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("자소서  첨삭 Tips", SCOPE, "답")
+    assert cache.get("자소서 첨삭 tips", SCOPE) == ("답", None)
+
+
+def test_scope_separates_settings(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("질문", SCOPE, "답")
+    other = ResponseCache.scope("gpt-4o-mini", "친근한", 800, 0.7)
+    assert cache.get("질문", other) == (None, None)
+    assert ResponseCache.key("질문", SCOPE) != ResponseCache.key("질문", other)
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = make_cache(tmp_path, ttl=10)
+    cache.put("질문", SCOPE, "답")
+    cache.conn.execute("UPDATE responses SET created = ?", (time.time() - 60,))
+    assert cache.get("질문", SCOPE)[0] is None
+
+
+def test_semantic_hit_reuses_similar_prompt(tmp_path):
+    cache = make_cache(tmp_path)
+    vectors = {"성장 경험 써줘": [1.0, 0.0], "성장 경험을 써줘": [0.99, 0.05], "연봉 협상": [0.0, 1.0]}
+    embed = vectors.__getitem__
+    miss, vector = cache.get("성장 경험 써줘", SCOPE, embed)
+    assert miss is None and vector
+    cache.put("성장 경험 써줘", SCOPE, "성장 답", vector)
+    assert cache.get("성장 경험을 써줘", SCOPE, embed)[0] == "성장 답"
+    assert cache.get("연봉 협상", SCOPE, embed)[0] is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", SCOPE, "1")
+    cache.put("b", SCOPE, "2")
+    cache.conn.execute("UPDATE responses SET last_used = 0 WHERE response = '1'")
+    cache.put("c", SCOPE, "3")
+    assert cache.get("a", SCOPE)[0] is None
+    assert cache.get("b", SCOPE)[0] == "2" and cache.get("c", SCOPE)[0] == "3"
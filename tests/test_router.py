@@ -0,0 +1,70 @@
+import random
+
+from coach_core.router import IntentRouter
+
+OFFLINE_RULES = [
+    ("guide", ["가이드", "가이드라인", "도움말", "사용법", "어떻게"]),
+    ("첨삭", ["첨삭", "수정"]),
+    ("시작", ["시작", "처음"]),
+    ("예시", ["예시"]),
+]
+FREE_RULES = [
+    ("마케팅", ["마케팅"]),
+    ("개발", ["개발", "프로그래밍", "코딩", "it"]),
+    ("영업", ["영업"]),
+    ("첨삭", ["첨삭", "피드백", "검토"]),
+]
+
+
+def router(rules, **kw):
+    return IntentRouter(rules, {intent: intent for intent, _ in rules} | {"default": "default"}, **kw)
+
+
+def baseline(rules, text, lower=False):
+    """원래 if/elif 사슬: 규칙 순서대로 any(keyword in text)"""
+    if lower:
+        text = text.lower()
+    for intent, words in rules:
+        if any(w in text for w in words):
+            return intent
+    return "default"
+
+
+def test_overlapping_keywords_route_like_baseline():
+    r = router(OFFLINE_RULES)
+    assert r.route("예시작성 도와줘") == ("시작", "시작")
+    assert baseline(OFFLINE_RULES, "예시작성 도와줘") == "시작"
+    assert r.route("가이드라인 보여줘")[0] == "guide"
+    assert r.route("안녕하세요")[0] == "default"
+
+
+def test_lowercase_substring_like_baseline():
+    r = router(FREE_RULES, lower=True)
+    assert r.route("Work WITH me")[0] == "개발"  # 'it'은 원래도 부분 문자열로 일치
+    assert r.route("마케팅 IT 영업")[0] == "마케팅"
+
+
+def test_keywords_are_case_sensitive_unless_lower():
+    rules = [("개발", ["IT"])]
+    assert router(rules).route("IT 직무")[0] == "개발"
+    assert router(rules, lower=True).route("IT 직무")[0] == "default"  # 입력만 소문자로 바꾸던 방식 그대로
+
+
+def test_prefix_keyword_of_longer_match():
+    rules = [("a", ["가이"]), ("b", ["가이드라인"])]
+    assert router(rules).route("가이드라인")[0] == "a"
+
+
+def test_random_inputs_match_baseline():
+    rng = random.Random(1)
+    alphabet = "예시작성첨삭수정처음가이드라인도움말어떻게 "
+    rules = OFFLINE_RULES + [("x", ["정처", "이드"])]
+    r = router(rules)
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert r.route(text)[0] == baseline(rules, text), text
+
+
+def test_empty_keyword_always_matches():
+    rules = [("a", ["없는말"]), ("b", [""])]
+    assert router(rules).route("아무거나")[0] == "b"
@@ -0,0 +1,46 @@
+import random
+
+from coach_core.scoring import (
+    SCORE_COLUMNS, KeywordMatcher, build_skill_index, compute_resume_scores, read_resume_bytes,
+    skill_coverage, tokenize_kr,
+)
+
+
+def naive_found(words, tokens):
+    return {w for w in words if w and any(w in t for t in tokens)}
+
+
+def test_keyword_matcher_matches_substring_semantics():
+    words = ["개선", "개", "선", "python", "py", "thon", "데이터", "데이터분석", "분석", "c++"]
+    tokens = tokenize_kr("Python 기반 데이터분석 자동화로 성능을 개선했습니다")
+    expected = {w for w in naive_found(words, tokens) if w != "c++"}  # 토큰 문자가 아닌 키워드는 제외
+    assert KeywordMatcher(words).found(tokens) == expected
+
+
+def test_keyword_matcher_random_overlaps():
+    rng = random.Random(0)
+    alphabet = "abc가나"
+    words = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)}
+    for _ in range(50):
+        tokens = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(5)]
+        assert KeywordMatcher(words).found(tokens) == naive_found(words, tokens)
+
+
+def test_skill_coverage_uses_index():
+    index = build_skill_index(["Python", "SQL", "Kotlin"])
+    cov, matched = skill_coverage("python과 sql로 데이터 파이프라인 구축", index)
+    assert matched == ["python", "sql"]
+    assert cov == 2 / 3
+    assert skill_coverage("아무 내용", None) == (0.0, [])
+
+
+def test_scores_have_all_columns():
+    text = "상황: 트래픽 급증. 행동: 캐시를 설계하고 구현해 응답 시간을 40% 감소시켰습니다. 결과: 매출 증가에 기여."
+    scores = compute_resume_scores(text, build_skill_index(["캐시"]))
+    assert list(scores) == SCORE_COLUMNS
+    assert scores["STAR구조"] == 0.75
+    assert scores["스킬커버리지"] == 1.0
+
+
+def test_read_resume_bytes_text():
+    assert read_resume_bytes("a.TXT", "안녕하세요".encode("utf-8")) == "안녕하세요"
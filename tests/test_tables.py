@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from coach_core.tables import read_table, session_copy, skill_demand_tables
+
+
+def write_csv(path):
+    path.write_text("company,skill,n\nA,python,1\nB,sql,2\n", encoding="utf-8")
+    stat = os.stat(path)
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def test_read_table_sets_dtypes_and_version(tmp_path):
+    path, mtime, size = write_csv(tmp_path / "jobs.csv")
+    df = read_table(path, mtime, size, str(tmp_path / ".cache"))
+    assert str(df["skill"].dtype) == "category"
+    assert df.attrs["source_version"] == f"{path}:{mtime}"
+
+
+def test_feather_cache_is_reused(tmp_path):
+    pytest.importorskip("pyarrow")
+    path, mtime, size = write_csv(tmp_path / "jobs.csv")
+    cache_dir = str(tmp_path / ".cache")
+    read_table(path, mtime, size, cache_dir)
+    assert [f for f in os.listdir(cache_dir) if f.endswith(".feather")]
+    os.remove(path)  # 캐시가 있으면 CSV를 다시 읽지 않는다
+    assert list(read_table(path, mtime, size, cache_dir)["n"]) == [1, 2]
+
+
+def test_session_copy_does_not_leak_mutations(tmp_path):
+    path, mtime, size = write_csv(tmp_path / "jobs.csv")
+    shared = read_table(path, mtime, size, str(tmp_path / ".cache"))
+    mine = session_copy(shared)
+    mine["extra"] = 1
+    mine.loc[0, "n"] = 99
+    mine.attrs["source_version"] = "changed"
+    assert "extra" not in shared.columns
+    assert shared.loc[0, "n"] == 1
+    assert shared.attrs["source_version"] == f"{path}:{mtime}"
+
+
+def test_skill_demand_tables_per_month():
+    df = pd.DataFrame({
+        "month": ["2024-01", "2024-01", "2024-02", "2024-02", "2024-02"],
+        "skill": pd.Categorical(["python", "sql", "python", "go", "go"]),
+        "job_count": [3, 5, 1, 2, 4],
+    })
+    latest, tables = skill_demand_tables(df, top_n=1)
+    assert latest == "2024-02"
+    assert list(tables["2024-02"]["skill"]) == ["go"]
+    assert list(tables["2024-01"]["job_count"]) == [5]
+
+
+def test_skill_demand_tables_without_month_counts_rows():
+    df = pd.DataFrame({"skill": ["python", "sql", "python"]})
+    latest, tables = skill_demand_tables(df, top_n=5)
+    assert latest is None
+    assert tables[None].to_dict("records") == [{"skill": "python", "count": 2}, {"skill": "sql", "count": 1}]
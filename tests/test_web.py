@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import pytest
+
+from coach_core.web import HostLimiter, HttpCache, http_get_stream, stream_page_text
+
+PAGE_HTML = "<html><body><p>고객 중심으로 일합니다.</p><li>데이터 기반 의사결정</li></body></html>".encode("utf-8")
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'}
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(PAGE_HTML), chunk_size):
+            yield PAGE_HTML[i:i + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BrokenResponse(FakeResponse):
+    def iter_content(self, chunk_size=1):
+        yield PAGE_HTML[:20]
+        raise ConnectionError("connection reset")
+
+
+class NotModified(FakeResponse):
+    status_code = 304
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0) if self.responses else FakeResponse()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(str(tmp_path / "http_cache.db"), 1024 * 1024)
+
+
+def clients(cache, session):
+    return SimpleNamespace(session=session, limiter=HostLimiter(2), cache=cache)
+
+
+def test_cached_page_text_is_not_empty(cache):
+    session = FakeSession()
+    c = clients(cache, session)
+    url = "https://example.com/about"
+
+    first = stream_page_text(url, c)
+    second = stream_page_text(url, c)  # TTL 안: 디스크 캐시 적중
+
+    assert "고객 중심으로 일합니다." in first
+    assert second == first
+    assert len(session.calls) == 1
+
+
+def test_interrupted_download_is_not_cached(cache):
+    session = FakeSession(BrokenResponse(), FakeResponse())
+    c = clients(cache, session)
+    url = "https://example.com/broken"
+
+    with pytest.raises(ConnectionError):
+        stream_page_text(url, c)
+    assert cache.get(HttpCache.key(url)) is None
+    assert "고객 중심으로 일합니다." in stream_page_text(url, c)
+    assert len(session.calls) == 2
+
+
+def test_budget_prefix_is_not_stored_as_full_body(cache):
+    c = clients(cache, FakeSession())
+    url = "https://example.com/long"
+
+    stream_page_text(url, c, max_bytes=16)
+    assert cache.get(HttpCache.key(url)) is None
+    assert cache.get(HttpCache.key(url, None, "prefix:16"))[1] == PAGE_HTML[:16]
+
+
+def test_stale_entry_is_revalidated_with_etag(cache, monkeypatch):
+    session = FakeSession(FakeResponse(), NotModified())
+    c = clients(cache, session)
+    url = "https://example.com/etag"
+    stream_page_text(url, c)
+    key = HttpCache.key(url)
+    cache.conn.execute("UPDATE http_cache SET fetched = 0 WHERE key = ?", (key,))  # 만료시킴
+
+    headers, stream = http_get_stream(url, c)
+    assert b"".join(stream) == PAGE_HTML
+    assert session.calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert cache.get(key)[2] > 0  # 304로 신선도 갱신
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(str(tmp_path / "lru.db"), max_bytes=10)
+    cache.put("a", "u", {}, b"12345")
+    cache.put("b", "u", {}, b"12345")
+    cache.get("a")  # a를 최근 사용으로
+    cache.put("c", "u", {}, b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_host_limiter_times_out_when_host_is_busy():
+    limiter = HostLimiter(1)
+    with limiter.slot("example.com", 1):
+        with pytest.raises(TimeoutError):
+            with limiter.slot("example.com", 0.01):
+                pass
+        with limiter.slot("other.com", 0.01):
+            pass
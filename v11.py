@@ -6,25 +6,37 @@
 # 실행: streamlit run v11.py
 # =========================================================
 
-import os, io, datetime, json
-from typing import Optional, List, Dict
+import os, io, datetime, json, html, uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, List, Dict, Tuple, Callable
 import streamlit as st
 
+from coach_core.exports import ExportBuilder, TextExport, HtmlExport, DocxExport, PdfExport
+from coach_core.router import IntentRouter
+from coach_core.blob_store import BlobStore
+from coach_core.autosave import AutoSaver
+from coach_core.response_cache import ResponseCache
+from coach_core.llm_control import (
+    LLMBusyError, RateLimiter, SingleFlight, api_key_fingerprint, call_with_limits, coalesce,
+)
+
 # ===== 문서 생성 라이브러리 (선택) =====
 try:
     from docx import Document
     from reportlab.lib.pagesizes import letter
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
     DOC_LIBS_AVAILABLE = True
 except:
     DOC_LIBS_AVAILABLE = False
 
 # ===== LangChain (선택) =====
 try:
-    from langchain_openai import ChatOpenAI
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
     from langchain.prompts import ChatPromptTemplate
     from langchain.chains import LLMChain
     LANGCHAIN_AVAILABLE = True
@@ -134,8 +146,9 @@ if "current_tab" not in st.session_state:
 if "api_key" not in st.session_state:
     st.session_state.api_key = os.getenv("OPENAI_API_KEY", "")
 
-if "saved_files" not in st.session_state:
-    st.session_state.saved_files = []
+if "blob_owner" not in st.session_state:
+    # 저장 파일은 BlobStore에 두고 세션에는 내 파일을 찾을 키만 보관
+    st.session_state.blob_owner = uuid.uuid4().hex
 
 if "basic_settings" not in st.session_state:
     st.session_state.basic_settings = {
@@ -150,6 +163,7 @@ if "advanced_settings" not in st.session_state:
         "polish": 0.5,
         "auto_save": True,
         "smart_edit": True,
+        "streaming": True,
         "export_format": "PDF 문서",
     }
 
@@ -187,21 +201,16 @@ def get_guideline() -> str:
 
 💡 **Tip**: 한 번에 모든 걸 해결하려 하지 말고, 단계별로 질문하세요!"""
 
-# ================= AI 응답 생성 =================
-def get_ai_response(user_input: str, uploaded_file=None) -> str:
-    guideline_keywords = ["가이드", "가이드라인", "도움말", "사용법", "어떻게"]
-    if any(keyword in user_input for keyword in guideline_keywords):
-        return get_guideline()
-
-    if not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
-        templates = {
-            "default": """자기소개서 작성을 도와드리겠습니다!
+# ================= 오프라인 응답 (의도 라우터) =================
+OFFLINE_TEMPLATES = {
+    "guide": get_guideline(),
+    "default": """자기소개서 작성을 도와드리겠습니다!
 
 구체적으로 알려주시면 더 정확한 도움을 드릴 수 있어요:
 • 어떤 직무에 지원하시나요?
 • 어떤 부분이 어려우신가요?
 • 특별히 강조하고 싶은 경험이 있나요?""",
-            "첨삭": """자기소개서 첨삭 포인트를 알려드릴게요:
+    "첨삭": """자기소개서 첨삭 포인트를 알려드릴게요:
 
 ✅ 구체적인 숫자와 성과 포함
 ✅ 직무와 연관된 경험 강조
@@ -209,7 +218,7 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
 ✅ 진정성 있는 지원동기
 
 파일을 업로드하거나 내용을 보내주시면 더 자세히 봐드릴게요!""",
-            "시작": """자기소개서 작성을 시작해볼까요?
+    "시작": """자기소개서 작성을 시작해볼까요?
 
 **Step 1. 기본 정보**
 • 지원 회사:
@@ -217,115 +226,360 @@ def get_ai_response(user_input: str, uploaded_file=None) -> str:
 • 경력 구분: (신입/경력)
 
 이 정보를 알려주시면 맞춤형으로 도와드릴게요!""",
-            "예시": """다음은 간단한 자기소개서 예시입니다:
+    "예시": """다음은 간단한 자기소개서 예시입니다:
 
 "문제 해결 능력을 바탕으로 한 프로젝트 경험을 통해 팀에 기여했던 사례가 있습니다."
 
 이와 같은 방식으로 경험을 구체적으로 설명해보세요!""",
-        }
-        if "첨삭" in user_input or "수정" in user_input:
-            return templates["첨삭"]
-        elif "시작" in user_input or "처음" in user_input:
-            return templates["시작"]
-        elif "예시" in user_input:
-            return templates["예시"]
-        else:
-            return templates["default"]
+}
+
+# 가이드 요청은 API 키가 있어도 항상 오프라인으로 답한다 (우선순위 최상위)
+OFFLINE_ROUTER = IntentRouter(
+    [
+        ("guide", ["가이드", "가이드라인", "도움말", "사용법", "어떻게"]),
+        ("첨삭", ["첨삭", "수정"]),
+        ("시작", ["시작", "처음"]),
+        ("예시", ["예시"]),
+    ],
+    OFFLINE_TEMPLATES,
+)
 
-    try:
-        model_map = {
-            "GPT-4 (무료)": "gpt-4o-mini",
-            "GPT-4": "gpt-4o",
-            "GPT-3.5": "gpt-3.5-turbo",
-        }
-        selected_model = st.session_state.basic_settings.get("model", "GPT-4 (무료)")
-        model_name = model_map.get(selected_model, "gpt-4o-mini")
-        llm = ChatOpenAI(
-            api_key=st.session_state.api_key,
-            model=model_name,
-            temperature=st.session_state.advanced_settings["creativity"],
-        )
+# ================= LLM 클라이언트 풀 =================
+LLM_POOL_SIZE = 32  # 서로 다른 (api_key, model, temperature) 조합 최대 보관 수 (LRU)
+
+# 화면 표시명 → 모델과 분당 한도(rpm: 요청 수, tpm: 토큰 수). 조직의 OpenAI 한도에 맞춰 조정
+MODEL_MAP = {
+    "GPT-4 (무료)": {"model": "gpt-4o-mini", "rpm": 500, "tpm": 200_000},
+    "GPT-4": {"model": "gpt-4o", "rpm": 500, "tpm": 30_000},
+    "GPT-3.5": {"model": "gpt-3.5-turbo", "rpm": 500, "tpm": 200_000},
+}
+MODEL_LIMITS = {m["model"]: (m["rpm"], m["tpm"]) for m in MODEL_MAP.values()}
+DEFAULT_MODEL_LIMITS = (500, 30_000)
+
+@st.cache_resource(max_entries=LLM_POOL_SIZE, show_spinner=False)
+def get_llm(api_key: str, model: str, temperature: float):
+    """(api_key, model, temperature)별 ChatOpenAI를 프로세스 전역에서 재사용.
+    클라이언트 내부 HTTP 커넥션이 유지되어 메시지마다 TLS 핸드셰이크를 하지 않는다.
+    재시도는 call_with_limits가 속도 제한과 함께 처리하므로 클라이언트 자체 재시도는 끈다."""
+    return ChatOpenAI(api_key=api_key, model=model, temperature=temperature, max_retries=0)
+
+# ================= 응답 캐시 =================
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "./response_cache.db")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))      # 초
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"                   # 임베딩 유사도 캐시 (선택)
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_SCAN = int(os.getenv("SEMANTIC_CACHE_SCAN", "500"))  # 유사도 비교 후보 수 (최근 사용순)
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    return ResponseCache(
+        RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES,
+        SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SCAN,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedder(api_key: str):
+    return OpenAIEmbeddings(api_key=api_key, model="text-embedding-3-small")
+
+
+def _cache_scope(llm) -> str:
+    return ResponseCache.scope(
+        llm.model_name, st.session_state.basic_settings['tone'], st.session_state.basic_settings['length'], llm.temperature
+    )
+
+
+def _cache_embed_fn():
+    """유사도 캐시가 켜져 있으면 임베딩 함수, 아니면 None"""
+    if not SEMANTIC_CACHE_ENABLED or not LANGCHAIN_AVAILABLE or not st.session_state.api_key:
+        return None
+    return get_embedder(st.session_state.api_key).embed_query
+
+# ================= 요청 제어 (속도 제한 / 중복 요청 합치기 / 재시도) =================
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(MODEL_LIMITS, DEFAULT_MODEL_LIMITS)
+
+
+@st.cache_resource(show_spinner=False)
+def get_single_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+def _run_llm(llm, prompt, user_input: str, stream: bool):
+    """LLM 한 번 호출 (stream이 아니면 전체 답을 한 번에 yield)"""
+    if stream:
+        for chunk in (prompt | llm).stream({"input": user_input}):
+            if chunk.content:
+                yield chunk.content
+    else:
+        response = LLMChain(llm=llm, prompt=prompt).invoke({"input": user_input})
+        yield response.get("text", str(response))
+
+
+def _coalesced_llm(llm, prompt, user_input: str, tokens: int, stream: bool = False, key: Optional[str] = None):
+    """속도 제한을 지키며 LLM을 호출하고, key가 같은 요청이 진행 중이면 그 결과를 나눠 받는다.
+    한도가 차 있으면 화면을 멈춰 두고 기다리지 않고 바로 LLMBusyError로 알린다."""
+    account = api_key_fingerprint(st.session_state.api_key)
+    limiter, flights = get_rate_limiter(), get_single_flight()
+    produce = partial(call_with_limits, partial(_run_llm, llm, prompt, user_input, stream),
+                      limiter, llm.model_name, tokens, account)
+    yield from coalesce(flights, f"{account}:{key}" if key else None, produce)
+
+
+# ================= AI 응답 생성 =================
+def _prepare_ai_request(user_input: str, uploaded_file=None):
+    """오프라인 응답이면 문자열을, LLM 호출이 필요하면 (llm, prompt, input) 튜플을 반환"""
+    intent, reply = OFFLINE_ROUTER.route(user_input)
+    if intent == "guide" or not st.session_state.api_key or not LANGCHAIN_AVAILABLE:
+        return reply
+
+    selected_model = st.session_state.basic_settings.get("model", "GPT-4 (무료)")
+    model_name = MODEL_MAP.get(selected_model, MODEL_MAP["GPT-4 (무료)"])["model"]
+    llm = get_llm(
+        api_key=st.session_state.api_key,
+        model=model_name,
+        temperature=st.session_state.advanced_settings["creativity"],
+    )
+
+    system_prompt = f"""당신은 전문 자기소개서 작성 코치입니다.
+    톤: {st.session_state.basic_settings['tone']}
+    최대 길이: {st.session_state.basic_settings['length']}자
+
+    - 구체적이고 실용적인 조언
+    - 예시를 들어 설명
+    - 친근하면서도 전문적인 톤
+    - 이모지는 최소한으로 사용"""
+
+    if uploaded_file:
+        try:
+            if uploaded_file.name.endswith('.txt'):
+                content = uploaded_file.read().decode('utf-8')
+            elif uploaded_file.name.endswith('.docx') and DOC_LIBS_AVAILABLE:
+                doc = Document(uploaded_file)
+                content = '\n'.join([p.text for p in doc.paragraphs])
+            else:
+                content = "파일을 읽을 수 없습니다."
+            user_input = f"다음 자기소개서를 검토하고 개선점을 제안해주세요:\n\n{content}\n\n{user_input}"
+        except Exception as e:
+            return f"파일 처리 중 오류: {e}"
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", "{input}")
+    ])
+    return llm, prompt, user_input
 
-        system_prompt = f"""당신은 전문 자기소개서 작성 코치입니다.
-        톤: {st.session_state.basic_settings['tone']}
-        최대 길이: {st.session_state.basic_settings['length']}자
-
-        - 구체적이고 실용적인 조언
-        - 예시를 들어 설명
-        - 친근하면서도 전문적인 톤
-        - 이모지는 최소한으로 사용"""
-
-        if uploaded_file:
-            try:
-                if uploaded_file.name.endswith('.txt'):
-                    content = uploaded_file.read().decode('utf-8')
-                elif uploaded_file.name.endswith('.docx') and DOC_LIBS_AVAILABLE:
-                    doc = Document(uploaded_file)
-                    content = '\n'.join([p.text for p in doc.paragraphs])
-                else:
-                    content = "파일을 읽을 수 없습니다."
-                user_input = f"다음 자기소개서를 검토하고 개선점을 제안해주세요:\n\n{content}\n\n{user_input}"
-            except Exception as e:
-                return f"파일 처리 중 오류: {e}"
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "{input}")
-        ])
-        chain = LLMChain(llm=llm, prompt=prompt)
-        response = chain.invoke({"input": user_input})
-        return response.get("text", str(response))
+
+def _request_tokens(user_input: str) -> int:
+    """TPM 차감용 토큰 추정치. 한글은 글자 수 ≈ 토큰 수라 입력 + 최대 답변 길이로 넉넉히 잡는다."""
+    return len(user_input) + int(st.session_state.basic_settings['length'])
+
+
+def get_ai_response(user_input: str, uploaded_file=None) -> str:
+    try:
+        request = _prepare_ai_request(user_input, uploaded_file)
+        if isinstance(request, str):
+            return request
+        llm, prompt, user_input = request
+        # 첨부 파일이 있으면 내용이 매번 달라 캐시하지 않음
+        cache = get_response_cache() if uploaded_file is None else None
+        key = None
+        if cache:
+            scope, embed = _cache_scope(llm), _cache_embed_fn()
+            cached, vector = cache.get(user_input, scope, embed)
+            if cached is not None:
+                return cached
+            key = ResponseCache.key(user_input, scope)
+        text = "".join(_coalesced_llm(llm, prompt, user_input, _request_tokens(user_input), key=key))
+        if cache:
+            cache.put(user_input, scope, text, vector)
+        return text
+    except LLMBusyError as e:
+        return str(e)
     except Exception as e:
         return f"오류가 발생했습니다. 다시 시도해주세요.\n{str(e)}"
 
+
+def stream_ai_response(user_input: str, uploaded_file=None):
+    """get_ai_response와 같은 응답을 토큰 단위로 yield (오프라인 응답은 한 번에)"""
+    try:
+        request = _prepare_ai_request(user_input, uploaded_file)
+        if isinstance(request, str):
+            yield request
+            return
+        llm, prompt, user_input = request
+        cache = get_response_cache() if uploaded_file is None else None
+        key = None
+        if cache:
+            scope, embed = _cache_scope(llm), _cache_embed_fn()
+            cached, vector = cache.get(user_input, scope, embed)
+            if cached is not None:
+                yield cached
+                return
+            key = ResponseCache.key(user_input, scope)
+        parts = []
+        for piece in _coalesced_llm(llm, prompt, user_input, _request_tokens(user_input), stream=True, key=key):
+            parts.append(piece)
+            yield piece
+        if cache and parts:
+            cache.put(user_input, scope, "".join(parts), vector)
+    except LLMBusyError as e:
+        yield str(e)
+    except Exception as e:
+        yield f"오류가 발생했습니다. 다시 시도해주세요.\n{str(e)}"
+
+# ================= PDF 폰트/스타일 =================
+KOREAN_FONT_PATH = os.getenv("KOREAN_FONT_PATH", "./NanumGothic.ttf")
+KOREAN_FONT_NAME = "NanumGothic"
+KOREAN_CID_FONT = "HYGothic-Medium"  # TTF가 없을 때 쓰는 ReportLab 내장 한글 폰트
+
+def _register_korean_font(font_path: str) -> str:
+    """한글 폰트를 ReportLab에 등록하고 폰트 이름을 반환 (TTF → 내장 CID 폰트 → Helvetica 순)"""
+    if os.path.exists(font_path):
+        try:
+            pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+            return KOREAN_FONT_NAME
+        except Exception:
+            pass
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_CID_FONT))
+        return KOREAN_CID_FONT
+    except Exception:
+        return "Helvetica"
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_styles(font_path: str = KOREAN_FONT_PATH) -> Dict[str, "ParagraphStyle"]:
+    """폰트 등록(TTF 파싱)과 스타일 생성을 프로세스에서 한 번만 한다.
+    여러 세션이 같은 스타일 객체를 함께 쓰므로 반환값은 수정하지 않는다."""
+    font_name = _register_korean_font(font_path)
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "KoreanTitle", parent=base["Heading1"], fontName=font_name,
+            fontSize=18, spaceAfter=30, alignment=1, wordWrap="CJK",
+        ),
+        "heading": ParagraphStyle("KoreanHeading", parent=base["Heading2"], fontName=font_name, wordWrap="CJK"),
+        "normal": ParagraphStyle("KoreanNormal", parent=base["Normal"], fontName=font_name, wordWrap="CJK"),
+    }
+
+PDF_DOC_OPTIONS = {"pagesize": letter} if DOC_LIBS_AVAILABLE else {}
+
+def make_pdf_doc(target, title: str = "") -> "SimpleDocTemplate":
+    """모든 PDF 내보내기가 쓰는 공통 문서 템플릿 (target: 파일 경로 또는 BytesIO)"""
+    return SimpleDocTemplate(target, title=title, **PDF_DOC_OPTIONS)
+
+# ================= 저장 파일 보관소 =================
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "./saved_exports")
+BLOB_TTL = int(os.getenv("BLOB_TTL", str(7 * 24 * 3600)))                      # 초
+BLOB_QUOTA_BYTES = int(os.getenv("BLOB_QUOTA_BYTES", str(50 * 1024 * 1024)))   # 사용자(세션)당
+
+
+@st.cache_resource(show_spinner=False)
+def get_blob_store() -> BlobStore:
+    return BlobStore(BLOB_STORE_DIR, BLOB_TTL, BLOB_QUOTA_BYTES)
+
+
+def render_saved_file(file: Dict) -> None:
+    """파일 내용은 '다운로드 준비'를 누른 항목만 읽어서 download_button에 넘긴다"""
+    st.write(f"📄 {file['name']} ({file['date']}, {file['size']} bytes)")
+    if st.session_state.get("download_ready") == file["id"]:
+        data = get_blob_store().read(st.session_state.blob_owner, file["id"])
+        if data is None:
+            st.warning("보관 기간이 지나 삭제된 파일입니다.")
+            return
+        st.download_button(
+            label="다운로드",
+            data=data,
+            file_name=file["name"],
+            mime=file["mime"],
+            key=f"download_{file['id']}",
+        )
+    elif st.button("다운로드 준비", key=f"prepare_{file['id']}"):
+        st.session_state.download_ready = file["id"]
+        st.rerun()
+
 # ================= 대화 저장 =================
-def save_conversation():
-    content = ""
-    for msg in st.session_state.messages:
-        role = "👤 사용자" if msg["role"] == "user" else "🤖 AI 코치"
-        content += f"[{msg.get('time', '')}] {role}\n{msg['content']}\n\n"
+EXPORT_SPOOL_DIR = os.getenv("EXPORT_SPOOL_DIR") or None  # 내보내기 작업 파일 위치 (기본: 시스템 임시 폴더)
+EXPORT_BUILDERS = {"PDF 문서": PdfExport, "Word 문서": DocxExport, "HTML 문서": HtmlExport}
+
+
+def _role_label(msg: Dict) -> str:
+    return "👤 사용자" if msg["role"] == "user" else "🤖 AI 코치"
+
+
+def _export_class(export: str) -> type:
+    cls = EXPORT_BUILDERS.get(export, TextExport)
+    if cls in (PdfExport, DocxExport) and not DOC_LIBS_AVAILABLE:
+        return TextExport
+    return cls
+
+
+def export_builder_factory(export: str) -> Callable[[], ExportBuilder]:
+    """형식에 맞는 빌더 생성 함수 (.func가 빌더 클래스).
+    PDF 스타일(st.cache_resource)은 여기서 꺼내 묶어 두므로 스크립트 스레드에서 호출한다."""
+    cls = _export_class(export)
+    if cls is PdfExport:
+        return partial(PdfExport, _role_label, EXPORT_SPOOL_DIR, style=get_pdf_styles()["normal"], make_doc=make_pdf_doc)
+    if cls is HtmlExport:
+        return partial(HtmlExport, _role_label, EXPORT_SPOOL_DIR, message_html=message_html)
+    return partial(cls, _role_label, EXPORT_SPOOL_DIR)
+
 
+def new_export_builder(export: str) -> ExportBuilder:
+    return export_builder_factory(export)()
+
+
+def get_export_builder(export: str) -> ExportBuilder:
+    """세션·형식별 내보내기 빌더 (세션에는 스풀 경로와 커서만 남는다)"""
+    builders = st.session_state.setdefault("export_builders", {})
+    cls = _export_class(export)
+    builder = builders.get(cls.__name__)
+    if builder is None:
+        builder = builders[cls.__name__] = new_export_builder(export)
+    return builder
+
+
+def save_conversation():
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"자소서대화_{timestamp}"
+    builder = get_export_builder(st.session_state.advanced_settings.get("export_format", "텍스트 파일"))
+    builder.append(st.session_state.messages)
+    filename = f"자소서대화_{timestamp}.{builder.ext}"
+    get_blob_store().put(st.session_state.blob_owner, filename, builder.getvalue(), builder.mime)
+    return filename
+
+
+# ================= 자동 저장 =================
+AUTOSAVE_DELAY = float(os.getenv("AUTOSAVE_DELAY", "10"))  # 첫 변경 후 이 시간(초) 동안 모인 변경을 한 번에 저장
+AUTOSAVE_WORKERS = 4                                        # 프로세스 전체 내보내기 동시 작업 수
+
+
+@st.cache_resource(show_spinner=False)
+def _autosave_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=AUTOSAVE_WORKERS, thread_name_prefix="autosave")
+
+
+def schedule_autosave() -> None:
+    """자동 저장이 켜져 있으면 현재 대화를 백그라운드 저장 대기열에 올린다"""
+    if not st.session_state.advanced_settings.get("auto_save"):
+        return
+    saver = st.session_state.get("autosaver")
+    if saver is None:
+        saver = st.session_state.autosaver = AutoSaver(get_blob_store(), st.session_state.blob_owner, AUTOSAVE_DELAY)
     export = st.session_state.advanced_settings.get("export_format", "텍스트 파일")
+    saver.schedule(st.session_state.messages, export_builder_factory(export), _autosave_executor())
 
-    if export == "PDF 문서" and DOC_LIBS_AVAILABLE:
-        bio = io.BytesIO()
-        doc = SimpleDocTemplate(bio, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = [Paragraph(p, styles["Normal"]) for p in content.split('\n')]
-        doc.build(story)
-        file_data = bio.getvalue()
-        mime = "application/pdf"
-        ext = "pdf"
-    elif export == "Word 문서" and DOC_LIBS_AVAILABLE:
-        doc = Document()
-        doc.add_heading('AI 자기소개서 코칭 대화', 0)
-        for para in content.split('\n'):
-            doc.add_paragraph(para)
-        bio = io.BytesIO()
-        doc.save(bio)
-        file_data = bio.getvalue()
-        mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        ext = "docx"
-    elif export == "HTML 문서":
-        file_data = f"<html><body><pre>{content}</pre></body></html>"
-        mime = "text/html"
-        ext = "html"
-    else:
-        file_data = content
-        mime = "text/plain"
-        ext = "txt"
-
-    st.session_state.saved_files.append({
-        "name": f"{filename}.{ext}",
-        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-        "size": len(file_data),
-        "data": file_data,
-        "mime": mime
-    })
 
-    return f"{filename}.{ext}"
+def render_autosave_status() -> None:
+    saver = st.session_state.get("autosaver")
+    if saver is None or not st.session_state.advanced_settings.get("auto_save"):
+        return
+    if saver.error:
+        st.caption(f"⚠️ 자동 저장 실패: {saver.error}")
+    elif saver.last_saved:
+        st.caption(f"💾 {saver.last_saved} 자동 저장됨")
 
 ##########################################
 # UI 렌더링 함수
@@ -372,20 +626,63 @@ def render_onboarding():
         st.rerun()
 
 
+CHAT_WINDOW = 20          # 항상 그리는 최근 메시지 수
+CHAT_ARCHIVE_PAGE = 20    # 이전 대화 한 페이지당 메시지 수
+
+
+def _bubble_html(role: str, content: str, cursor: bool = False) -> str:
+    """메시지 1개의 말풍선 HTML. 내용은 HTML 이스케이프 후 줄바꿈만 <br>로 바꾼다."""
+    body = html.escape(content).replace("\n", "<br>") + ("▌" if cursor else "")
+    if role == "user":
+        return f"<div style='text-align:right; background:{SUB_COLOR}; padding:10px; border-radius:18px; margin:4px 0'>{body}</div>"
+    return f"<div style='text-align:left; background:{BOT_COLOR}; padding:10px; border-radius:18px; margin:4px 0'>{body}</div>"
+
+
+def make_message(role: str, content: str) -> Dict:
+    """st.session_state.messages에 넣을 메시지. 렌더링/HTML 내보내기용 조각을 추가 시점에 한 번만 만든다."""
+    return {
+        "id": uuid.uuid4().hex,
+        "role": role,
+        "content": content,
+        "time": datetime.datetime.now().strftime("%H:%M"),
+        "html": _bubble_html(role, content),
+    }
+
+
+def message_html(msg: Dict) -> str:
+    if "html" not in msg:  # 이전 세션에서 넘어온 메시지
+        msg["html"] = _bubble_html(msg["role"], msg["content"])
+    return msg["html"]
+
+
+def render_messages(messages: List[Dict]) -> None:
+    st.markdown("".join(message_html(m) for m in messages), unsafe_allow_html=True)
+
+
+def render_chat_archive(older: List[Dict]) -> None:
+    """CHAT_WINDOW 이전 메시지는 펼쳤을 때만, 한 페이지씩 그린다"""
+    if not st.toggle(f"🗂️ 이전 대화 {len(older)}개 보기", key="chat_archive_open"):
+        return
+    pages = (len(older) + CHAT_ARCHIVE_PAGE - 1) // CHAT_ARCHIVE_PAGE
+    page = min(max(1, st.session_state.get("chat_archive_page", pages)), pages)
+    c1, c2, c3 = st.columns([1, 3, 1])
+    if c1.button("◀", key="chat_archive_prev", disabled=page <= 1):
+        page -= 1
+    if c3.button("▶", key="chat_archive_next", disabled=page >= pages):
+        page += 1
+    st.session_state.chat_archive_page = page
+    c2.caption(f"{page} / {pages} 페이지")
+    start = (page - 1) * CHAT_ARCHIVE_PAGE
+    render_messages(older[start:start + CHAT_ARCHIVE_PAGE])
+    st.write("---")
+
+
 def render_chat_tab():
     render_header("AI 대화")
-    for msg in st.session_state.messages:
-        if msg["role"] == "user":
-            st.markdown(
-                f"<div style='text-align:right; background:{SUB_COLOR}; padding:10px; border-radius:18px; margin:4px 0'>{msg['content']}</div>",
-                unsafe_allow_html=True,
-            )
-        else:
-            content_html = msg["content"].replace("\n", "<br>")
-            st.markdown(
-                f"<div style='text-align:left; background:{BOT_COLOR}; padding:10px; border-radius:18px; margin:4px 0'>{content_html}</div>",
-                unsafe_allow_html=True,
-            )
+    messages = st.session_state.messages
+    if len(messages) > CHAT_WINDOW:
+        render_chat_archive(messages[:-CHAT_WINDOW])
+    render_messages(messages[-CHAT_WINDOW:])
     st.write("---")
     uploaded_file = st.file_uploader("📎 파일 첨부 (txt, docx)", type=["txt", "docx"])
     col1, col2, col3, col4 = st.columns([5, 1, 1, 1])
@@ -399,38 +696,33 @@ def render_chat_tab():
         if st.button("📂"):
             st.session_state.show_saved = not st.session_state.get("show_saved", False)
     if send and user_input:
-        st.session_state.messages.append({
-            "role": "user",
-            "content": user_input,
-            "time": datetime.datetime.now().strftime("%H:%M"),
-        })
-        with st.spinner("답변 생성 중..."):
-            response = get_ai_response(user_input, uploaded_file)
-        st.session_state.messages.append({
-            "role": "ai",
-            "content": response,
-            "time": datetime.datetime.now().strftime("%H:%M"),
-        })
+        st.session_state.messages.append(make_message("user", user_input))
+        if st.session_state.advanced_settings.get("streaming", True):
+            bubble = st.empty()
+            response = ""
+            for token in stream_ai_response(user_input, uploaded_file):
+                response += token
+                bubble.markdown(_bubble_html("ai", response, cursor=True), unsafe_allow_html=True)
+        else:
+            with st.spinner("답변 생성 중..."):
+                response = get_ai_response(user_input, uploaded_file)
+        st.session_state.messages.append(make_message("ai", response))
+        schedule_autosave()
         st.rerun()
+    render_autosave_status()
     if save:
         filename = save_conversation()
         st.success(f"{filename} 저장됨!")
     if st.session_state.get("show_saved", False):
         st.markdown("---")
-        if not st.session_state.saved_files:
+        saved_files = get_blob_store().list(st.session_state.blob_owner)
+        if not saved_files:
             st.info("저장된 파일이 없습니다.")
         else:
-            for i, file in enumerate(st.session_state.saved_files):
-                st.write(f"📄 {file['name']} ({file['date']}, {file['size']} bytes)")
-                st.download_button(
-                    label="다운로드",
-                    data=file["data"],
-                    file_name=file["name"],
-                    mime=file["mime"],
-                    key=f"download_{i}_{file['name']}",
-                )
+            for file in saved_files:
+                render_saved_file(file)
             if st.button("🗑️ 모든 파일 삭제"):
-                st.session_state.saved_files = []
+                get_blob_store().clear(st.session_state.blob_owner)
                 st.success("모든 파일이 삭제되었습니다!")
                 st.session_state.show_saved = False
     render_bottom_nav()
@@ -480,6 +772,9 @@ def render_advanced_settings_tab():
     st.session_state.advanced_settings["smart_edit"] = st.toggle(
         "스마트 편집", value=st.session_state.advanced_settings.get("smart_edit", True)
     )
+    st.session_state.advanced_settings["streaming"] = st.toggle(
+        "실시간 답변 표시", value=st.session_state.advanced_settings.get("streaming", True)
+    )
     st.markdown("---")
     export_options = ["PDF 문서", "Word 문서", "텍스트 파일", "HTML 문서"]
     st.session_state.advanced_settings["export_format"] = st.selectbox(